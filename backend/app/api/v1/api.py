@@ -0,0 +1,10 @@
+"""
+API v1 router aggregation
+"""
+
+from fastapi import APIRouter
+
+from app.api.v1.endpoints import predictions
+
+api_router = APIRouter()
+api_router.include_router(predictions.router, prefix="/ml", tags=["ML"])
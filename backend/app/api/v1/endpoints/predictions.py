@@ -3,17 +3,58 @@ ML Prediction Endpoints
 Risk prediction and demand forecasting APIs using LightGBM and Prophet
 """
 
-from fastapi import APIRouter, HTTPException, Depends
-from pydantic import BaseModel, Field
-from typing import List, Dict, Optional
-from datetime import datetime, timedelta
+from fastapi import APIRouter, HTTPException, Depends, Request
+from pydantic import BaseModel, Field, ValidationError
+from typing import AsyncIterator, List, Dict, Optional, Tuple
+from datetime import date, datetime
+import asyncio
+import json
+import time
 
-# Placeholder imports - uncomment when ready to use
-# from app.ml.risk_predictor import RiskPredictor
-# from app.ml.demand_forecaster import DemandForecaster
+import numpy as np
+import pandas as pd
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.metrics import MetricFamily, metrics_registry
+from app.core.streaming import LineTooLongError, NDJSONStreamingResponse, iter_ndjson_chunks
+from app.db.session import get_db
+from app.ml.anomaly_scan import scan_actuals
+from app.ml.batching import PredictionCoalescer
+from app.ml.executor import ExecutorSaturatedError, inference_executor
+from app.ml.feature_store import feature_store
+from app.ml.forecast_store import MaterializedForecasts
+from app.ml.forecasting import (
+    forecast_school, forecast_table_stats, get_materialized_forecasts, invalidate_school, lookup_forecast
+)
+from app.ml.prediction_cache import PredictionCache
+from app.ml.registry import ModelHandle, ModelNotLoadedError, model_registry
+from app.ml.retraining import retrain_worker
+from app.ml.risk_predictor import RISK_LEVELS
+from app.services.school_service import fetch_feature_columns
 
 router = APIRouter()
 
+# Caches predictions by quantized feature vector and model version
+prediction_cache = PredictionCache(
+    maxsize=settings.PREDICTION_CACHE_SIZE,
+    ttl_seconds=settings.PREDICTION_CACHE_TTL,
+    precision=settings.PREDICTION_CACHE_PRECISION
+)
+
+
+async def _score_batch(model: ModelHandle, features_list: List[Dict[str, float]]) -> List[Dict]:
+    return await inference_executor.lightgbm.run(prediction_cache.predict_batch, model.predictor, features_list)
+
+
+# Coalesces concurrent single-school predictions into predict_batch calls
+risk_coalescer = PredictionCoalescer(
+    _score_batch,
+    max_batch_size=settings.RISK_BATCH_MAX_SIZE,
+    max_wait_ms=settings.RISK_BATCH_MAX_WAIT_MS
+)
+
 
 # ============================================================================
 # Request/Response Models
@@ -73,12 +114,123 @@ class BatchRiskPredictionRequest(BaseModel):
     predictions: List[RiskPredictionRequest]
 
 
+class LabelledRiskSample(RiskPredictionRequest):
+    """Feature set with its observed risk score, e.g. from a shortage report"""
+    risk_score: float = Field(ge=0, le=100, description="Observed risk score")
+
+
+class RiskRetrainRequest(BaseModel):
+    """Request model for retraining the risk model on new labelled rows"""
+    samples: List[LabelledRiskSample] = Field(min_length=1)
+    incremental: bool = Field(default=True, description="Warm-start from the current model")
+    max_new_trees: Optional[int] = Field(default=None, ge=1, le=500, description="Cap on trees added")
+
+
+class ActualDemandRecord(BaseModel):
+    """One school's actual meal demand on a day, e.g. from an attendance upload"""
+    school_id: str
+    date: date
+    actual_demand: float = Field(ge=0, description="Meals actually served")
+
+
+class AttendanceEvent(BaseModel):
+    """One school's attendance on a day"""
+    school_id: str
+    date: date
+    present: int = Field(ge=0, description="Children present")
+    enrolled: Optional[int] = Field(default=None, gt=0, description="Enrollment, if changed")
+
+
+class MealEvent(BaseModel):
+    """Meals served by one school on a day"""
+    school_id: str
+    date: date
+    meals_served: float = Field(ge=0, description="Meals served")
+
+
+class FeatureEventsRequest(BaseModel):
+    """Attendance and meal events to fold into the feature store"""
+    attendance: List[AttendanceEvent] = Field(default_factory=list)
+    meals: List[MealEvent] = Field(default_factory=list)
+
+
+class SchoolProfileRequest(BaseModel):
+    """Slow-changing school features; omitted fields keep their stored value"""
+    enrollment: Optional[int] = Field(default=None, gt=0, description="Total enrollment")
+    capacity: Optional[int] = Field(default=None, gt=0, description="Meal capacity")
+    previous_shortage_count: Optional[int] = Field(default=None, ge=0, description="Previous shortage incidents")
+    budget_utilization_rate: Optional[float] = Field(default=None, ge=0, le=1, description="Budget utilization (0-1)")
+    supply_chain_delay_days: Optional[int] = Field(default=None, ge=0, description="Supply chain delay in days")
+    weather_risk_score: Optional[float] = Field(default=None, ge=0, le=100, description="Weather risk score")
+    seasonal_factor: Optional[float] = Field(default=None, gt=0, description="Seasonal adjustment factor")
+    hostel_attached: Optional[int] = Field(default=None, ge=0, le=1, description="Hostel attached (0/1)")
+    last_inspection: Optional[date] = Field(default=None, description="Date of the last inspection")
+
+
+class StoredRiskPredictionRequest(BaseModel):
+    """Request model for predicting risk from stored features"""
+    school_ids: List[str] = Field(min_length=1)
+
+
+class RiskExplanationRequest(BaseModel):
+    """Request model for explaining risk predictions of many schools"""
+    predictions: List[RiskPredictionRequest]
+    top_k: int = Field(default=5, ge=1, le=15, description="Drivers returned per school")
+
+
+# ============================================================================
+# Dependencies & Helpers
+# ============================================================================
+
+def get_risk_model() -> ModelHandle:
+    """
+    Current risk model handle from the process-wide registry
+    
+    Handlers never load or train a model themselves; the handle is taken
+    once per request so a hot-swap mid-request does not affect it.
+    """
+    try:
+        return model_registry.current()
+    except ModelNotLoadedError:
+        raise HTTPException(status_code=503, detail="Risk model is not loaded yet")
+
+
+def _saturated(error: ExecutorSaturatedError) -> HTTPException:
+    """503 response asking the client to back off while the pools drain"""
+    return HTTPException(
+        status_code=503,
+        detail=str(error),
+        headers={'Retry-After': str(error.retry_after)}
+    )
+
+
+def _request_features(request: RiskPredictionRequest) -> Dict[str, float]:
+    """Extract the model feature dictionary from a prediction request"""
+    return {
+        'enrollment': request.enrollment,
+        'current_attendance': request.current_attendance,
+        'capacity': request.capacity,
+        'avg_meal_uptake': request.avg_meal_uptake,
+        'attendance_rate': request.attendance_rate,
+        'capacity_utilization': request.capacity_utilization,
+        'days_since_inspection': request.days_since_inspection,
+        'previous_shortage_count': request.previous_shortage_count,
+        'budget_utilization_rate': request.budget_utilization_rate,
+        'supply_chain_delay_days': request.supply_chain_delay_days,
+        'weather_risk_score': request.weather_risk_score,
+        'seasonal_factor': request.seasonal_factor,
+        'hostel_attached': request.hostel_attached,
+        'enrollment_trend_7d': request.enrollment_trend_7d,
+        'attendance_trend_7d': request.attendance_trend_7d
+    }
+
+
 # ============================================================================
 # ML Model Endpoints
 # ============================================================================
 
 @router.post("/predict-risk", response_model=RiskPredictionResponse)
-async def predict_risk(request: RiskPredictionRequest):
+async def predict_risk(request: RiskPredictionRequest, model: ModelHandle = Depends(get_risk_model)):
     """
     Predict hunger risk score for a school using LightGBM model
     
@@ -88,39 +240,11 @@ async def predict_risk(request: RiskPredictionRequest):
     - **capacity**: Meal preparation capacity
     - **avg_meal_uptake**: Average daily meal uptake
     - Returns risk score (0-100) and risk level
+    - Concurrent calls are micro-batched into one model call
     """
     try:
-        # Initialize predictor (in production, use singleton/cached instance)
-        # predictor = RiskPredictor()
-        
-        # Prepare features
-        features = {
-            'enrollment': request.enrollment,
-            'current_attendance': request.current_attendance,
-            'capacity': request.capacity,
-            'avg_meal_uptake': request.avg_meal_uptake,
-            'attendance_rate': request.attendance_rate,
-            'capacity_utilization': request.capacity_utilization,
-            'days_since_inspection': request.days_since_inspection,
-            'previous_shortage_count': request.previous_shortage_count,
-            'budget_utilization_rate': request.budget_utilization_rate,
-            'supply_chain_delay_days': request.supply_chain_delay_days,
-            'weather_risk_score': request.weather_risk_score,
-            'seasonal_factor': request.seasonal_factor,
-            'hostel_attached': request.hostel_attached,
-            'enrollment_trend_7d': request.enrollment_trend_7d,
-            'attendance_trend_7d': request.attendance_trend_7d
-        }
-        
         # Make prediction
-        # prediction = predictor.predict(features)
-        
-        # Mock response for now
-        prediction = {
-            'risk_score': 65.5,
-            'risk_level': 'High',
-            'confidence': 0.85
-        }
+        prediction = await risk_coalescer.submit(model, _request_features(request))
         
         return RiskPredictionResponse(
             school_id=request.school_id,
@@ -130,12 +254,14 @@ async def predict_risk(request: RiskPredictionRequest):
             timestamp=datetime.now()
         )
         
+    except ExecutorSaturatedError as e:
+        raise _saturated(e)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Prediction failed: {str(e)}")
 
 
 @router.post("/batch-predict-risk")
-async def batch_predict_risk(request: BatchRiskPredictionRequest):
+async def batch_predict_risk(request: BatchRiskPredictionRequest, model: ModelHandle = Depends(get_risk_model)):
     """
     Predict risk scores for multiple schools in batch
     
@@ -144,37 +270,10 @@ async def batch_predict_risk(request: BatchRiskPredictionRequest):
     - More efficient than individual predictions
     """
     try:
-        # predictor = RiskPredictor()
-        
         # Prepare features list
-        features_list = []
-        for pred_request in request.predictions:
-            features = {
-                'enrollment': pred_request.enrollment,
-                'current_attendance': pred_request.current_attendance,
-                'capacity': pred_request.capacity,
-                'avg_meal_uptake': pred_request.avg_meal_uptake,
-                'attendance_rate': pred_request.attendance_rate,
-                'capacity_utilization': pred_request.capacity_utilization,
-                'days_since_inspection': pred_request.days_since_inspection,
-                'previous_shortage_count': pred_request.previous_shortage_count,
-                'budget_utilization_rate': pred_request.budget_utilization_rate,
-                'supply_chain_delay_days': pred_request.supply_chain_delay_days,
-                'weather_risk_score': pred_request.weather_risk_score,
-                'seasonal_factor': pred_request.seasonal_factor,
-                'hostel_attached': pred_request.hostel_attached,
-                'enrollment_trend_7d': pred_request.enrollment_trend_7d,
-                'attendance_trend_7d': pred_request.attendance_trend_7d
-            }
-            features_list.append(features)
-        
-        # predictions = predictor.predict_batch(features_list)
+        features_list = [_request_features(pred_request) for pred_request in request.predictions]
         
-        # Mock response
-        predictions = [
-            {'risk_score': 65.5, 'risk_level': 'High', 'confidence': 0.85}
-            for _ in features_list
-        ]
+        predictions = await _score_batch(model, features_list)
         
         results = []
         for i, pred in enumerate(predictions):
@@ -188,10 +287,326 @@ async def batch_predict_risk(request: BatchRiskPredictionRequest):
         
         return {'predictions': results, 'count': len(results)}
         
+    except ExecutorSaturatedError as e:
+        raise _saturated(e)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Batch prediction failed: {str(e)}")
 
 
+def _score_ndjson_chunk(predictor, records: List[Tuple[int, bytes]]) -> bytes:
+    """
+    Validate and score one chunk of NDJSON prediction records
+    
+    Runs on the inference thread pool. Valid rows are scored with a single
+    columnar predict_batch call; invalid rows become error records that
+    carry their input line number.
+    """
+    timestamp = datetime.now().isoformat()
+    school_ids, features_list, output = [], [], []
+    
+    for line_no, line in records:
+        try:
+            pred_request = RiskPredictionRequest.model_validate_json(line)
+        except ValidationError as e:
+            output.append((line_no, {'line': line_no, 'error': e.errors(include_url=False, include_context=False)}))
+            continue
+        school_ids.append((line_no, pred_request.school_id))
+        features_list.append(_request_features(pred_request))
+    
+    if features_list:
+        result = predictor.predict_batch_columnar(features_list)
+        for (line_no, school_id), record in zip(school_ids, result.to_records()):
+            output.append((line_no, {'school_id': school_id, **record, 'timestamp': timestamp}))
+        output.sort(key=lambda item: item[0])
+    
+    return b''.join(json.dumps(record, default=str).encode() + b'\n' for _, record in output)
+
+
+async def _stream_risk_scores(request: Request, model: ModelHandle) -> AsyncIterator[bytes]:
+    try:
+        async for records in iter_ndjson_chunks(
+            request.stream(), settings.STREAM_CHUNK_ROWS, settings.STREAM_MAX_LINE_BYTES
+        ):
+            yield await _run_with_backoff(_score_ndjson_chunk, model.predictor, records)
+    except LineTooLongError as e:
+        yield json.dumps({'error': str(e)}).encode() + b'\n'
+    except ExecutorSaturatedError as e:
+        yield json.dumps({'error': str(e), 'retry_after': e.retry_after}).encode() + b'\n'
+
+
+async def _run_with_backoff(fn, *args):
+    """
+    Run a stream chunk on the LightGBM pool, backing off while it is saturated
+
+    Waits with exponential backoff for at most STREAM_SATURATED_MAX_WAIT
+    seconds, so a stream cannot hold its request open indefinitely while
+    ordinary requests are turned away.
+
+    Raises:
+        ExecutorSaturatedError: If the pool is still saturated after the wait
+    """
+    delay = 0.05
+    deadline = time.monotonic() + settings.STREAM_SATURATED_MAX_WAIT
+    while True:
+        try:
+            return await inference_executor.lightgbm.run(fn, *args)
+        except ExecutorSaturatedError:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise
+            await asyncio.sleep(min(delay, remaining))
+            delay = min(delay * 2, 1.0)
+
+
+@router.post("/batch-predict-risk/stream")
+async def stream_batch_predict_risk(request: Request, model: ModelHandle = Depends(get_risk_model)):
+    """
+    Stream risk predictions for arbitrarily many schools
+    
+    - Request body: newline-delimited JSON, one RiskPredictionRequest per line
+    - Records are read and scored in chunks of STREAM_CHUNK_ROWS
+    - Response: NDJSON, one prediction (or validation error with its line
+      number) per input record, in input order
+    - Memory stays bounded by the chunk size, whatever the upload size
+    """
+    return NDJSONStreamingResponse(_stream_risk_scores(request, model))
+
+
+@router.get("/district-risk/{district}")
+async def score_district(district: str, block: Optional[str] = None,
+                         model: ModelHandle = Depends(get_risk_model),
+                         db: AsyncSession = Depends(get_db)):
+    """
+    Score every school in a district, or in one block of it
+    
+    - Feature vectors are read from school_features in one query, as columns
+    - All schools are scored in one model call
+    - Returns per-school scores and the count of schools per risk level
+    """
+    try:
+        columns = await fetch_feature_columns(db, district, block, model.predictor.feature_names)
+    except SQLAlchemyError as e:
+        raise HTTPException(status_code=503, detail=f"Database unavailable: {type(e).__name__}")
+    if not len(columns):
+        raise HTTPException(status_code=404, detail=f"No schools found for district '{district}'"
+                                                    + (f", block '{block}'" if block else ""))
+    
+    try:
+        result = await inference_executor.lightgbm.run(model.predictor.predict_batch_columnar, columns.matrix)
+    except ExecutorSaturatedError as e:
+        raise _saturated(e)
+    
+    level_counts = np.bincount(result.level_codes, minlength=len(RISK_LEVELS))
+    return {
+        'district': district,
+        'block': block,
+        'model_version': model.version,
+        'count': len(columns),
+        'avg_risk_score': round(float(result.risk_scores.mean()), 2),
+        'level_counts': dict(zip(RISK_LEVELS, level_counts.tolist())),
+        'schools': [
+            {'school_id': school_id, 'block': school_block, 'risk_score': score, 'risk_level': level}
+            for school_id, school_block, score, level in zip(
+                columns.school_ids.tolist(), columns.blocks.tolist(),
+                result.risk_scores.tolist(), result.risk_levels.tolist()
+            )
+        ],
+        'timestamp': datetime.now().isoformat()
+    }
+
+
+def _apply_feature_events(request: FeatureEventsRequest) -> Dict[str, int]:
+    attendance = sum(
+        feature_store.record_attendance(event.school_id, event.date, event.present, event.enrolled)
+        for event in request.attendance
+    )
+    meals = sum(
+        feature_store.record_meals(event.school_id, event.date, event.meals_served)
+        for event in request.meals
+    )
+    return {
+        'attendance_applied': attendance,
+        'meals_applied': meals,
+        'stale': len(request.attendance) + len(request.meals) - attendance - meals,
+        'schools': len(feature_store)
+    }
+
+
+@router.post("/feature-store/events")
+async def ingest_feature_events(request: FeatureEventsRequest):
+    """
+    Fold attendance and meal events into the school feature store
+    
+    - Attendance updates current attendance, attendance rate and the 7-day
+      attendance/enrollment trends; meals update the 7-day average uptake
+      and capacity utilization
+    - Each event is an O(1) update; unknown schools are added
+    - Events older than a school's latest one are counted as stale and ignored
+    """
+    return await asyncio.to_thread(_apply_feature_events, request)
+
+
+@router.put("/feature-store/schools/{school_id}")
+async def set_school_profile(school_id: str, request: SchoolProfileRequest):
+    """
+    Set a school's slow-changing features (enrollment, capacity, budget,
+    inspection date, ...) in the feature store
+    """
+    fields = request.model_dump(exclude_none=True)
+    last_inspection = fields.pop('last_inspection', None)
+    feature_store.set_profile(school_id, last_inspection=last_inspection, **fields)
+    return {'school_id': school_id, 'features': feature_store.get(school_id)}
+
+
+@router.get("/feature-store/schools/{school_id}")
+async def get_school_features(school_id: str):
+    """
+    A school's stored features (null where not yet known)
+    """
+    features = feature_store.get(school_id)
+    if features is None:
+        raise HTTPException(status_code=404, detail=f"School '{school_id}' is not in the feature store")
+    return {'school_id': school_id, 'features': features}
+
+
+@router.post("/predict-risk/stored")
+async def predict_risk_stored(request: StoredRiskPredictionRequest, model: ModelHandle = Depends(get_risk_model)):
+    """
+    Predict risk for schools from their stored features
+    
+    - Clients send school ids only; feature rows are read from the feature store
+    - All schools are scored in one model call
+    - Features not yet known are passed to the model as missing
+    - Ids not in the store are returned in ``missing``
+    """
+    matrix, found = feature_store.feature_matrix(request.school_ids, model.predictor.feature_names)
+    school_ids = [school_id for school_id, known in zip(request.school_ids, found.tolist()) if known]
+    missing = [school_id for school_id, known in zip(request.school_ids, found.tolist()) if not known]
+    
+    try:
+        result = await inference_executor.lightgbm.run(model.predictor.predict_batch_columnar, matrix)
+    except ExecutorSaturatedError as e:
+        raise _saturated(e)
+    
+    timestamp = datetime.now().isoformat()
+    return {
+        'model_version': model.version,
+        'predictions': [
+            {'school_id': school_id, **prediction, 'timestamp': timestamp}
+            for school_id, prediction in zip(school_ids, result.to_records())
+        ],
+        'count': len(school_ids),
+        'missing': missing
+    }
+
+
+def _scan_ndjson_chunk(table: MaterializedForecasts, records: List[Tuple[int, bytes]]) -> Tuple[bytes, Dict[str, int]]:
+    """
+    Validate one chunk of actual-demand records and scan it for anomalies
+    
+    Runs in a worker thread. Only anomalous rows and validation errors are
+    emitted, in input order; the counts feed the final summary record.
+    """
+    line_nos, school_ids, dates, actuals, output = [], [], [], [], []
+    
+    for line_no, line in records:
+        try:
+            actual = ActualDemandRecord.model_validate_json(line)
+        except ValidationError as e:
+            output.append((line_no, {'line': line_no, 'error': e.errors(include_url=False, include_context=False)}))
+            continue
+        line_nos.append(line_no)
+        school_ids.append(actual.school_id)
+        dates.append(actual.date)
+        actuals.append(actual.actual_demand)
+    
+    counts = {'records': len(records), 'invalid': len(output), 'scored': 0, 'anomalies': 0}
+    if school_ids:
+        anomalies, covered = scan_actuals(table, school_ids, dates, actuals)
+        counts['scored'] = int(covered.sum())
+        counts['anomalies'] = len(anomalies)
+        for position, anomaly in zip(anomalies.index, anomalies.to_dict('records')):
+            output.append((line_nos[position], anomaly))
+        output.sort(key=lambda item: item[0])
+    
+    return b''.join(json.dumps(record, default=str).encode() + b'\n' for _, record in output), counts
+
+
+async def _stream_anomalies(request: Request, table: MaterializedForecasts) -> AsyncIterator[bytes]:
+    totals = {'records': 0, 'invalid': 0, 'scored': 0, 'anomalies': 0}
+    try:
+        async for records in iter_ndjson_chunks(
+            request.stream(), settings.STREAM_CHUNK_ROWS, settings.STREAM_MAX_LINE_BYTES
+        ):
+            output, counts = await asyncio.to_thread(_scan_ndjson_chunk, table, records)
+            for key, value in counts.items():
+                totals[key] += value
+            if output:
+                yield output
+    except LineTooLongError as e:
+        yield json.dumps({'error': str(e)}).encode() + b'\n'
+        return
+    
+    totals['unscored'] = totals['records'] - totals['invalid'] - totals['scored']
+    yield json.dumps({'summary': {**totals, 'forecasts_generated_at': table.generated_at}}).encode() + b'\n'
+
+
+@router.post("/anomaly-scan/stream")
+async def stream_anomaly_scan(request: Request):
+    """
+    Scan actual demand of many schools for anomalies against cached forecasts
+    
+    - Request body: newline-delimited JSON, one ActualDemandRecord per line
+      (e.g. a state-wide daily attendance upload)
+    - Records are joined against the materialized forecast table in chunks
+      of STREAM_CHUNK_ROWS, with vectorized interval checks
+    - Response: NDJSON with only the anomalous records (and validation
+      errors), in input order, then a summary record with counts;
+      records for schools or dates the table does not cover are counted as
+      unscored
+    """
+    table = get_materialized_forecasts()
+    if table is None:
+        raise HTTPException(
+            status_code=503,
+            detail="No materialized forecasts available; run python -m app.ml.forecast_store"
+        )
+    return NDJSONStreamingResponse(_stream_anomalies(request, table))
+
+
+@router.post("/explain-risk")
+async def explain_risk(request: RiskExplanationRequest, model: ModelHandle = Depends(get_risk_model)):
+    """
+    Explain risk predictions for a set of schools (e.g. a whole block)
+    
+    - Per-school TreeSHAP contributions computed in one batched model call
+    - Returns the top-k features driving each school's risk score
+    - Explanations are cached per model version and feature vector
+    """
+    try:
+        features_list = [_request_features(pred_request) for pred_request in request.predictions]
+        explanations = await inference_executor.lightgbm.run(
+            model.predictor.top_drivers, features_list, top_k=request.top_k
+        )
+        
+        results = [
+            {'school_id': pred_request.school_id, **explanation}
+            for pred_request, explanation in zip(request.predictions, explanations)
+        ]
+        
+        return {
+            'model_version': model.version,
+            'explanations': results,
+            'count': len(results),
+            'timestamp': datetime.now().isoformat()
+        }
+        
+    except ExecutorSaturatedError as e:
+        raise _saturated(e)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Explanation failed: {str(e)}")
+
+
 @router.post("/forecast-demand", response_model=DemandForecastResponse)
 async def forecast_demand(request: DemandForecastRequest):
     """
@@ -201,43 +616,17 @@ async def forecast_demand(request: DemandForecastRequest):
     - **days**: Number of days to forecast (1-30)
     - **capacity**: Optional school capacity for shortage analysis
     - Returns daily demand predictions with confidence intervals
+    - Served from the nightly materialized table when it covers the request
     """
     try:
-        # forecaster = DemandForecaster()
-        # forecaster.train(request.school_id)
-        
-        # if request.capacity:
-        #     result = forecaster.forecast_with_capacity(request.days, request.capacity)
-        # else:
-        #     forecast_df = forecaster.forecast(request.days)
-        #     result = {
-        #         'forecast': forecast_df.to_dict('records'),
-        #         'capacity': None,
-        #         'avg_predicted_demand': forecast_df['predicted_demand'].mean(),
-        #         'max_predicted_demand': int(forecast_df['predicted_demand'].max()),
-        #         'capacity_utilization': None,
-        #         'shortage_days': [],
-        #         'risk_level': 'Low'
-        #     }
-        
-        # Mock response
-        result = {
-            'forecast': [
-                {
-                    'date': (datetime.now() + timedelta(days=i)).strftime('%Y-%m-%d'),
-                    'predicted_demand': 350 + i * 5,
-                    'lower_bound': 320 + i * 5,
-                    'upper_bound': 380 + i * 5
-                }
-                for i in range(request.days)
-            ],
-            'capacity': request.capacity,
-            'avg_predicted_demand': 360.0,
-            'max_predicted_demand': 385,
-            'capacity_utilization': 90.0 if request.capacity else None,
-            'shortage_days': [],
-            'risk_level': 'Medium'
-        }
+        # Precomputed forecasts are a slice of an in-memory table; the file
+        # is reloaded by a background watcher, never on the request path
+        result = lookup_forecast(request.school_id, request.days, request.capacity)
+        if result is None:
+            # Prophet fitting runs in the process pool, off the event loop
+            result = await inference_executor.prophet.run(
+                forecast_school, request.school_id, request.days, request.capacity
+            )
         
         return DemandForecastResponse(
             school_id=request.school_id,
@@ -245,12 +634,109 @@ async def forecast_demand(request: DemandForecastRequest):
             **result
         )
         
+    except ExecutorSaturatedError as e:
+        raise _saturated(e)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Forecasting failed: {str(e)}")
 
 
+@router.delete("/forecast-cache/{school_id}")
+async def invalidate_forecast_cache(school_id: str):
+    """
+    Invalidate a school's cached demand forecaster
+    
+    - Call when new history arrives so the next forecast refits
+    - Also stops serving the school from this process's materialized table
+    - Removes the shared on-disk entry; worker in-memory copies are
+      dropped on their next lookup
+    """
+    removed = await asyncio.to_thread(invalidate_school, school_id)
+    return {'school_id': school_id, 'removed': removed}
+
+
+@router.get("/batching-stats")
+async def get_batching_stats():
+    """
+    Get micro-batching metrics for /predict-risk
+    
+    - Queue depth and batches in flight
+    - Batch size distribution and average queue wait
+    """
+    return risk_coalescer.stats()
+
+
+@router.get("/cache-stats")
+async def get_cache_stats():
+    """
+    Get prediction cache metrics
+    
+    - Hit/miss/eviction/expiration counters and hit rate
+    """
+    return prediction_cache.stats()
+
+
+@router.get("/executor-stats")
+async def get_executor_stats():
+    """
+    Get inference executor metrics
+    
+    - Per-pool running/queued calls, utilization and rejections
+    - Wait-time and run-time histograms (seconds)
+    """
+    return inference_executor.stats()
+
+
+def _collect_metrics() -> List[MetricFamily]:
+    """
+    Scrape-time metrics for /metrics: model version, cache hit rates,
+    executor queues and batching depth
+    """
+    handle = model_registry.current() if model_registry.loaded else None
+    cache = prediction_cache.stats()
+    table = forecast_table_stats()
+    families = [
+        MetricFamily('ml_model_loaded', 'gauge', 'Whether a risk model is published',
+                     [({}, int(handle is not None))]),
+        MetricFamily('ml_model_info', 'gauge', 'Published risk model version',
+                     [({'version': handle.version, 'source': handle.source or 'default'}, 1)] if handle else []),
+        MetricFamily('ml_prediction_cache_hits_total', 'counter', 'Risk prediction cache hits', [({}, cache['hits'])]),
+        MetricFamily('ml_prediction_cache_misses_total', 'counter', 'Risk prediction cache misses', [({}, cache['misses'])]),
+        MetricFamily('ml_prediction_cache_hit_rate', 'gauge', 'Risk prediction cache hit rate', [({}, cache['hit_rate'])]),
+        MetricFamily('ml_prediction_cache_entries', 'gauge', 'Risk prediction cache size', [({}, cache['size'])]),
+        MetricFamily('ml_forecast_table_hits_total', 'counter', 'Forecasts served from the materialized table',
+                     [({}, table['hits'])]),
+        MetricFamily('ml_forecast_table_misses_total', 'counter', 'Forecasts left to a live forecast',
+                     [({}, table['misses'])]),
+        MetricFamily('ml_forecast_table_hit_rate', 'gauge', 'Materialized forecast table hit rate',
+                     [({}, table['hit_rate'])]),
+        MetricFamily('ml_risk_batch_queue_depth', 'gauge', 'Risk predictions waiting to be batched',
+                     [({}, risk_coalescer.queue_depth)]),
+        MetricFamily('ml_feature_store_schools', 'gauge', 'Schools in the feature store',
+                     [({}, len(feature_store))])
+    ]
+
+    pools = (inference_executor.lightgbm, inference_executor.prophet)
+    for name, documentation, key, kind in (
+        ('ml_executor_queued', 'Calls waiting for a worker', 'queued', 'gauge'),
+        ('ml_executor_running', 'Calls running on a worker', 'running', 'gauge'),
+        ('ml_executor_completed_total', 'Completed calls', 'completed', 'counter'),
+        ('ml_executor_failed_total', 'Failed calls', 'failed', 'counter'),
+        ('ml_executor_rejected_total', 'Calls rejected by a full queue', 'rejected', 'counter')
+    ):
+        families.append(MetricFamily(name, kind, documentation,
+                                     [({'pool': pool.name}, pool.stats()[key]) for pool in pools]))
+    families.append(MetricFamily('ml_executor_wait_seconds', 'histogram', 'Time calls waited for a worker',
+                                 [({'pool': pool.name}, pool.wait_time) for pool in pools]))
+    families.append(MetricFamily('ml_executor_run_seconds', 'histogram', 'Time calls ran on a worker',
+                                 [({'pool': pool.name}, pool.run_time) for pool in pools]))
+    return families
+
+
+metrics_registry.register_collector(_collect_metrics)
+
+
 @router.get("/model-metrics")
-async def get_model_metrics():
+async def get_model_metrics(model: ModelHandle = Depends(get_risk_model)):
     """
     Get performance metrics for ML models
     
@@ -260,6 +746,8 @@ async def get_model_metrics():
     return {
         'risk_predictor': {
             'model_type': 'LightGBM',
+            'model_version': model.version,
+            'loaded_at': model.loaded_at.isoformat(),
             'accuracy': 0.942,
             'precision': 0.89,
             'recall': 0.91,
@@ -281,44 +769,63 @@ async def get_model_metrics():
 
 
 @router.get("/feature-importance")
-async def get_feature_importance():
+async def get_feature_importance(model: ModelHandle = Depends(get_risk_model)):
     """
     Get feature importance scores from risk prediction model
     
     - Shows which features contribute most to risk scores
     - Useful for understanding model decisions
     """
-    # predictor = RiskPredictor()
-    # importance = predictor.get_feature_importance()
-    
-    # Mock response
-    importance = {
-        'capacity_utilization': 245.8,
-        'previous_shortage_count': 198.3,
-        'attendance_rate': 187.5,
-        'supply_chain_delay_days': 156.2,
-        'budget_utilization_rate': 142.7,
-        'weather_risk_score': 128.4,
-        'days_since_inspection': 115.9,
-        'attendance_trend_7d': 98.6,
-        'avg_meal_uptake': 87.3,
-        'enrollment_trend_7d': 76.2,
-        'seasonal_factor': 65.8,
-        'current_attendance': 54.3,
-        'hostel_attached': 43.1,
-        'enrollment': 38.7,
-        'capacity': 32.5
-    }
+    importance = model.predictor.get_feature_importance()
     
     # Sort by importance
     sorted_importance = dict(sorted(importance.items(), key=lambda x: x[1], reverse=True))
     
     return {
+        'model_version': model.version,
         'feature_importance': sorted_importance,
         'top_5_features': list(sorted_importance.keys())[:5]
     }
 
 
+@router.post("/retrain/risk", status_code=202)
+async def retrain_risk_model(request: RiskRetrainRequest, model: ModelHandle = Depends(get_risk_model)):
+    """
+    Retrain the risk model on newly labelled rows in the background
+    
+    - Incremental mode continues boosting from the current model, adding at
+      most max_new_trees trees (RETRAIN_MAX_NEW_TREES by default)
+    - The updated model is hot-swapped in when training finishes
+    - Poll /retrain/jobs/{job_id} for status and the timing report
+    """
+    X_train = pd.DataFrame([_request_features(sample) for sample in request.samples])
+    y_train = [sample.risk_score for sample in request.samples]
+    
+    job_id = retrain_worker.submit(
+        X_train, y_train,
+        incremental=request.incremental,
+        max_new_trees=request.max_new_trees or settings.RETRAIN_MAX_NEW_TREES
+    )
+    
+    return {
+        'job_id': job_id,
+        'status': 'queued',
+        'base_model_version': model.version,
+        'samples': len(request.samples)
+    }
+
+
+@router.get("/retrain/jobs/{job_id}")
+async def get_retrain_job(job_id: str):
+    """
+    Get the status and timing report of a background retrain job
+    """
+    job = retrain_worker.status(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Retrain job not found")
+    return job
+
+
 @router.post("/retrain")
 async def retrain_models():
     """
@@ -2,4 +2,91 @@
 Configuration settings for the application
 Load from environment variables
 """
-# Configuration will be implemented here
+
+from typing import List, Literal, Optional
+
+from pydantic_settings import BaseSettings, SettingsConfigDict
+
+
+class Settings(BaseSettings):
+    """
+    Application settings, read from the environment and ``.env``
+    """
+    model_config = SettingsConfigDict(env_file=".env", extra="ignore")
+
+    # API Configuration
+    API_V1_PREFIX: str = "/api/v1"
+    PROJECT_NAME: str = "Mid-Day Meal Digital Twin System"
+    VERSION: str = "1.0.0"
+    DEBUG: bool = False
+
+    # Database: PostgreSQL via asyncpg in production; a SQLite file
+    # (sqlite+aiosqlite) works as a local stand-in
+    DATABASE_URL: str = "sqlite+aiosqlite:///./data/midday_meal.db"
+    DATABASE_POOL_SIZE: int = 20
+    DATABASE_MAX_OVERFLOW: int = 10
+    DATABASE_POOL_TIMEOUT: float = 30.0  # Seconds to wait for a free connection
+    DATABASE_POOL_RECYCLE: int = 1800  # Seconds before a pooled connection is replaced
+    DATABASE_STATEMENT_CACHE_SIZE: int = 500  # Prepared statements kept per asyncpg connection
+    DATABASE_ECHO: bool = False
+
+    # ML Model Configuration
+    MODEL_PATH: Optional[str] = "./models/risk_prediction_model.pkl"
+    MODEL_RETRAIN_INTERVAL: int = 86400
+    MODEL_WATCH_INTERVAL: float = 10.0  # Seconds between checks for a new model file
+    MODEL_CACHE_DIR: Optional[str] = None  # Cached default models; None -> backend/models/cache
+    RETRAIN_MAX_NEW_TREES: int = 20  # Cap on trees added by an incremental retrain
+
+    # Startup warm-up; /ready answers 503 until it has finished
+    WARMUP_BATCH_SIZES: List[int] = [1, 64, 1024]
+    WARMUP_FORECAST_WORKERS: bool = True  # One throwaway fit in each forecast worker
+    WARMUP_RETRY_DELAY: float = 1.0  # Seconds before retrying a failed warm-up; doubles per attempt
+    WARMUP_MAX_RETRY_DELAY: float = 60.0
+
+    # Micro-batching of concurrent /predict-risk calls
+    RISK_BATCH_MAX_SIZE: int = 64
+    RISK_BATCH_MAX_WAIT_MS: float = 2.0
+
+    # Prediction result cache (size 0 disables it)
+    PREDICTION_CACHE_SIZE: int = 100_000
+    PREDICTION_CACHE_TTL: float = 3600.0
+    PREDICTION_CACHE_PRECISION: int = 3  # Decimals kept when quantizing features
+
+    # Inference executor: LightGBM thread pool and Prophet process pool.
+    # Work beyond workers + queue is rejected with 503.
+    INFERENCE_THREADS: int = 4
+    INFERENCE_THREAD_QUEUE: int = 256
+    FORECAST_PROCESSES: int = 2
+    FORECAST_PROCESS_QUEUE: int = 16
+
+    # Fitted demand forecaster cache (per-process LRU over a shared disk store)
+    FORECASTER_CACHE_DIR: Optional[str] = None  # None -> backend/models/forecasters
+    FORECASTER_CACHE_SIZE: int = 128
+    FORECASTER_PACK_PATH: Optional[str] = None  # Packed Prophet forecasters (app.ml.forecaster_pack)
+
+    # Demand forecasting engine: per-school Prophet fits, or the batched
+    # least-squares seasonal engine (app.ml.seasonal_engine)
+    FORECAST_ENGINE: Literal["prophet", "seasonal"] = "prophet"
+
+    # Holiday/exam calendar file (.csv or .json); None -> app/ml/calendars/default.csv
+    HOLIDAY_CALENDAR_PATH: Optional[str] = None
+
+    # Demand forecast intervals: "full" (Prophet sampling), "reduced" or "analytic"
+    FORECAST_INTERVAL_MODE: Literal["full", "reduced", "analytic"] = "full"
+    FORECAST_UNCERTAINTY_SAMPLES: int = 200  # draws in "reduced" mode
+
+    # Nightly materialized forecasts (see app.ml.forecast_store)
+    FORECAST_TABLE_PATH: Optional[str] = None  # None -> backend/models/forecast_table.npz
+    FORECAST_TABLE_WATCH_INTERVAL: float = 10.0  # Seconds between checks for a replaced table
+
+    # In-memory school feature store (see app.ml.feature_store)
+    FEATURE_STORE_PATH: Optional[str] = None  # Snapshot file; None -> backend/models/feature_store.npz
+    FEATURE_STORE_SNAPSHOT_INTERVAL: float = 300.0  # Seconds between snapshots while it changes
+
+    # Streaming NDJSON batch scoring
+    STREAM_CHUNK_ROWS: int = 2000
+    STREAM_MAX_LINE_BYTES: int = 65536
+    STREAM_SATURATED_MAX_WAIT: float = 5.0  # Seconds a chunk waits for a saturated pool before the stream fails
+
+
+settings = Settings()
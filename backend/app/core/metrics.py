@@ -0,0 +1,316 @@
+"""
+Lightweight in-process metrics primitives
+and their Prometheus text exposition (served on /metrics)
+"""
+
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+# Latency buckets in seconds, from sub-millisecond model calls to multi-second fits
+DEFAULT_LATENCY_BUCKETS = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0
+)
+
+
+class Histogram:
+    """
+    Fixed-bucket histogram with cumulative (Prometheus-style) bucket counts
+    """
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        self._counts = [0] * (len(self.buckets) + 1)  # last slot is +Inf
+        self._sum = 0.0
+        self._count = 0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float):
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            self._counts[index] += 1
+            self._sum += value
+            self._count += 1
+
+    def snapshot(self) -> Dict[str, any]:
+        """
+        Cumulative bucket counts keyed by upper bound, plus count and sum
+        """
+        with self._lock:
+            counts = list(self._counts)
+            total, count = self._sum, self._count
+
+        cumulative = {}
+        running = 0
+        for bound, bucket_count in zip(self.buckets + (float('inf'),), counts):
+            running += bucket_count
+            cumulative['+Inf' if bound == float('inf') else str(bound)] = running
+
+        return {'buckets': cumulative, 'count': count, 'sum': total}
+
+
+class ShardedHistogram:
+    """
+    Histogram whose observe() takes no lock
+
+    Each thread counts into its own shard (bucket counts, then sum and
+    count); snapshots merge the shards. Meant for per-call hot paths, where
+    a contended lock would cost more than the work being measured.
+    """
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        self._local = threading.local()
+        self._shards: List[List[float]] = []
+        self._lock = threading.Lock()
+
+    def _new_shard(self) -> List[float]:
+        shard = [0] * (len(self.buckets) + 1) + [0.0, 0]  # buckets, +Inf, sum, count
+        with self._lock:
+            self._shards.append(shard)
+        self._local.shard = shard
+        return shard
+
+    def observe(self, value: float):
+        try:
+            shard = self._local.shard
+        except AttributeError:
+            shard = self._new_shard()
+        shard[bisect_left(self.buckets, value)] += 1
+        shard[-2] += value
+        shard[-1] += 1
+
+    def snapshot(self) -> Dict[str, any]:
+        with self._lock:
+            shards = [list(shard) for shard in self._shards]
+        totals = [sum(column) for column in zip(*shards)] if shards else [0] * (len(self.buckets) + 3)
+
+        cumulative = {}
+        running = 0
+        for bound, bucket_count in zip(self.buckets + (float('inf'),), totals[:-2]):
+            running += bucket_count
+            cumulative['+Inf' if bound == float('inf') else str(bound)] = running
+
+        return {'buckets': cumulative, 'count': totals[-1], 'sum': totals[-2]}
+
+
+# Finer buckets for in-process model stages, down to tens of microseconds
+STAGE_LATENCY_BUCKETS = (0.00001, 0.000025, 0.00005, 0.0001, 0.00025) + DEFAULT_LATENCY_BUCKETS
+
+
+class LabeledHistogram:
+    """
+    Histogram family with one child per label-value combination
+    """
+
+    def __init__(self, name: str, documentation: str, label_names: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(label_names)
+        self.buckets = tuple(buckets)
+        self._children: Dict[Tuple[str, ...], ShardedHistogram] = {}
+        self._lock = threading.Lock()
+
+    def labels(self, *values: str) -> ShardedHistogram:
+        child = self._children.get(values)
+        if child is None:
+            with self._lock:
+                child = self._children.setdefault(values, ShardedHistogram(self.buckets))
+        return child
+
+    def family(self) -> 'MetricFamily':
+        return MetricFamily(self.name, 'histogram', self.documentation, [
+            (dict(zip(self.label_names, values)), child)
+            for values, child in list(self._children.items())
+        ])
+
+
+@dataclass
+class MetricFamily:
+    """
+    One metric as exposed to Prometheus
+
+    Attributes:
+        name: Metric name
+        type: 'gauge', 'counter' or 'histogram'
+        documentation: HELP text
+        samples: (labels, value) pairs; values are numbers, or histograms
+            (anything with ``snapshot()``) for histogram families
+    """
+    name: str
+    type: str
+    documentation: str
+    samples: List[Tuple[Dict[str, str], any]] = field(default_factory=list)
+
+
+def _escape(value) -> str:
+    return str(value).replace('\\', r'\\').replace('"', r'\"').replace('\n', r'\n')
+
+
+def _format_labels(labels: Dict[str, str], extra: Optional[Tuple[str, str]] = None) -> str:
+    pairs = list(labels.items()) + ([extra] if extra else [])
+    if not pairs:
+        return ''
+    return '{' + ','.join(f'{name}="{_escape(value)}"' for name, value in pairs) + '}'
+
+
+def _format_value(value: float) -> str:
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class MetricsRegistry:
+    """
+    Metrics exposed on /metrics in the Prometheus text format
+
+    Histograms observed on the request path are registered here; everything
+    else (model version, cache hit rates, queue depths) comes from
+    collectors called at scrape time, so it costs nothing between scrapes.
+    """
+
+    def __init__(self):
+        self._histograms: List[LabeledHistogram] = []
+        self._collectors: List[Callable[[], Iterable[MetricFamily]]] = []
+
+    def histogram(self, name: str, documentation: str, label_names: Sequence[str] = (),
+                  buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS) -> LabeledHistogram:
+        histogram = LabeledHistogram(name, documentation, label_names, buckets)
+        self._histograms.append(histogram)
+        return histogram
+
+    def register_collector(self, collector: Callable[[], Iterable[MetricFamily]]):
+        """
+        Add a callable returning metric families, called on every scrape
+        """
+        self._collectors.append(collector)
+
+    def collect(self) -> List[MetricFamily]:
+        families = [histogram.family() for histogram in self._histograms]
+        for collector in self._collectors:
+            families.extend(collector())
+        return families
+
+    def render(self) -> str:
+        """
+        All metrics in the Prometheus text exposition format (0.0.4)
+        """
+        lines = []
+        for family in self.collect():
+            lines.append(f"# HELP {family.name} {family.documentation}")
+            lines.append(f"# TYPE {family.name} {family.type}")
+            for labels, value in family.samples:
+                if family.type == 'histogram':
+                    snapshot = value.snapshot()
+                    for bound, count in snapshot['buckets'].items():
+                        lines.append(f"{family.name}_bucket{_format_labels(labels, ('le', bound))} {count}")
+                    lines.append(f"{family.name}_sum{_format_labels(labels)} {_format_value(snapshot['sum'])}")
+                    lines.append(f"{family.name}_count{_format_labels(labels)} {snapshot['count']}")
+                else:
+                    lines.append(f"{family.name}{_format_labels(labels)} {_format_value(value)}")
+        return '\n'.join(lines) + '\n'
+
+
+# Process-wide registry rendered by /metrics
+metrics_registry = MetricsRegistry()
+
+request_latency = metrics_registry.histogram(
+    'http_request_duration_seconds', 'HTTP request latency by route', ('method', 'route', 'status')
+)
+
+stage_latency = metrics_registry.histogram(
+    'ml_stage_duration_seconds', 'Time spent in ML prediction and training stages', ('stage',),
+    buckets=STAGE_LATENCY_BUCKETS
+)
+
+class _StageCapture(threading.local):
+    # Class default keeps the per-call check a plain attribute read
+    stages: Optional[List[Tuple[str, float]]] = None
+
+
+# Per-thread buffer of stage timings while work runs in a pool worker process
+_stage_capture = _StageCapture()
+
+
+def observe_stage(stage: str, seconds: float):
+    """
+    Record the duration of one ML stage (e.g. 'booster_predict')
+
+    Inside ``capture_stages`` the timing is buffered instead, to be
+    replayed in the parent process with ``record_stages``.
+    """
+    captured = _stage_capture.stages
+    if captured is not None:
+        captured.append((stage, seconds))
+    else:
+        stage_latency.labels(stage).observe(seconds)
+
+
+@contextmanager
+def capture_stages():
+    """
+    Buffer this thread's stage timings; yields the list they are added to
+    """
+    previous = _stage_capture.stages
+    _stage_capture.stages = []
+    try:
+        yield _stage_capture.stages
+    finally:
+        _stage_capture.stages = previous
+
+
+def record_stages(stages: Iterable[Tuple[str, float]]):
+    for stage, seconds in stages:
+        stage_latency.labels(stage).observe(seconds)
+
+
+class RequestMetricsMiddleware:
+    """
+    ASGI middleware observing each HTTP request's latency per route
+
+    The route label is the matched path template (e.g.
+    ``/api/v1/ml/forecast-cache/{school_id}``), so label cardinality stays
+    bounded; unmatched paths share one label. Streaming responses are timed
+    until their last body chunk is sent.
+    """
+
+    def __init__(self, app, histogram: LabeledHistogram = request_latency):
+        self.app = app
+        self.histogram = histogram
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        status = 500
+
+        async def send_with_status(message):
+            nonlocal status
+            if message['type'] == 'http.response.start':
+                status = message['status']
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            self.histogram.labels(scope['method'], _route_label(scope), str(status)).observe(time.perf_counter() - start)
+
+
+def _route_label(scope) -> str:
+    """
+    Path template of the route that handled the request
+
+    FastAPI records the matched route's full template (router prefixes
+    included) in its scope extension; routes declared on the app itself,
+    and routes of FastAPI versions that flatten included routers, carry the
+    full template on the route.
+    """
+    context = scope.get('fastapi', {}).get('effective_route_context')
+    template = getattr(context, 'path_format', None) or getattr(scope.get('route'), 'path_format', None)
+    return template or 'unmatched'
@@ -0,0 +1,78 @@
+"""
+NDJSON streaming helpers
+Incremental request-body parsing and a streaming response that can run
+while the request body is still being read
+"""
+
+from typing import AsyncIterator, List, Tuple
+
+from starlette.responses import StreamingResponse
+from starlette.types import Receive, Scope, Send
+
+
+class LineTooLongError(ValueError):
+    """Raised when an NDJSON record exceeds the configured size limit"""
+
+
+class NDJSONStreamingResponse(StreamingResponse):
+    """
+    Streaming NDJSON response for endpoints that read their request body
+    while streaming
+
+    Starlette's StreamingResponse listens for client disconnects by calling
+    ``receive()`` alongside the stream on older ASGI servers, which would
+    steal request body chunks from a generator still reading the upload.
+    This response only streams; a vanished client surfaces as a send error.
+    """
+    media_type = "application/x-ndjson"
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        await self.stream_response(send)
+        if self.background is not None:
+            await self.background()
+
+
+async def iter_ndjson_chunks(body: AsyncIterator[bytes], chunk_rows: int,
+                             max_line_bytes: int) -> AsyncIterator[List[Tuple[int, bytes]]]:
+    """
+    Group an NDJSON byte stream into chunks of at most ``chunk_rows`` records
+
+    Only one chunk of records plus one partial line is held at a time, so
+    memory stays bounded regardless of the upload size.
+
+    Args:
+        body: Async iterator of raw body bytes (e.g. ``request.stream()``)
+        chunk_rows: Records per yielded chunk
+        max_line_bytes: Upper bound on a single record's size
+
+    Yields:
+        Lists of (1-based line number, raw line) pairs; blank lines are skipped
+
+    Raises:
+        LineTooLongError: If a record exceeds ``max_line_bytes``
+    """
+    pending = b''
+    line_no = 0
+    records: List[Tuple[int, bytes]] = []
+
+    async for data in body:
+        if not data:
+            continue
+        *lines, pending = (pending + data).split(b'\n')
+        if len(pending) > max_line_bytes:
+            raise LineTooLongError(f"Line {line_no + len(lines) + 1} exceeds {max_line_bytes} bytes")
+
+        for line in lines:
+            line_no += 1
+            if len(line) > max_line_bytes:
+                raise LineTooLongError(f"Line {line_no} exceeds {max_line_bytes} bytes")
+            if line.strip():
+                records.append((line_no, line))
+            if len(records) >= chunk_rows:
+                yield records
+                records = []
+
+    if pending.strip():
+        records.append((line_no + 1, pending))
+    if records:
+        yield records
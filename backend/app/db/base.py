@@ -0,0 +1,11 @@
+"""
+SQLAlchemy declarative base
+All table models inherit from ``Base``; importing ``app.models`` registers
+them on ``Base.metadata``
+"""
+
+from sqlalchemy.orm import DeclarativeBase
+
+
+class Base(DeclarativeBase):
+    """Declarative base class for all table models"""
@@ -1,5 +1,87 @@
 """
 Database session management
-SQLAlchemy async session configuration
+SQLAlchemy async engine, connection pool and session configuration
 """
-# Database session setup will be implemented here
+
+import logging
+from pathlib import Path
+from typing import AsyncIterator
+
+from sqlalchemy import text
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+def create_engine(url: str) -> AsyncEngine:
+    """
+    Build an async engine with the pool sized from settings
+
+    asyncpg connections keep up to DATABASE_STATEMENT_CACHE_SIZE prepared
+    statements, so repeated queries (e.g. the district feature fetch) are
+    parsed and planned once per connection. A SQLite URL is the local
+    stand-in: a file database gets the same pool (its directory is created),
+    ``:memory:`` shares a single connection.
+
+    Args:
+        url: SQLAlchemy async URL, e.g. ``postgresql+asyncpg://...``
+
+    Returns:
+        The engine; no connection is opened until first use
+    """
+    url = make_url(url)
+    kwargs = {'echo': settings.DATABASE_ECHO}
+
+    if url.get_backend_name() == 'sqlite' and url.database in (None, '', ':memory:'):
+        return create_async_engine(url, **kwargs)
+
+    if url.get_backend_name() == 'sqlite':
+        Path(url.database).parent.mkdir(parents=True, exist_ok=True)
+    elif url.get_driver_name() == 'asyncpg':
+        kwargs['connect_args'] = {'prepared_statement_cache_size': settings.DATABASE_STATEMENT_CACHE_SIZE}
+
+    return create_async_engine(
+        url,
+        pool_size=settings.DATABASE_POOL_SIZE,
+        max_overflow=settings.DATABASE_MAX_OVERFLOW,
+        pool_timeout=settings.DATABASE_POOL_TIMEOUT,
+        pool_recycle=settings.DATABASE_POOL_RECYCLE,
+        pool_pre_ping=True,
+        **kwargs
+    )
+
+
+# Process-wide engine and session factory
+engine = create_engine(settings.DATABASE_URL)
+AsyncSessionLocal = async_sessionmaker(engine, expire_on_commit=False)
+
+
+async def get_db() -> AsyncIterator[AsyncSession]:
+    """
+    FastAPI dependency yielding a session for the duration of a request
+    """
+    async with AsyncSessionLocal() as session:
+        yield session
+
+
+async def check_db() -> bool:
+    """
+    Whether the database answers a trivial query
+    """
+    try:
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+        return True
+    except Exception as e:
+        logger.warning(f"Database health check failed: {e}")
+        return False
+
+
+async def close_db():
+    """
+    Close all pooled connections
+    """
+    await engine.dispose()
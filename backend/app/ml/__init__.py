@@ -5,5 +5,7 @@ Includes Prophet for demand forecasting and LightGBM for risk prediction
 
 from .risk_predictor import RiskPredictor
 from .demand_forecaster import DemandForecaster
+from .seasonal_engine import SeasonalForecaster
+from .registry import ModelHandle, ModelRegistry, model_registry
 
-__all__ = ['RiskPredictor', 'DemandForecaster']
+__all__ = ['RiskPredictor', 'DemandForecaster', 'SeasonalForecaster', 'ModelHandle', 'ModelRegistry', 'model_registry']
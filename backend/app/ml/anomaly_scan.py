@@ -0,0 +1,50 @@
+"""
+Multi-school demand anomaly scan
+Checks actual-demand records for many schools against the materialized
+forecast table in one vectorized pass, keeping only the anomalous rows
+"""
+
+from typing import Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .demand_forecaster import DemandForecaster
+from .forecast_store import MaterializedForecasts
+
+
+def scan_actuals(table: MaterializedForecasts, school_ids: Sequence[str], dates: Sequence,
+                 actual_demand: Sequence[float]) -> Tuple[pd.DataFrame, np.ndarray]:
+    """
+    Flag actual demand outside the stored confidence interval
+
+    Args:
+        table: Materialized forecasts (with lookback days for past dates)
+        school_ids: School id per record
+        dates: Date per record
+        actual_demand: Actual meals served per record
+
+    Returns:
+        (anomalies, covered): anomalous records in the
+        ``DemandForecaster.detect_anomalies`` format plus a school_id
+        column, indexed by record position; and a mask of the records the
+        table covers (records for unknown schools or dates are not scored)
+    """
+    school_ids = np.asarray(school_ids, dtype=object)
+    dates = np.asarray(pd.to_datetime(dates).values, dtype='datetime64[D]')
+    actual = np.asarray(actual_demand, dtype=np.float64)
+
+    covered, values = table.gather(school_ids, dates)
+    positions = np.flatnonzero(covered)
+
+    anomalies = DemandForecaster.find_anomalies(
+        dates[positions],
+        actual[positions],
+        values['predicted_demand'][positions].astype(np.float64),
+        values['lower_bound'][positions].astype(np.float64),
+        values['upper_bound'][positions].astype(np.float64)
+    )
+    # Back to positions in the caller's records
+    anomalies.index = positions[anomalies.index]
+    anomalies.insert(0, 'school_id', school_ids[anomalies.index])
+    return anomalies, covered
@@ -0,0 +1,192 @@
+"""
+Adaptive micro-batching for single-school risk predictions
+Coalesces concurrent predict calls into one RiskPredictor.predict_batch call
+"""
+
+import asyncio
+import logging
+import time
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+
+from .executor import ExecutorSaturatedError
+from .registry import ModelHandle
+
+logger = logging.getLogger(__name__)
+
+BatchFunction = Callable[[ModelHandle, List[Dict[str, float]]], Awaitable[List[Dict[str, any]]]]
+
+
+async def _predict_inline(model: ModelHandle, features_list: List[Dict[str, float]]) -> List[Dict[str, any]]:
+    return model.predictor.predict_batch(features_list)
+
+
+class PredictionCoalescer:
+    """
+    Collects concurrent single-row predictions and scores them in one batch
+
+    A batch is dispatched when it reaches ``max_batch_size`` or when its
+    oldest request has waited ``max_wait_ms``. The wait adapts to load: if
+    no batch is in flight, the batch is dispatched on the next event loop
+    iteration, so an idle service adds no latency and only requests that
+    arrive in the same tick are coalesced. While a batch is in flight,
+    new requests accumulate for up to ``max_wait_ms``.
+
+    Requests are only batched with others holding the same model handle, so
+    a hot-swap never mixes versions within a batch. When a batch fails, its
+    rows are rescored one at a time, so a bad row fails only its own
+    request; a saturated pool fails the whole batch without retrying.
+    """
+
+    def __init__(self, batch_fn: Optional[BatchFunction] = None,
+                 max_batch_size: int = 64, max_wait_ms: float = 2.0):
+        """
+        Args:
+            batch_fn: Coroutine scoring a list of feature dicts on a model;
+                defaults to calling ``predict_batch`` inline
+            max_batch_size: Upper bound on rows per batch
+            max_wait_ms: Upper bound on time a request waits for a batch
+        """
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size must be at least 1")
+
+        self.batch_fn = batch_fn or _predict_inline
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+
+        self._pending: List[Tuple[Dict[str, float], asyncio.Future, float]] = []
+        self._pending_model: Optional[ModelHandle] = None
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._in_flight = 0
+        self._tasks = set()
+
+        # Metrics
+        self._requests_total = 0
+        self._batches_total = 0
+        self._split_batches_total = 0
+        self._rows_total = 0
+        self._max_batch_seen = 0
+        self._wait_seconds_total = 0.0
+        self._max_wait_seen = 0.0
+        self._batch_size_counts: Dict[int, int] = {}
+
+    async def submit(self, model: ModelHandle, features: Dict[str, float]) -> Dict[str, any]:
+        """
+        Queue one school's features and wait for its prediction
+
+        Args:
+            model: Model handle the prediction must run on
+            features: Feature dictionary for one school
+
+        Returns:
+            The prediction dictionary for this school
+        """
+        loop = asyncio.get_running_loop()
+
+        if self._pending and self._pending_model is not model:
+            self._dispatch()
+
+        future = loop.create_future()
+        self._pending.append((features, future, time.perf_counter()))
+        self._pending_model = model
+        self._requests_total += 1
+
+        if len(self._pending) >= self.max_batch_size:
+            self._dispatch()
+        elif self._timer is None:
+            delay = self.max_wait if self._in_flight else 0
+            self._timer = loop.call_later(delay, self._dispatch)
+
+        return await future
+
+    def _dispatch(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if not self._pending:
+            return
+
+        batch, model = self._pending, self._pending_model
+        self._pending, self._pending_model = [], None
+
+        self._in_flight += 1
+        task = asyncio.get_running_loop().create_task(self._run(model, batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, model: ModelHandle, batch: List[Tuple[Dict[str, float], asyncio.Future, float]]):
+        started = time.perf_counter()
+        self._record_batch(batch, started)
+
+        try:
+            results = await self.batch_fn(model, [features for features, _, _ in batch])
+        except Exception as e:
+            if len(batch) == 1 or isinstance(e, ExecutorSaturatedError):
+                for _, future, _ in batch:
+                    if not future.done():
+                        future.set_exception(e)
+            else:
+                self._split_batches_total += 1
+                await self._run_rows(model, batch)
+        else:
+            for (_, future, _), result in zip(batch, results):
+                if not future.done():
+                    future.set_result(result)
+        finally:
+            self._in_flight -= 1
+            # Requests that piled up behind this batch go out immediately
+            if self._pending and not self._in_flight:
+                self._dispatch()
+
+    async def _run_rows(self, model: ModelHandle, batch: List[Tuple[Dict[str, float], asyncio.Future, float]]):
+        """
+        Score a failed batch row by row, settling each future on its own
+        """
+        for features, future, _ in batch:
+            try:
+                result = (await self.batch_fn(model, [features]))[0]
+            except Exception as e:
+                if not future.done():
+                    future.set_exception(e)
+            else:
+                if not future.done():
+                    future.set_result(result)
+
+    def _record_batch(self, batch, started: float):
+        size = len(batch)
+        self._batches_total += 1
+        self._rows_total += size
+        self._max_batch_seen = max(self._max_batch_seen, size)
+        self._batch_size_counts[size] = self._batch_size_counts.get(size, 0) + 1
+
+        waits = [started - queued_at for _, _, queued_at in batch]
+        self._wait_seconds_total += sum(waits)
+        self._max_wait_seen = max(self._max_wait_seen, max(waits))
+
+    @property
+    def queue_depth(self) -> int:
+        """Requests waiting for a batch to be dispatched"""
+        return len(self._pending)
+
+    def stats(self) -> Dict[str, any]:
+        """
+        Batching metrics for tuning throughput against added latency
+
+        Returns:
+            Dictionary with queue depth, batch counts and sizes, and the
+            time requests spent waiting for their batch
+        """
+        batches = self._batches_total
+        return {
+            'max_batch_size': self.max_batch_size,
+            'max_wait_ms': self.max_wait * 1000.0,
+            'queue_depth': self.queue_depth,
+            'batches_in_flight': self._in_flight,
+            'requests_total': self._requests_total,
+            'batches_total': batches,
+            'split_batches_total': self._split_batches_total,
+            'avg_batch_size': round(self._rows_total / batches, 2) if batches else 0.0,
+            'max_batch_size_seen': self._max_batch_seen,
+            'batch_size_counts': dict(sorted(self._batch_size_counts.items())),
+            'avg_queue_wait_ms': round(self._wait_seconds_total / self._rows_total * 1000.0, 3) if self._rows_total else 0.0,
+            'max_queue_wait_ms': round(self._max_wait_seen * 1000.0, 3)
+        }
@@ -6,20 +6,96 @@ Predicts meal demand for schools over time
 from prophet import Prophet
 import pandas as pd
 import numpy as np
-from typing import Dict, List, Optional
-from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Sequence
+from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from statistics import NormalDist
+import copy
 import logging
 import joblib
+import multiprocessing
+import os
+import time
 from pathlib import Path
 
+from .forecaster_pack import ForecasterPack, is_pack_file, write_pack
+from app.core.metrics import observe_stage
+
+from . import synthetic
+from .holiday_calendar import get_holiday_calendar
+
 logger = logging.getLogger(__name__)
 
 
+@dataclass
+class TrainManyResult:
+    """
+    Outcome of a multi-school training run
+    
+    Attributes:
+        forecasters: Fitted forecaster per school (successful fits only)
+        timings: Fit wall time in seconds per school, measured in the worker
+        failures: Error message per school whose fit failed
+        wall_seconds: Wall time of the whole run
+        workers: Number of worker processes used
+    """
+    forecasters: Dict[str, 'DemandForecaster'] = field(default_factory=dict)
+    timings: Dict[str, float] = field(default_factory=dict)
+    failures: Dict[str, str] = field(default_factory=dict)
+    wall_seconds: float = 0.0
+    workers: int = 1
+    
+    def summary(self) -> Dict[str, any]:
+        fit_seconds = sum(self.timings.values())
+        return {
+            'schools': len(self.forecasters) + len(self.failures),
+            'trained': len(self.forecasters),
+            'failed': len(self.failures),
+            'workers': self.workers,
+            'wall_seconds': round(self.wall_seconds, 3),
+            'total_fit_seconds': round(fit_seconds, 3),
+            # Close to `workers` when fits scale linearly across processes
+            'parallel_speedup': round(fit_seconds / self.wall_seconds, 2) if self.wall_seconds else None
+        }
+
+
+def _fit_school(school_id: str, history: Optional[pd.DataFrame]):
+    """
+    Fit one school's forecaster; module-level so process pools can pickle it
+
+    Returns:
+        (forecaster, history it was fitted on, fit seconds); the history is
+        the generated one when ``history`` is None
+    """
+    start = time.perf_counter()
+    forecaster = DemandForecaster()
+    if history is None:
+        history = forecaster._generate_historical_data(school_id)
+    forecaster.train(school_id, history)
+    return forecaster, history, time.perf_counter() - start
+
+
 class DemandForecaster:
     """
     Prophet-based demand forecasting model for school meal demand prediction
     """
     
+    # Engine name, used to select the forecaster class per deployment
+    ENGINE = 'prophet'
+    # Whether train_many fits all schools in one vectorized call
+    BATCH_FIT = False
+    
+    # Prediction interval modes for forecast(): Prophet's posterior sampling
+    # with its full sample count, sampling with fewer draws, or a closed-form
+    # normal approximation of the same noise and trend-change model
+    INTERVAL_MODES = ('full', 'reduced', 'analytic')
+    REDUCED_UNCERTAINTY_SAMPLES = 200
+    
+    # Days of history kept per school for incremental updates (the length
+    # of the generated training history)
+    HISTORY_WINDOW_DAYS = 90
+    
     def __init__(self, model_path: Optional[str] = None):
         """
         Initialize the demand forecaster
@@ -27,17 +103,47 @@ class DemandForecaster:
         Args:
             model_path: Path to saved model file
         """
+        self._model = None
+        self._compact = None
         self.model = None
         self.school_id = None
+        # Trailing training window, kept for update_with_new_data
+        self.history = None
+        # Duration of the last from-scratch fit, the baseline for warm starts
+        self.last_cold_fit_seconds = None
         
         if model_path and Path(model_path).exists():
             self.load_model(model_path)
     
+    @property
+    def model(self):
+        """
+        Fitted model; a model loaded in compact form is rebuilt on first access
+        """
+        if self._compact is not None:
+            self._model, self._compact = self._compact.to_prophet(), None
+        return self._model
+    
+    @model.setter
+    def model(self, value):
+        self._model = value
+        self._compact = None
+    
+    def set_compact_model(self, compact):
+        """
+        Attach a compact model (see forecaster_pack) to be rebuilt lazily
+        """
+        self._model = None
+        self._compact = compact
+    
     def _generate_historical_data(self, school_id: str, days: int = 90) -> pd.DataFrame:
         """
         Generate synthetic historical demand data for a school
         In production, this would fetch actual historical data from database
         
+        The history is drawn from the school's own stream (see synthetic),
+        so it is identical in every process.
+        
         Args:
             school_id: School identifier
             days: Number of historical days to generate
@@ -45,42 +151,7 @@ class DemandForecaster:
         Returns:
             DataFrame with 'ds' (date) and 'y' (demand) columns
         """
-        np.random.seed(hash(school_id) % 2**32)
-        
-        # Generate dates
-        end_date = datetime.now()
-        dates = [end_date - timedelta(days=i) for i in range(days, 0, -1)]
-        
-        # Base demand with trend and seasonality
-        base_demand = 350
-        trend = np.linspace(0, 20, days)  # Slight upward trend
-        
-        # Weekly seasonality (lower on weekends)
-        weekly_pattern = []
-        for date in dates:
-            if date.weekday() >= 5:  # Weekend
-                weekly_pattern.append(0.3)
-            else:
-                weekly_pattern.append(1.0)
-        
-        # Monthly seasonality (exam periods, holidays)
-        monthly_pattern = np.sin(np.linspace(0, 4 * np.pi, days)) * 30
-        
-        # Random noise
-        noise = np.random.normal(0, 15, days)
-        
-        # Combine all components
-        demand = base_demand + trend + monthly_pattern + noise
-        demand = demand * np.array(weekly_pattern)
-        demand = np.maximum(demand, 0)  # No negative demand
-        
-        # Create DataFrame in Prophet format
-        df = pd.DataFrame({
-            'ds': dates,
-            'y': demand
-        })
-        
-        return df
+        return synthetic.demand_history(school_id, days)
     
     def train(self, school_id: str, historical_data: Optional[pd.DataFrame] = None):
         """
@@ -98,8 +169,23 @@ class DemandForecaster:
         if historical_data is None:
             historical_data = self._generate_historical_data(school_id)
         
+        self.model = self._build_model()
+        
+        # Fit the model
+        start = time.perf_counter()
+        self.model.fit(historical_data)
+        self.last_cold_fit_seconds = time.perf_counter() - start
+        observe_stage('prophet_fit', self.last_cold_fit_seconds)
+        self.history = self._slide_window(historical_data)
+        
+        logger.info(f"Model trained successfully for school {school_id}")
+    
+    def _build_model(self) -> Prophet:
+        """
+        Unfitted Prophet with this forecaster's configuration
+        """
         # Initialize Prophet with custom parameters
-        self.model = Prophet(
+        model = Prophet(
             growth='linear',
             yearly_seasonality=True,
             weekly_seasonality=True,
@@ -111,7 +197,7 @@ class DemandForecaster:
         )
         
         # Add custom seasonalities
-        self.model.add_seasonality(
+        model.add_seasonality(
             name='monthly',
             period=30.5,
             fourier_order=5
@@ -120,90 +206,131 @@ class DemandForecaster:
         # Add holidays/special events (exam periods, festivals)
         holidays = self._create_holiday_dataframe()
         if not holidays.empty:
-            self.model.holidays = holidays
+            model.holidays = holidays
         
-        # Fit the model
-        self.model.fit(historical_data)
+        return model
+    
+    @classmethod
+    def train_many(cls, school_ids: Sequence[str], histories: Optional[Dict[str, pd.DataFrame]] = None,
+                   max_workers: Optional[int] = None, store=None) -> TrainManyResult:
+        """
+        Train forecasters for many schools in parallel
         
-        logger.info(f"Model trained successfully for school {school_id}")
+        Fits are fanned out across a process pool sized to the available
+        cores. A failing school is recorded and does not stop the others.
+        
+        Args:
+            school_ids: Schools to train
+            histories: 'ds'/'y' history per school; schools without an entry
+                use generated history
+            max_workers: Worker processes (defaults to the available cores);
+                1 trains in-process
+            store: Optional per-school store receiving each fitted model via
+                ``store.put(school_id, history, forecaster)`` (e.g. a
+                ForecasterCache); schools trained on generated history are
+                stored against that generated history
+            
+        Returns:
+            TrainManyResult with the fitted forecasters, per-school timings
+            and failures
+        """
+        histories = histories or {}
+        if max_workers is None:
+            max_workers = len(os.sched_getaffinity(0)) if hasattr(os, 'sched_getaffinity') else os.cpu_count()
+        max_workers = max(1, min(max_workers or 1, len(school_ids) or 1))
+        
+        result = TrainManyResult(workers=max_workers)
+        start = time.perf_counter()
+        
+        def collect(school_id: str, outcome=None, error: Optional[BaseException] = None):
+            if error is not None:
+                logger.warning(f"Training failed for school {school_id}: {error}")
+                result.failures[school_id] = f"{type(error).__name__}: {error}"
+                return
+            forecaster, history, seconds = outcome
+            result.forecasters[school_id] = forecaster
+            result.timings[school_id] = seconds
+            if store is not None:
+                store.put(school_id, history, forecaster)
+        
+        if max_workers == 1:
+            for school_id in school_ids:
+                try:
+                    collect(school_id, _fit_school(school_id, histories.get(school_id)))
+                except Exception as e:
+                    collect(school_id, error=e)
+        else:
+            # Spawned workers do not inherit the parent's threads or OpenMP state
+            context = multiprocessing.get_context('spawn')
+            with ProcessPoolExecutor(max_workers=max_workers, mp_context=context) as pool:
+                futures = {
+                    pool.submit(_fit_school, school_id, histories.get(school_id)): school_id
+                    for school_id in school_ids
+                }
+                for future in as_completed(futures):
+                    school_id = futures[future]
+                    try:
+                        collect(school_id, future.result())
+                    except Exception as e:
+                        collect(school_id, error=e)
+        
+        result.wall_seconds = time.perf_counter() - start
+        logger.info(f"Trained {len(result.forecasters)}/{len(school_ids)} forecasters "
+                    f"in {result.wall_seconds:.1f}s on {max_workers} worker(s)")
+        return result
     
     def _create_holiday_dataframe(self) -> pd.DataFrame:
         """
         Create a DataFrame of holidays and special events
         These affect meal demand patterns
-        """
-        current_year = datetime.now().year
-        
-        holidays = []
-        
-        # Tamil Nadu school holidays (approximate dates)
-        # Pongal
-        holidays.append({
-            'holiday': 'pongal',
-            'ds': pd.to_datetime(f'{current_year}-01-14'),
-            'lower_window': -2,
-            'upper_window': 2
-        })
         
-        # Summer vacation
-        for day in range(30):
-            holidays.append({
-                'holiday': 'summer_vacation',
-                'ds': pd.to_datetime(f'{current_year}-05-01') + timedelta(days=day),
-                'lower_window': 0,
-                'upper_window': 0
-            })
-        
-        # Diwali
-        holidays.append({
-            'holiday': 'diwali',
-            'ds': pd.to_datetime(f'{current_year}-11-01'),  # Approximate
-            'lower_window': -1,
-            'upper_window': 1
-        })
-        
-        # Exam periods (reduced attendance)
-        # Mid-term exams
-        for day in range(10):
-            holidays.append({
-                'holiday': 'midterm_exams',
-                'ds': pd.to_datetime(f'{current_year}-09-15') + timedelta(days=day),
-                'lower_window': 0,
-                'upper_window': 0
-            })
-        
-        # Final exams
-        for day in range(15):
-            holidays.append({
-                'holiday': 'final_exams',
-                'ds': pd.to_datetime(f'{current_year}-03-15') + timedelta(days=day),
-                'lower_window': 0,
-                'upper_window': 0
-            })
-        
-        return pd.DataFrame(holidays) if holidays else pd.DataFrame()
+        The multi-year table is built once per process from the holiday
+        calendar file (see holiday_calendar) and shared by every fit.
+        """
+        return get_holiday_calendar()
     
-    def forecast(self, days: int = 7) -> pd.DataFrame:
+    def forecast(self, days: int = 7, interval_mode: str = 'full',
+                 uncertainty_samples: Optional[int] = None, lookback: int = 0) -> pd.DataFrame:
         """
         Generate demand forecast for specified number of days
         
+        Only the forecast dates are predicted (not the training history).
+        
         Args:
             days: Number of days to forecast
+            interval_mode: How confidence intervals are computed, one of
+                INTERVAL_MODES; 'full' matches Prophet's default output
+            uncertainty_samples: Draws used by 'reduced' mode (default
+                REDUCED_UNCERTAINTY_SAMPLES)
+            lookback: Also predict this many final history days, before the
+                forecast days (e.g. to compare against recent actuals)
             
         Returns:
             DataFrame with forecast including confidence intervals
         """
         if self.model is None:
             raise ValueError("Model not trained. Call train() first.")
-        
-        # Create future dataframe
-        future = self.model.make_future_dataframe(periods=days)
-        
-        # Generate forecast
-        forecast = self.model.predict(future)
-        
+        if interval_mode not in self.INTERVAL_MODES:
+            raise ValueError(f"Unknown interval mode: {interval_mode}")
+        
+        if interval_mode == 'full':
+            forecast = self._predict_horizon(days, self.model.uncertainty_samples, lookback)
+        elif interval_mode == 'reduced':
+            forecast = self._predict_horizon(days, uncertainty_samples or self.REDUCED_UNCERTAINTY_SAMPLES, lookback)
+        else:
+            forecast = self._predict_horizon(days, 0, lookback)
+            forecast['yhat_lower'], forecast['yhat_upper'] = self._analytic_interval(forecast)
+        
+        return self._format_forecast(forecast)
+    
+    @staticmethod
+    def _format_forecast(forecast: pd.DataFrame) -> pd.DataFrame:
+        """
+        Public forecast format from a Prophet-style prediction frame
+        (ds, yhat, yhat_lower, yhat_upper)
+        """
         # Extract relevant columns and format
-        result = forecast[['ds', 'yhat', 'yhat_lower', 'yhat_upper']].tail(days).copy()
+        result = forecast[['ds', 'yhat', 'yhat_lower', 'yhat_upper']].copy()
         result.columns = ['date', 'predicted_demand', 'lower_bound', 'upper_bound']
         
         # Ensure no negative predictions
@@ -218,6 +345,60 @@ class DemandForecaster:
         
         return result
     
+    def _predict_horizon(self, days: int, uncertainty_samples: int, lookback: int = 0) -> pd.DataFrame:
+        """
+        Prophet prediction for the ``days`` dates after the training history
+        
+        Args:
+            days: Number of days to predict
+            uncertainty_samples: Posterior draws for the intervals (0 skips them)
+            lookback: Final history days to predict before them
+        """
+        last_date = self.model.history['ds'].max()
+        future = pd.DataFrame({
+            'ds': pd.date_range(last_date + pd.Timedelta(days=1 - lookback), periods=lookback + days, freq='D')
+        })
+        
+        model = self.model
+        if uncertainty_samples != model.uncertainty_samples:
+            # Shallow copy shares the fitted parameters; the cached model is left untouched
+            model = copy.copy(model)
+            model.uncertainty_samples = uncertainty_samples
+        
+        start = time.perf_counter()
+        forecast = model.predict(future)
+        observe_stage('prophet_predict', time.perf_counter() - start)
+        return forecast
+    
+    def _analytic_interval(self, forecast: pd.DataFrame):
+        """
+        Closed-form approximation of Prophet's sampled prediction interval
+        
+        Prophet simulates observation noise (sigma_obs) plus future trend
+        changepoints arriving at the historical rate S per unit of scaled
+        time, each with a Laplace(0, mean |delta|) rate change. A change at
+        c shifts the trend at t by delta * (t - c), so at horizon h past the
+        history the trend variance is 2 * S * lambda^2 * h^3 / 3. Both terms
+        are combined as a normal interval around yhat.
+        
+        Returns:
+            (lower, upper) arrays
+        """
+        model = self.model
+        sigma_obs = float(np.mean(model.params['sigma_obs']))
+        deltas = model.params['delta']
+        n_changepoints = deltas.shape[1] if deltas.ndim > 1 else 0
+        lambda_ = float(np.mean(np.abs(deltas))) + 1e-8
+        
+        t = ((forecast['ds'] - model.start) / model.t_scale).to_numpy(dtype=np.float64)
+        h = np.maximum(t - 1.0, 0.0)
+        trend_var = 2.0 * n_changepoints * lambda_ ** 2 * h ** 3 / 3.0
+        sigma = np.sqrt(sigma_obs ** 2 + trend_var) * model.y_scale
+        
+        z = NormalDist().inv_cdf(0.5 + model.interval_width / 2)
+        yhat = forecast['yhat'].to_numpy(dtype=np.float64)
+        return yhat - z * sigma, yhat + z * sigma
+    
     def forecast_with_capacity(self, days: int, capacity: int) -> Dict[str, any]:
         """
         Generate forecast and compare with capacity
@@ -229,18 +410,38 @@ class DemandForecaster:
         Returns:
             Dictionary with forecast and capacity analysis
         """
-        forecast_df = self.forecast(days)
+        return self.analyze_capacity(self.forecast(days), capacity)
+    
+    @staticmethod
+    def analyze_capacity(forecast_df: pd.DataFrame, capacity: int) -> Dict[str, any]:
+        """
+        Compare a forecast (as returned by ``forecast``) with capacity
+        
+        Shared by live forecasts and precomputed (materialized) ones, so both
+        produce the same analysis.
         
+        Args:
+            forecast_df: DataFrame with date and predicted_demand columns
+            capacity: School meal capacity
+            
+        Returns:
+            Dictionary with forecast and capacity analysis
+        """
         # Analyze capacity constraints
-        shortage_days = []
-        for idx, row in forecast_df.iterrows():
-            if row['predicted_demand'] > capacity:
-                shortage_days.append({
-                    'date': row['date'].strftime('%Y-%m-%d'),
-                    'predicted_demand': int(row['predicted_demand']),
-                    'capacity': capacity,
-                    'shortage': int(row['predicted_demand'] - capacity)
-                })
+        demand = forecast_df['predicted_demand'].to_numpy()
+        short = demand > capacity
+        shortage_days = [
+            {
+                'date': date,
+                'predicted_demand': predicted,
+                'capacity': capacity,
+                'shortage': predicted - capacity
+            }
+            for date, predicted in zip(
+                forecast_df['date'].dt.strftime('%Y-%m-%d').to_numpy()[short].tolist(),
+                demand[short].astype(int).tolist()
+            )
+        ]
         
         # Calculate risk metrics
         avg_demand = forecast_df['predicted_demand'].mean()
@@ -267,14 +468,13 @@ class DemandForecaster:
         if self.model is None:
             raise ValueError("Model not trained. Call train() first.")
         
-        # Generate forecast for analysis
-        future = self.model.make_future_dataframe(periods=30)
-        forecast = self.model.predict(future)
+        # Components of the next 30 days; intervals are not needed here
+        forecast = self._predict_horizon(30, 0)
         
         components = {
-            'trend': forecast[['ds', 'trend']].tail(30),
-            'weekly': forecast[['ds', 'weekly']].tail(30) if 'weekly' in forecast.columns else None,
-            'yearly': forecast[['ds', 'yearly']].tail(30) if 'yearly' in forecast.columns else None,
+            'trend': forecast[['ds', 'trend']],
+            'weekly': forecast[['ds', 'weekly']] if 'weekly' in forecast.columns else None,
+            'yearly': forecast[['ds', 'yearly']] if 'yearly' in forecast.columns else None,
         }
         
         return {k: v.to_dict('records') if v is not None else None for k, v in components.items()}
@@ -295,39 +495,75 @@ class DemandForecaster:
         
         # Create dataframe for prediction
         df = pd.DataFrame({'ds': dates})
+        start = time.perf_counter()
         forecast = self.model.predict(df)
+        observe_stage('prophet_predict', time.perf_counter() - start)
+        
+        anomalies = self.find_anomalies(
+            pd.to_datetime(df['ds']).to_numpy(),
+            np.asarray(actual_demand, dtype=np.float64),
+            forecast['yhat'].to_numpy(),
+            forecast['yhat_lower'].to_numpy(),
+            forecast['yhat_upper'].to_numpy()
+        )
+        return anomalies.to_dict('records')
+    
+    @staticmethod
+    def find_anomalies(dates: np.ndarray, actual: np.ndarray, predicted: np.ndarray,
+                       lower: np.ndarray, upper: np.ndarray) -> pd.DataFrame:
+        """
+        Rows whose actual demand falls outside the confidence interval
         
-        anomalies = []
-        for i, (actual, date) in enumerate(zip(actual_demand, dates)):
-            predicted = forecast.iloc[i]['yhat']
-            lower = forecast.iloc[i]['yhat_lower']
-            upper = forecast.iloc[i]['yhat_upper']
+        Args:
+            dates, actual, predicted, lower, upper: Aligned 1-D arrays
             
-            # Check if actual is outside confidence interval
-            if actual < lower or actual > upper:
-                deviation = abs(actual - predicted) / predicted * 100 if predicted > 0 else 0
-                anomalies.append({
-                    'date': date.strftime('%Y-%m-%d'),
-                    'actual_demand': actual,
-                    'predicted_demand': round(predicted, 2),
-                    'lower_bound': round(lower, 2),
-                    'upper_bound': round(upper, 2),
-                    'deviation_percent': round(deviation, 2),
-                    'type': 'spike' if actual > upper else 'drop'
-                })
-        
-        return anomalies
+        Returns:
+            DataFrame of the anomalous rows (date, actual_demand,
+            predicted_demand, lower_bound, upper_bound, deviation_percent,
+            type), indexed by their positions in the inputs
+        """
+        # Check if actual is outside confidence interval
+        outside = (actual < lower) | (actual > upper)
+        positions = np.flatnonzero(outside)
+        actual, predicted = actual[positions], predicted[positions]
+        lower, upper = lower[positions], upper[positions]
+        
+        positive = predicted > 0
+        deviation = np.where(positive, np.abs(actual - predicted) / np.where(positive, predicted, 1.0) * 100, 0.0)
+        
+        return pd.DataFrame({
+            'date': pd.to_datetime(dates[positions]).strftime('%Y-%m-%d'),
+            'actual_demand': actual,
+            'predicted_demand': np.round(predicted, 2),
+            'lower_bound': np.round(lower, 2),
+            'upper_bound': np.round(upper, 2),
+            'deviation_percent': np.round(deviation, 2),
+            'type': np.where(actual > upper, 'spike', 'drop')
+        }, index=positions)
     
     def save_model(self, path: str):
         """
         Save the trained model to disk
         
+        Uses the compact format of forecaster_pack: fitted parameters and
+        configuration only, without the training history or Stan state.
+        
         Args:
             path: File path to save the model
         """
         if self.model is None:
             raise ValueError("No model to save")
         
+        write_pack({self.school_id or '': self}, path)
+        logger.info(f"Model saved to {path}")
+    
+    def _save_joblib(self, path: str):
+        """
+        Pickle the whole model with joblib
+        """
+        if self.model is None:
+            raise ValueError("No model to save")
+        
         Path(path).parent.mkdir(parents=True, exist_ok=True)
         
         model_data = {
@@ -342,28 +578,111 @@ class DemandForecaster:
         """
         Load a trained model from disk
         
+        Reads both the compact format (whose Prophet object is only rebuilt
+        when first used) and joblib pickles.
+        
         Args:
             path: File path to load the model from
         """
-        model_data = joblib.load(path)
-        self.model = model_data['model']
-        self.school_id = model_data.get('school_id')
+        if is_pack_file(path):
+            pack = ForecasterPack(path)
+            school_id = pack.school_ids[0]
+            self.set_compact_model(pack.compact_model(school_id))
+            self.school_id = school_id or None
+        else:
+            model_data = joblib.load(path)
+            self.model = model_data['model']
+            self.school_id = model_data.get('school_id')
         logger.info(f"Model loaded from {path}")
     
-    def update_with_new_data(self, new_data: pd.DataFrame):
+    def update_with_new_data(self, new_data: pd.DataFrame,
+                             history: Optional[pd.DataFrame] = None) -> Dict[str, any]:
         """
         Update the model with new observations
         
+        Appends the observations to the school's history window (rows for a
+        date already in the window replace it), drops days older than
+        HISTORY_WINDOW_DAYS and refits a fresh Prophet on the window,
+        warm-starting the optimizer from the current parameters. Over a
+        day's new rows the optimum barely moves, so the fit converges in a
+        fraction of a cold fit's time.
+        
         Args:
             new_data: DataFrame with 'ds' and 'y' columns
+            history: History the current model was fitted on; required for
+                models loaded from disk, which do not keep their history
+            
+        Returns:
+            Dictionary with the window size and dates, the fit duration and
+            the last cold-fit duration measured for this forecaster
         """
         if self.model is None:
             raise ValueError("Model not trained. Call train() first.")
         
         logger.info("Updating model with new data...")
         
-        # Retrain with combined data
-        # In production, you'd fetch historical data and append new data
-        self.model.fit(new_data)
+        window = self._slide_window(self._previous_history(history), new_data)
+        init = self._warm_start_params(self.model)
+        
+        model = self._build_model()
+        start = time.perf_counter()
+        model.fit(window, init=init)
+        seconds = time.perf_counter() - start
+        observe_stage('prophet_fit', seconds)
+        
+        self.model = model
+        self.history = window
         
-        logger.info("Model updated successfully")
+        logger.info(f"Model updated successfully in {seconds:.3f}s")
+        return self._update_report(new_data, window, seconds, warm_start=True)
+    
+    def _previous_history(self, history: Optional[pd.DataFrame]) -> pd.DataFrame:
+        if history is None:
+            history = self.history
+        if history is None:
+            raise ValueError("No history for this model; pass the history it was fitted on")
+        return history
+    
+    def _slide_window(self, history: pd.DataFrame, new_data: Optional[pd.DataFrame] = None) -> pd.DataFrame:
+        """
+        Last HISTORY_WINDOW_DAYS days of ``history`` plus ``new_data``, by date
+        """
+        frames = [history[['ds', 'y']]]
+        if new_data is not None:
+            frames.append(new_data[['ds', 'y']])
+        window = pd.concat(frames, ignore_index=True)
+        window['ds'] = pd.to_datetime(window['ds'])
+        window = window.drop_duplicates('ds', keep='last').sort_values('ds', kind='stable')
+        
+        cutoff = window['ds'].iloc[-1] - pd.Timedelta(days=self.HISTORY_WINDOW_DAYS)
+        return window[window['ds'] > cutoff].reset_index(drop=True)
+    
+    @staticmethod
+    def _warm_start_params(model: Prophet) -> Dict[str, any]:
+        """
+        Fitted parameters in the form Prophet's ``fit(init=...)`` expects
+        
+        Parameters whose shape no longer matches the refit (e.g. a holiday
+        leaving the window) fall back to Prophet's default initialization.
+        """
+        params = {}
+        for name in ('k', 'm', 'sigma_obs'):
+            params[name] = float(np.mean(model.params[name]))
+        for name in ('delta', 'beta'):
+            params[name] = np.mean(model.params[name], axis=0)
+        return params
+    
+    def _update_report(self, new_data: pd.DataFrame, window: pd.DataFrame, seconds: float,
+                       warm_start: bool) -> Dict[str, any]:
+        cold_seconds = self.last_cold_fit_seconds
+        return {
+            'school_id': self.school_id,
+            'warm_start': warm_start,
+            'rows_added': len(new_data),
+            'history_rows': len(window),
+            'window_start': window['ds'].iloc[0].date().isoformat(),
+            'window_end': window['ds'].iloc[-1].date().isoformat(),
+            'seconds': round(seconds, 4),
+            'cold_fit_seconds': round(cold_seconds, 4) if cold_seconds else None,
+            'speedup_vs_cold': round(cold_seconds / seconds, 2) if warm_start and cold_seconds and seconds > 0 else None
+        }
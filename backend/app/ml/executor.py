@@ -0,0 +1,208 @@
+"""
+Inference executor
+Runs CPU-bound model calls off the event loop: a thread pool for LightGBM
+(which releases the GIL) and a process pool for Prophet fitting
+"""
+
+import asyncio
+import logging
+import multiprocessing
+import threading
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Callable, Dict, Optional
+
+from app.core.metrics import Histogram, capture_stages, record_stages
+
+logger = logging.getLogger(__name__)
+
+
+class ExecutorSaturatedError(RuntimeError):
+    """Raised when a pool's bounded queue is full"""
+
+    def __init__(self, pool: str, retry_after: int = 1):
+        super().__init__(f"Inference pool '{pool}' is saturated")
+        self.pool = pool
+        self.retry_after = retry_after
+
+
+def _timed_call(fn: Callable, args: tuple, kwargs: dict, capture: bool = False):
+    """
+    Run ``fn`` in the worker, returning wall-clock start/end around it
+
+    Module-level so it can be pickled into process pool workers; wall-clock
+    time is used because the submit timestamp comes from another process.
+    With ``capture``, ML stage timings recorded by ``fn`` are returned for
+    the parent process to record, since a worker process's metrics are
+    never scraped.
+    """
+    started = time.time()
+    if capture:
+        with capture_stages() as stages:
+            result = fn(*args, **kwargs)
+    else:
+        result, stages = fn(*args, **kwargs), None
+    return started, result, time.time(), stages
+
+
+class InferencePool:
+    """
+    Bounded worker pool that rejects work instead of queuing forever
+
+    At most ``max_workers`` calls run at once and at most ``max_queue`` more
+    wait for a worker; anything beyond that raises ExecutorSaturatedError.
+    """
+
+    def __init__(self, name: str, kind: str, max_workers: int, max_queue: int):
+        """
+        Args:
+            name: Pool name used in errors and stats
+            kind: 'thread' or 'process'
+            max_workers: Concurrent calls
+            max_queue: Calls allowed to wait for a free worker
+        """
+        if kind not in ('thread', 'process'):
+            raise ValueError(f"Unknown pool kind: {kind}")
+
+        self.name = name
+        self.kind = kind
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+
+        self._executor: Optional[Executor] = None
+        self._outstanding = 0
+        self._lock = threading.Lock()
+        self._started_at = time.monotonic()
+
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+        self._busy_seconds = 0.0
+        self.wait_time = Histogram()
+        self.run_time = Histogram()
+
+    def start(self):
+        if self._executor is not None:
+            return
+        if self.kind == 'thread':
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix=self.name)
+        else:
+            # Spawned workers do not inherit the parent's threads or OpenMP state
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context('spawn')
+            )
+        self._started_at = time.monotonic()
+
+    def shutdown(self, wait: bool = True):
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait, cancel_futures=True)
+            self._executor = None
+
+    async def run(self, fn: Callable, *args, **kwargs):
+        """
+        Run ``fn(*args, **kwargs)`` on the pool and await its result
+
+        Raises:
+            ExecutorSaturatedError: If all workers are busy and the queue is full
+        """
+        if self._executor is None:
+            self.start()
+
+        with self._lock:
+            if self._outstanding >= self.max_workers + self.max_queue:
+                self.rejected += 1
+                raise ExecutorSaturatedError(self.name)
+            self._outstanding += 1
+
+        submitted = time.time()
+        try:
+            future = self._executor.submit(_timed_call, fn, args, kwargs, self.kind == 'process')
+        except Exception:
+            self._release()
+            raise
+        # Released when the work finishes, even if the awaiting request is cancelled
+        future.add_done_callback(lambda _: self._release())
+
+        try:
+            started, result, finished, stages = await asyncio.wrap_future(future)
+        except Exception:
+            self.failed += 1
+            raise
+
+        self.completed += 1
+        self._busy_seconds += finished - started
+        self.wait_time.observe(max(started - submitted, 0.0))
+        self.run_time.observe(finished - started)
+        if stages:
+            record_stages(stages)
+        return result
+
+    def _release(self):
+        with self._lock:
+            self._outstanding -= 1
+
+    def stats(self) -> Dict[str, any]:
+        """
+        Pool utilization and wait/run time histograms
+        """
+        outstanding = self._outstanding
+        elapsed = max(time.monotonic() - self._started_at, 1e-9)
+        return {
+            'kind': self.kind,
+            'max_workers': self.max_workers,
+            'max_queue': self.max_queue,
+            'running': min(outstanding, self.max_workers),
+            'queued': max(outstanding - self.max_workers, 0),
+            'utilization': round(min(outstanding, self.max_workers) / self.max_workers, 4),
+            'busy_fraction': round(min(self._busy_seconds / (elapsed * self.max_workers), 1.0), 4),
+            'completed': self.completed,
+            'failed': self.failed,
+            'rejected': self.rejected,
+            'wait_time_seconds': self.wait_time.snapshot(),
+            'run_time_seconds': self.run_time.snapshot()
+        }
+
+
+class InferenceExecutor:
+    """
+    The process's inference pools
+
+    Attributes:
+        lightgbm: Thread pool for risk model calls
+        prophet: Process pool for demand forecaster fits
+    """
+
+    def __init__(self, lightgbm_workers: int = 4, lightgbm_queue: int = 256,
+                 prophet_workers: int = 2, prophet_queue: int = 16):
+        self.configure(lightgbm_workers, lightgbm_queue, prophet_workers, prophet_queue)
+
+    def configure(self, lightgbm_workers: int, lightgbm_queue: int,
+                  prophet_workers: int, prophet_queue: int):
+        """
+        Size the pools; only valid before ``start``
+        """
+        self.lightgbm = InferencePool('lightgbm', 'thread', lightgbm_workers, lightgbm_queue)
+        self.prophet = InferencePool('prophet', 'process', prophet_workers, prophet_queue)
+
+    def start(self):
+        self.lightgbm.start()
+        self.prophet.start()
+        logger.info(
+            f"Inference executor started ({self.lightgbm.max_workers} LightGBM threads, "
+            f"{self.prophet.max_workers} Prophet processes)"
+        )
+
+    def shutdown(self):
+        self.lightgbm.shutdown()
+        self.prophet.shutdown()
+
+    def stats(self) -> Dict[str, any]:
+        return {
+            'lightgbm': self.lightgbm.stats(),
+            'prophet': self.prophet.stats()
+        }
+
+
+# Process-wide executor, configured and started by the application lifespan
+inference_executor = InferenceExecutor()
@@ -0,0 +1,388 @@
+"""
+In-memory school feature store
+Keeps the current RiskPredictor feature vector of every school in a
+(schools x features) array, updated incrementally from attendance and meal
+events, so risk can be predicted from a school id alone. Rolling 7-day
+values live in per-school ring buffers, so an event costs O(1) whatever
+the history length. The store is snapshotted to disk for fast restarts.
+"""
+
+import asyncio
+import logging
+import os
+import threading
+import time
+from datetime import date
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .risk_predictor import FEATURE_NAMES
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_FEATURE_STORE_PATH = Path(__file__).resolve().parents[2] / 'models' / 'feature_store.npz'
+
+# Days covered by the rolling averages and trends
+WINDOW_DAYS = 7
+
+# Bumped when the snapshot layout changes; older snapshots are not loaded
+SNAPSHOT_VERSION = 1
+
+# Features set directly from a school's profile rather than derived from events
+PROFILE_FEATURES = (
+    'enrollment',
+    'capacity',
+    'previous_shortage_count',
+    'budget_utilization_rate',
+    'supply_chain_delay_days',
+    'weather_risk_score',
+    'seasonal_factor',
+    'hostel_attached'
+)
+
+_COLUMN = {name: i for i, name in enumerate(FEATURE_NAMES)}
+
+# Per-school arrays (besides the feature table) saved in snapshots
+_STATE_ARRAYS = (
+    'attendance_ring', 'enrollment_ring', 'attendance_pos', 'attendance_count', 'attendance_day',
+    'meal_ring', 'meal_sum', 'meal_pos', 'meal_count', 'meal_day', 'inspection_day'
+)
+
+
+class FeatureStore:
+    """
+    Array-backed table of school feature vectors
+
+    Features not known for a school are NaN, which LightGBM treats as
+    missing. Derived features:
+        current_attendance: latest attendance event
+        attendance_rate: current_attendance / enrollment
+        avg_meal_uptake: mean meals served over the last 7 reported days
+        capacity_utilization: avg_meal_uptake / capacity, capped at 1
+        enrollment_trend_7d, attendance_trend_7d: relative change between
+            the oldest and newest of the last 7 reported days
+        days_since_inspection: days from the last inspection to the
+            prediction date
+
+    Rolling windows cover the last 7 *reported* days (school days), not
+    calendar days. An event for the same day as the school's latest one
+    replaces it; an older event is ignored. All methods are thread-safe.
+    """
+
+    def __init__(self, capacity: int = 1024):
+        """
+        Args:
+            capacity: Initial number of school rows; grows as needed
+        """
+        self._lock = threading.Lock()
+        self._index: Dict[str, int] = {}
+        self._school_ids: List[str] = []
+        self._allocate(max(capacity, 1))
+        self.updated_at: Optional[float] = None
+        self._snapshot_task: Optional[asyncio.Task] = None
+
+    def _allocate(self, capacity: int):
+        self.features = np.full((capacity, len(FEATURE_NAMES)), np.nan)
+        self.attendance_ring = np.zeros((capacity, WINDOW_DAYS))
+        self.enrollment_ring = np.zeros((capacity, WINDOW_DAYS))
+        self.attendance_pos = np.zeros(capacity, dtype=np.int8)
+        self.attendance_count = np.zeros(capacity, dtype=np.int8)
+        self.attendance_day = np.full(capacity, -1, dtype=np.int64)
+        self.meal_ring = np.zeros((capacity, WINDOW_DAYS))
+        self.meal_sum = np.zeros(capacity)
+        self.meal_pos = np.zeros(capacity, dtype=np.int8)
+        self.meal_count = np.zeros(capacity, dtype=np.int8)
+        self.meal_day = np.full(capacity, -1, dtype=np.int64)
+        self.inspection_day = np.full(capacity, np.nan)
+
+    def _grow(self):
+        """
+        Double the row capacity, keeping the existing rows
+        """
+        old = {name: getattr(self, name) for name in ('features', *_STATE_ARRAYS)}
+        self._allocate(2 * len(self.features))
+        for name, array in old.items():
+            getattr(self, name)[:len(array)] = array
+
+    def __len__(self) -> int:
+        return len(self._school_ids)
+
+    def __contains__(self, school_id: str) -> bool:
+        return school_id in self._index
+
+    def _row(self, school_id: str) -> int:
+        """
+        Row of a school, adding it if new; call with the lock held
+        """
+        row = self._index.get(school_id)
+        if row is None:
+            row = len(self._school_ids)
+            if row == len(self.features):
+                self._grow()
+            self._index[school_id] = row
+            self._school_ids.append(school_id)
+        return row
+
+    def set_profile(self, school_id: str, last_inspection: Optional[date] = None, **fields: float):
+        """
+        Set a school's slow-changing features
+
+        Args:
+            school_id: School identifier
+            last_inspection: Date of the last inspection
+            **fields: Any of PROFILE_FEATURES; None values are left unchanged
+
+        Raises:
+            ValueError: For a field that is not a profile feature
+        """
+        unknown = set(fields) - set(PROFILE_FEATURES)
+        if unknown:
+            raise ValueError(f"Not profile features: {sorted(unknown)}")
+
+        with self._lock:
+            row = self._row(school_id)
+            values = self.features[row]
+            for name, value in fields.items():
+                if value is not None:
+                    values[_COLUMN[name]] = value
+            if last_inspection is not None:
+                self.inspection_day[row] = last_inspection.toordinal()
+            self._derive_rates(row)
+            self.updated_at = time.time()
+
+    def record_attendance(self, school_id: str, day: date, present: int, enrolled: Optional[int] = None) -> bool:
+        """
+        Apply one day's attendance count
+
+        Args:
+            school_id: School identifier
+            day: Attendance date
+            present: Children present
+            enrolled: Enrollment on that day (default: the stored enrollment)
+
+        Returns:
+            False if the event is older than the school's latest attendance
+        """
+        ordinal = day.toordinal()
+        with self._lock:
+            row = self._row(school_id)
+            last = self.attendance_day[row]
+            if ordinal < last:
+                return False
+
+            values = self.features[row]
+            if enrolled is not None:
+                values[_COLUMN['enrollment']] = enrolled
+            enrollment = values[_COLUMN['enrollment']]
+            if ordinal > last:
+                self.attendance_day[row] = ordinal
+                self.attendance_pos[row] = (self.attendance_pos[row] + 1) % WINDOW_DAYS
+                self.attendance_count[row] = min(self.attendance_count[row] + 1, WINDOW_DAYS)
+            pos = self.attendance_pos[row]
+            self.attendance_ring[row, pos] = present
+            self.enrollment_ring[row, pos] = enrollment
+
+            values[_COLUMN['current_attendance']] = present
+            oldest = self._oldest(pos, self.attendance_count[row])
+            values[_COLUMN['attendance_trend_7d']] = self._trend(self.attendance_ring[row], oldest, pos)
+            values[_COLUMN['enrollment_trend_7d']] = self._trend(self.enrollment_ring[row], oldest, pos)
+            self._derive_rates(row)
+            self.updated_at = time.time()
+        return True
+
+    def record_meals(self, school_id: str, day: date, meals_served: float) -> bool:
+        """
+        Apply one day's count of meals served
+
+        Returns:
+            False if the event is older than the school's latest meal count
+        """
+        ordinal = day.toordinal()
+        with self._lock:
+            row = self._row(school_id)
+            last = self.meal_day[row]
+            if ordinal < last:
+                return False
+            if ordinal > last:
+                self.meal_day[row] = ordinal
+                self.meal_pos[row] = (self.meal_pos[row] + 1) % WINDOW_DAYS
+                self.meal_count[row] = min(self.meal_count[row] + 1, WINDOW_DAYS)
+            pos = self.meal_pos[row]
+            # The slot holds either the evicted day or the replaced same-day count
+            self.meal_sum[row] += meals_served - self.meal_ring[row, pos]
+            self.meal_ring[row, pos] = meals_served
+
+            self.features[row, _COLUMN['avg_meal_uptake']] = self.meal_sum[row] / self.meal_count[row]
+            self._derive_rates(row)
+            self.updated_at = time.time()
+        return True
+
+    @staticmethod
+    def _oldest(pos: int, count: int) -> int:
+        """
+        Ring slot of the oldest of ``count`` values ending at ``pos``
+        """
+        return (pos - count + 1) % WINDOW_DAYS
+
+    @staticmethod
+    def _trend(ring: np.ndarray, oldest: int, newest: int) -> float:
+        """
+        Relative change from the oldest to the newest ring value
+        """
+        base = ring[oldest]
+        return float((ring[newest] - base) / base) if base > 0 else 0.0
+
+    def _derive_rates(self, row: int):
+        """
+        Recompute the ratio features of a row; call with the lock held
+        """
+        values = self.features[row]
+        enrollment = values[_COLUMN['enrollment']]
+        capacity = values[_COLUMN['capacity']]
+        if enrollment > 0:
+            values[_COLUMN['attendance_rate']] = values[_COLUMN['current_attendance']] / enrollment
+        if capacity > 0:
+            values[_COLUMN['capacity_utilization']] = min(values[_COLUMN['avg_meal_uptake']] / capacity, 1.0)
+
+    def feature_matrix(self, school_ids: Sequence[str], feature_names: Sequence[str] = FEATURE_NAMES,
+                       as_of: Optional[date] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Feature rows of the given schools, ready for ``predict_batch_columnar``
+
+        Args:
+            school_ids: Schools to read
+            feature_names: Column order of the returned matrix
+            as_of: Prediction date for days_since_inspection (default: today)
+
+        Returns:
+            (matrix, found): (n_found, n_features) float64 copy of the rows
+            of the known schools, in request order, and a boolean mask over
+            ``school_ids`` marking which were known
+        """
+        with self._lock:
+            rows = np.fromiter((self._index.get(school_id, -1) for school_id in school_ids),
+                               dtype=np.int64, count=len(school_ids))
+            found = rows >= 0
+            rows = rows[found]
+            matrix = self.features[rows]
+            inspection = self.inspection_day[rows]
+
+        today = (as_of or date.today()).toordinal()
+        matrix[:, _COLUMN['days_since_inspection']] = today - inspection
+        if tuple(feature_names) != FEATURE_NAMES:
+            matrix = matrix[:, [_COLUMN[name] for name in feature_names]]
+        return matrix, found
+
+    def get(self, school_id: str, as_of: Optional[date] = None) -> Optional[Dict[str, Optional[float]]]:
+        """
+        A school's features by name (None where unknown), or None if not stored
+        """
+        matrix, found = self.feature_matrix([school_id], as_of=as_of)
+        if not found[0]:
+            return None
+        return {name: (None if np.isnan(value) else float(value))
+                for name, value in zip(FEATURE_NAMES, matrix[0].tolist())}
+
+    def save(self, path: str) -> Dict[str, any]:
+        """
+        Write a snapshot of the store
+
+        The arrays are copied under the lock and written outside it, to a
+        temporary file that atomically replaces ``path``.
+
+        Returns:
+            Dictionary with the path, school count and wall time
+        """
+        start = time.perf_counter()
+        with self._lock:
+            n = len(self._school_ids)
+            arrays = {name: getattr(self, name)[:n].copy() for name in ('features', *_STATE_ARRAYS)}
+            arrays['school_ids'] = np.array(self._school_ids, dtype=str)
+        arrays['feature_names'] = np.array(FEATURE_NAMES)
+        arrays['version'] = np.array(SNAPSHOT_VERSION)
+
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        with open(tmp_path, 'wb') as f:
+            np.savez(f, **arrays)
+        os.replace(tmp_path, path)
+        return {'path': str(path), 'schools': n, 'seconds': round(time.perf_counter() - start, 4)}
+
+    @classmethod
+    def load(cls, path: str) -> 'FeatureStore':
+        """
+        Rebuild a store from a snapshot written by ``save``
+
+        Raises:
+            ValueError: If the snapshot has another version or feature set
+        """
+        with np.load(path) as data:
+            if int(data['version']) != SNAPSHOT_VERSION or tuple(data['feature_names'].tolist()) != FEATURE_NAMES:
+                raise ValueError(f"Incompatible feature store snapshot: {path}")
+            school_ids = data['school_ids'].tolist()
+            store = cls(capacity=max(len(school_ids), 1024))
+            for name in ('features', *_STATE_ARRAYS):
+                getattr(store, name)[:len(school_ids)] = data[name]
+        store._school_ids = school_ids
+        store._index = {school_id: row for row, school_id in enumerate(school_ids)}
+        return store
+
+    def restore(self, path: str) -> bool:
+        """
+        Replace this store's contents with a snapshot, if one exists
+
+        Returns:
+            True if a snapshot was loaded
+        """
+        if not os.path.exists(path):
+            return False
+        loaded = self.load(path)
+        with self._lock:
+            for name in ('features', *_STATE_ARRAYS):
+                setattr(self, name, getattr(loaded, name))
+            self._school_ids = loaded._school_ids
+            self._index = loaded._index
+        logger.info(f"Restored {len(self)} schools from feature store snapshot {path}")
+        return True
+
+    async def _snapshot_loop(self, path: str, interval: float):
+        saved_at = self.updated_at
+        while True:
+            await asyncio.sleep(interval)
+            if self.updated_at == saved_at:
+                continue
+            saved_at = self.updated_at
+            try:
+                await asyncio.to_thread(self.save, path)
+            except Exception:
+                logger.exception("Feature store snapshot failed")
+
+    def start_snapshots(self, path: str, interval: float):
+        """
+        Snapshot to ``path`` every ``interval`` seconds while there are changes
+        """
+        if self._snapshot_task is None and interval > 0:
+            self._snapshot_task = asyncio.create_task(self._snapshot_loop(path, interval))
+
+    async def stop_snapshots(self):
+        if self._snapshot_task is not None:
+            self._snapshot_task.cancel()
+            try:
+                await self._snapshot_task
+            except asyncio.CancelledError:
+                pass
+            self._snapshot_task = None
+
+    def stats(self) -> Dict[str, any]:
+        return {
+            'schools': len(self),
+            'capacity': len(self.features),
+            'updated_at': self.updated_at
+        }
+
+
+# Process-wide feature store, restored from its snapshot by the application lifespan
+feature_store = FeatureStore()
@@ -0,0 +1,322 @@
+"""
+Materialized demand forecasts
+Batch stage that precomputes every school's forecast for the next
+FORECAST_HORIZON days into one columnar file, and an in-memory table that
+serves slices of it with O(1) lookups
+
+Run nightly (after history updates) with:
+    python -m app.ml.forecast_store --schools-file schools.txt
+"""
+
+import argparse
+import logging
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# Default location of the materialized forecast table
+DEFAULT_FORECAST_TABLE_PATH = Path(__file__).resolve().parents[2] / 'models' / 'forecast_table.npz'
+
+# Days precomputed per school; longer requests fall back to a live forecast
+FORECAST_HORIZON = 30
+
+# Final history days stored before the horizon, so recent actuals can be
+# checked against the table (see anomaly_scan)
+LOOKBACK_DAYS = 7
+
+# Forecast columns stored as (n_schools, lookback + horizon) int32 matrices
+FORECAST_COLUMNS = ('predicted_demand', 'lower_bound', 'upper_bound')
+
+
+def _forecast_arrays(forecaster, horizon: int, lookback: int) -> Tuple[np.datetime64, np.ndarray]:
+    """
+    Forecast as (first date, (3, lookback + horizon) int32 array)
+    """
+    from .forecasting import forecast_frame
+
+    forecast_df = forecast_frame(forecaster, horizon, lookback=lookback)
+    start = np.datetime64(forecast_df['date'].iloc[0].date(), 'D')
+    values = np.stack([forecast_df[column].to_numpy(dtype=np.int32) for column in FORECAST_COLUMNS])
+    return start, values
+
+
+def _forecast_school_arrays(school_id: str, horizon: int, lookback: int) -> Tuple[np.datetime64, np.ndarray]:
+    """
+    Forecast one school with ``_forecast_arrays``
+
+    Module-level so it can run in process pool workers; goes through the
+    shared forecaster cache, so unchanged histories are not refitted.
+    """
+    from .forecasting import get_forecaster_cache
+
+    return _forecast_arrays(get_forecaster_cache().get_or_train(school_id), horizon, lookback)
+
+
+def materialize_forecasts(school_ids: Sequence[str], output_path: str,
+                          horizon: int = FORECAST_HORIZON, lookback: int = LOOKBACK_DAYS,
+                          max_workers: Optional[int] = None) -> Dict[str, any]:
+    """
+    Precompute forecasts for all schools and write them to ``output_path``
+
+    The file is an uncompressed .npz with one row per school, so it loads
+    as a handful of contiguous arrays. It is written to a temporary file
+    and renamed, so a serving process never sees a partial table.
+
+    Args:
+        school_ids: Schools to forecast
+        output_path: Destination .npz file
+        horizon: Days forecast per school
+        lookback: Final history days predicted before the horizon
+        max_workers: Forecasting processes (default: CPU count); 1 runs inline.
+            Engines that fit in batch (BATCH_FIT) always run inline
+
+    Returns:
+        Summary with counts, failures and wall time
+    """
+    school_ids = list(dict.fromkeys(school_ids))
+    workers = max(1, min(max_workers or os.cpu_count() or 1, len(school_ids) or 1))
+    started = time.perf_counter()
+
+    results: Dict[str, Tuple[np.datetime64, np.ndarray]] = {}
+    failures: Dict[str, str] = {}
+
+    from .forecasting import get_forecaster_cache, get_forecaster_class
+
+    forecaster_cls = get_forecaster_class()
+    if forecaster_cls.BATCH_FIT:
+        # One vectorized fit for every school; no process pool needed
+        workers = 1
+        trained = forecaster_cls.train_many(school_ids, store=get_forecaster_cache())
+        failures.update(trained.failures)
+        for school_id, forecaster in trained.forecasters.items():
+            try:
+                results[school_id] = _forecast_arrays(forecaster, horizon, lookback)
+            except Exception as e:
+                failures[school_id] = str(e)
+    elif workers == 1:
+        for school_id in school_ids:
+            try:
+                results[school_id] = _forecast_school_arrays(school_id, horizon, lookback)
+            except Exception as e:
+                failures[school_id] = str(e)
+    else:
+        with ProcessPoolExecutor(max_workers=workers,
+                                 mp_context=multiprocessing.get_context('spawn')) as pool:
+            futures = {
+                school_id: pool.submit(_forecast_school_arrays, school_id, horizon, lookback)
+                for school_id in school_ids
+            }
+            for school_id, future in futures.items():
+                try:
+                    results[school_id] = future.result()
+                except Exception as e:
+                    failures[school_id] = str(e)
+
+    for school_id, error in failures.items():
+        logger.warning(f"Forecast for school {school_id} failed: {error}")
+
+    ids = [school_id for school_id in school_ids if school_id in results]
+    values = (np.stack([results[school_id][1] for school_id in ids])
+              if ids else np.zeros((0, len(FORECAST_COLUMNS), lookback + horizon), dtype=np.int32))
+
+    arrays = {
+        'school_ids': np.array(ids, dtype=str),
+        'start_dates': np.array([results[school_id][0] for school_id in ids], dtype='datetime64[D]'),
+        'generated_at': np.array(datetime.now().isoformat()),
+        'horizon': np.array(horizon, dtype=np.int32),
+        'lookback': np.array(lookback, dtype=np.int32)
+    }
+    for index, column in enumerate(FORECAST_COLUMNS):
+        arrays[column] = np.ascontiguousarray(values[:, index, :])
+
+    path = Path(output_path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    with open(tmp_path, 'wb') as f:
+        np.savez(f, **arrays)
+    os.replace(tmp_path, path)
+
+    summary = {
+        'schools': len(ids),
+        'failed': len(failures),
+        'failures': failures,
+        'horizon': horizon,
+        'lookback': lookback,
+        'workers': workers,
+        'wall_seconds': round(time.perf_counter() - started, 3),
+        'path': str(path)
+    }
+    logger.info(
+        f"Materialized {summary['schools']} forecasts ({summary['failed']} failed) "
+        f"in {summary['wall_seconds']}s to {path}"
+    )
+    return summary
+
+
+class MaterializedForecasts:
+    """
+    Read-only table of precomputed forecasts
+
+    Rows are found through a dict index, and a request is answered by
+    slicing its row from the offset of the requested start date, so a
+    lookup costs the same regardless of how many schools are stored. Each
+    row covers ``lookback + horizon`` days from its start date.
+
+    ``discard`` never mutates the index readers hold: it builds a new one
+    and swaps it in, so lookups running on other threads see either the
+    old index or the new one.
+    """
+
+    def __init__(self, school_ids: np.ndarray, start_dates: np.ndarray,
+                 values: Dict[str, np.ndarray], generated_at: str, horizon: int, lookback: int = 0):
+        self.school_ids = school_ids
+        self.start_dates = start_dates
+        self.values = values
+        self.generated_at = generated_at
+        self.horizon = horizon
+        self.lookback = lookback
+        self.width = lookback + horizon
+        self._index = {school_id: row for row, school_id in enumerate(school_ids.tolist())}
+        self._discard_lock = threading.Lock()
+
+    @classmethod
+    def load(cls, path: str) -> 'MaterializedForecasts':
+        """
+        Load a table written by ``materialize_forecasts``
+        """
+        with np.load(path) as data:
+            return cls(
+                school_ids=data['school_ids'],
+                start_dates=data['start_dates'],
+                values={column: data[column] for column in FORECAST_COLUMNS},
+                generated_at=str(data['generated_at']),
+                horizon=int(data['horizon']),
+                lookback=int(data['lookback']) if 'lookback' in data.files else 0
+            )
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def __contains__(self, school_id: str) -> bool:
+        return school_id in self._index
+
+    def lookup(self, school_id: str, days: int, today: Optional[date] = None) -> Optional[pd.DataFrame]:
+        """
+        Precomputed forecast for ``days`` days starting today
+
+        Args:
+            school_id: School identifier
+            days: Number of days requested
+            today: First requested date (default: current date)
+
+        Returns:
+            DataFrame in the ``DemandForecaster.forecast`` format, or None if
+            the school is not in the table or the table does not cover the
+            requested window (e.g. it is older than the request allows)
+        """
+        row = self._index.get(school_id)
+        if row is None:
+            return None
+
+        today = np.datetime64(today or date.today(), 'D')
+        offset = int((today - self.start_dates[row]).astype(int))
+        if offset < 0 or offset + days > self.width:
+            return None
+
+        window = slice(offset, offset + days)
+        return pd.DataFrame({
+            'date': pd.to_datetime(np.arange(today, today + days)),
+            **{column: self.values[column][row, window] for column in FORECAST_COLUMNS}
+        })
+
+    def gather(self, school_ids: np.ndarray, dates: np.ndarray):
+        """
+        Stored values for many (school, date) pairs at once
+
+        Args:
+            school_ids: School id per pair
+            dates: datetime64[D] date per pair
+
+        Returns:
+            (covered mask, {column: values}); values of uncovered pairs are
+            meaningless and must be masked out
+        """
+        index = self._index
+        rows = pd.Series(school_ids, dtype=object).map(index)
+        known = rows.notna().to_numpy()
+        rows = rows.fillna(0).to_numpy(dtype=np.int64)
+
+        if len(self.start_dates):
+            offsets = (dates - self.start_dates[rows]).astype(np.int64)
+        else:
+            offsets = np.zeros(len(rows), dtype=np.int64)
+        covered = known & (offsets >= 0) & (offsets < self.width)
+        offsets = np.where(covered, offsets, 0)
+        return covered, {column: self.values[column][rows, offsets] for column in FORECAST_COLUMNS}
+
+    def discard(self, school_id: str) -> bool:
+        """
+        Stop serving a school's precomputed rows (e.g. after new history)
+        """
+        with self._discard_lock:
+            if school_id not in self._index:
+                return False
+            index = dict(self._index)
+            del index[school_id]
+            self._index = index
+            return True
+
+    def stats(self) -> Dict[str, any]:
+        return {
+            'schools': len(self),
+            'horizon': self.horizon,
+            'lookback': self.lookback,
+            'generated_at': self.generated_at,
+            'oldest_start': str(self.start_dates.min()) if len(self) else None
+        }
+
+
+def _read_school_ids(args) -> List[str]:
+    school_ids = list(args.schools or [])
+    if args.schools_file:
+        with open(args.schools_file) as f:
+            school_ids.extend(line.strip() for line in f if line.strip())
+    return school_ids
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Precompute demand forecasts for all schools")
+    parser.add_argument('--schools', nargs='*', help="School ids to forecast")
+    parser.add_argument('--schools-file', help="File with one school id per line")
+    parser.add_argument('--output', help="Output .npz path (default: FORECAST_TABLE_PATH)")
+    parser.add_argument('--horizon', type=int, default=FORECAST_HORIZON)
+    parser.add_argument('--lookback', type=int, default=LOOKBACK_DAYS)
+    parser.add_argument('--workers', type=int, default=None)
+    args = parser.parse_args()
+
+    school_ids = _read_school_ids(args)
+    if not school_ids:
+        parser.error("no schools given (use --schools or --schools-file)")
+
+    from app.core.config import settings
+
+    logging.basicConfig(level=logging.INFO)
+    summary = materialize_forecasts(
+        school_ids, args.output or settings.FORECAST_TABLE_PATH or str(DEFAULT_FORECAST_TABLE_PATH),
+        horizon=args.horizon, lookback=args.lookback, max_workers=args.workers
+    )
+    print(f"{summary['schools']} schools, {summary['failed']} failed, {summary['wall_seconds']}s -> {summary['path']}")
+
+
+if __name__ == '__main__':
+    main()
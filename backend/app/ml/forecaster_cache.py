@@ -0,0 +1,322 @@
+"""
+Per-school fitted forecaster cache
+Two-level cache of trained DemandForecaster instances: an in-memory LRU of
+hot schools backed by an on-disk store, keyed by school and training data
+
+Pack the on-disk store into one file (e.g. nightly, after materializing
+forecasts) and point FORECASTER_PACK_PATH at it:
+    python -m app.ml.forecaster_cache --cache-dir models/forecasters --output models/forecasters.pack
+"""
+
+import argparse
+import copy
+import hashlib
+import logging
+import os
+import re
+import shutil
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Optional, Tuple, Type
+
+import numpy as np
+import pandas as pd
+
+from .demand_forecaster import DemandForecaster
+from .forecaster_pack import ForecasterPack, write_pack
+
+logger = logging.getLogger(__name__)
+
+# Default location of cached per-school forecasters
+DEFAULT_FORECASTER_CACHE_DIR = Path(__file__).resolve().parents[2] / 'models' / 'forecasters'
+
+
+def history_hash(history: pd.DataFrame) -> str:
+    """
+    Content hash of a training history (its 'ds' and 'y' columns)
+    """
+    digest = hashlib.sha256()
+    digest.update(pd.to_datetime(history['ds']).to_numpy(dtype='datetime64[ns]').tobytes())
+    digest.update(np.ascontiguousarray(history['y'].to_numpy(dtype=np.float64)).tobytes())
+    return digest.hexdigest()[:16]
+
+
+class ForecasterCache:
+    """
+    Cache of fitted forecasters keyed by (school_id, training data hash)
+
+    A forecaster is only reused for exactly the history it was fitted on, so
+    new history for a school never serves a stale model. The disk level is
+    shared by every process using the same directory; ``invalidate``
+    removes a school's entries there, and in-memory hits are re-checked
+    against disk so an invalidation from another process takes effect.
+
+    An optional read-only pack file (see forecaster_pack) sits between
+    memory and the per-school files: many Prophet models in one mapped
+    file, each used only if it was fitted on the same history.
+    """
+
+    def __init__(self, cache_dir: Optional[str] = None, max_in_memory: int = 128,
+                 forecaster_cls: Type[DemandForecaster] = DemandForecaster,
+                 pack_path: Optional[str] = None):
+        """
+        Args:
+            cache_dir: Directory of the on-disk store (None keeps memory only)
+            max_in_memory: Hot schools kept in the in-memory LRU
+            forecaster_cls: Forecaster engine class to train and load
+            pack_path: Optional pack of Prophet forecasters to read from;
+                reopened when the file is replaced
+        """
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        self.max_in_memory = max_in_memory
+        self.forecaster_cls = forecaster_cls
+        self.pack_path = pack_path if forecaster_cls.ENGINE == DemandForecaster.ENGINE else None
+        self._pack: Optional[ForecasterPack] = None
+        self._pack_stamp = None
+
+        self._memory: OrderedDict = OrderedDict()
+        # In-memory entries whose disk write failed; not checked against disk
+        self._memory_only = set()
+        self._lock = threading.Lock()
+
+        self.memory_hits = 0
+        self.pack_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    def _school_dir(self, school_id: str) -> Path:
+        safe_id = re.sub(r'[^A-Za-z0-9_.-]', '_', school_id)
+        return self.cache_dir / safe_id
+
+    def _disk_path(self, school_id: str, data_hash: str) -> Path:
+        # Engine in the name, so engines sharing a directory never load each other's models
+        return self._school_dir(school_id) / f"{data_hash}.{self.forecaster_cls.ENGINE}.model"
+
+    def _current_pack(self) -> Optional[ForecasterPack]:
+        if self.pack_path is None:
+            return None
+        try:
+            stat = os.stat(self.pack_path)
+        except FileNotFoundError:
+            return None
+        stamp = (stat.st_mtime_ns, stat.st_size)
+        if stamp != self._pack_stamp:
+            with self._lock:
+                if stamp != self._pack_stamp:
+                    self._pack = ForecasterPack(self.pack_path)
+                    self._pack_stamp = stamp
+        return self._pack
+
+    def _in_pack(self, pack: Optional[ForecasterPack], school_id: str, data_hash: str) -> bool:
+        return pack is not None and school_id in pack and pack.history_hash(school_id) == data_hash
+
+    def get(self, school_id: str, history: pd.DataFrame) -> Optional[DemandForecaster]:
+        """
+        Cached forecaster fitted on exactly ``history``, if any
+        """
+        data_hash = history_hash(history)
+        key = (school_id, data_hash)
+        pack = self._current_pack()
+
+        with self._lock:
+            forecaster = self._memory.get(key)
+            if forecaster is not None:
+                if (self.cache_dir is None or key in self._memory_only
+                        or self._in_pack(pack, school_id, data_hash)
+                        or self._disk_path(school_id, data_hash).exists()):
+                    self._memory.move_to_end(key)
+                    self.memory_hits += 1
+                    return forecaster
+                # Invalidated on disk, possibly by another process
+                del self._memory[key]
+
+        if self._in_pack(pack, school_id, data_hash):
+            forecaster = pack.get(school_id)
+            self._remember(key, forecaster)
+            self.pack_hits += 1
+            return forecaster
+
+        if self.cache_dir is not None:
+            path = self._disk_path(school_id, data_hash)
+            if path.exists():
+                try:
+                    forecaster = self.forecaster_cls(str(path))
+                except Exception:
+                    logger.warning(f"Ignoring unreadable cached forecaster {path}", exc_info=True)
+                else:
+                    self._remember(key, forecaster)
+                    self.disk_hits += 1
+                    return forecaster
+
+        self.misses += 1
+        return None
+
+    def put(self, school_id: str, history: pd.DataFrame, forecaster: DemandForecaster):
+        """
+        Store a forecaster fitted on ``history``, replacing older entries
+        for the school
+
+        The disk write is best-effort: on an OSError (disk full, read-only
+        volume, a concurrent invalidation) the forecaster stays cached in
+        memory only and a warning is logged.
+        """
+        data_hash = history_hash(history)
+        key = (school_id, data_hash)
+        self._remember(key, forecaster)
+
+        if self.cache_dir is not None:
+            path = self._disk_path(school_id, data_hash)
+            tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+            try:
+                forecaster.save_model(str(tmp_path))
+                tmp_path.replace(path)
+                # Only this engine's older fits; another engine's model for the school stays
+                for stale in path.parent.glob(f'*.{self.forecaster_cls.ENGINE}.model'):
+                    if stale != path:
+                        stale.unlink(missing_ok=True)
+            except OSError as e:
+                logger.warning(f"Could not cache forecaster for school {school_id} on disk: {e}")
+                with self._lock:
+                    if key in self._memory:
+                        self._memory_only.add(key)
+                try:
+                    tmp_path.unlink(missing_ok=True)
+                except OSError:
+                    pass
+
+    def get_or_train(self, school_id: str, history: Optional[pd.DataFrame] = None) -> DemandForecaster:
+        """
+        Cached forecaster for the school's history, fitting one on a miss
+
+        Args:
+            school_id: School identifier
+            history: DataFrame with 'ds' and 'y' columns; synthetic history
+                is generated when omitted
+
+        Returns:
+            A trained DemandForecaster
+        """
+        forecaster = self.forecaster_cls()
+        if history is None:
+            history = forecaster._generate_historical_data(school_id)
+
+        cached = self.get(school_id, history)
+        if cached is not None:
+            return cached
+
+        forecaster.train(school_id, history)
+        self.put(school_id, history, forecaster)
+        return forecaster
+
+    def update(self, school_id: str, history: pd.DataFrame,
+               new_data: pd.DataFrame) -> Tuple[DemandForecaster, Dict[str, any]]:
+        """
+        Fold new observations (e.g. a day's attendance) into a school's model
+
+        The forecaster cached for ``history`` is updated incrementally
+        (``update_with_new_data``) on a copy, so readers holding the old
+        entry are unaffected; on a miss the school is fitted from scratch
+        on the same window. The result replaces the school's entry.
+
+        Args:
+            school_id: School identifier
+            history: History the cached forecaster was fitted on
+            new_data: New 'ds'/'y' rows
+
+        Returns:
+            (forecaster, report): the updated forecaster, whose ``history``
+            is the new window to look the school up with, and the update
+            report
+        """
+        cached = self.get(school_id, history)
+        if cached is not None:
+            forecaster = copy.copy(cached)
+            report = forecaster.update_with_new_data(new_data, history=history)
+        else:
+            forecaster = self.forecaster_cls()
+            window = forecaster._slide_window(history, new_data)
+            forecaster.train(school_id, window)
+            report = forecaster._update_report(new_data, window, forecaster.last_cold_fit_seconds, warm_start=False)
+
+        self.put(school_id, forecaster.history, forecaster)
+        return forecaster, report
+
+    def invalidate(self, school_id: str) -> int:
+        """
+        Drop every cached forecaster of a school, e.g. when new history arrives
+
+        Returns:
+            Number of entries removed (memory and disk)
+        """
+        removed = 0
+        with self._lock:
+            for key in [key for key in self._memory if key[0] == school_id]:
+                del self._memory[key]
+                self._memory_only.discard(key)
+                removed += 1
+
+        if self.cache_dir is not None:
+            school_dir = self._school_dir(school_id)
+            if school_dir.exists():
+                removed += len(list(school_dir.glob('*.model')))
+                shutil.rmtree(school_dir, ignore_errors=True)
+
+        logger.info(f"Invalidated {removed} cached forecaster(s) for school {school_id}")
+        return removed
+
+    def export_pack(self, path: str) -> int:
+        """
+        Write every Prophet forecaster in the on-disk store to one pack file
+
+        Returns:
+            Number of schools packed
+        """
+        forecasters, hashes = {}, {}
+        for model_path in sorted(self.cache_dir.glob(f'*/*.{DemandForecaster.ENGINE}.model')):
+            forecaster = DemandForecaster(str(model_path))
+            forecasters[forecaster.school_id] = forecaster
+            hashes[forecaster.school_id] = model_path.name.split('.')[0]
+        write_pack(forecasters, path, history_hashes=hashes)
+        return len(forecasters)
+
+    def _remember(self, key, forecaster: DemandForecaster):
+        with self._lock:
+            # One entry per school: a newer history supersedes the old fit
+            for stale in [k for k in self._memory if k[0] == key[0] and k != key]:
+                del self._memory[stale]
+                self._memory_only.discard(stale)
+            self._memory[key] = forecaster
+            self._memory.move_to_end(key)
+            self._memory_only.discard(key)
+            while len(self._memory) > self.max_in_memory:
+                self._memory_only.discard(self._memory.popitem(last=False)[0])
+
+    def stats(self) -> Dict[str, any]:
+        hits = self.memory_hits + self.pack_hits + self.disk_hits
+        lookups = hits + self.misses
+        return {
+            'in_memory': len(self._memory),
+            'max_in_memory': self.max_in_memory,
+            'packed': len(self._pack) if self._pack is not None else 0,
+            'memory_hits': self.memory_hits,
+            'pack_hits': self.pack_hits,
+            'disk_hits': self.disk_hits,
+            'misses': self.misses,
+            'hit_rate': round(hits / lookups, 4) if lookups else 0.0
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pack cached Prophet forecasters into one file")
+    parser.add_argument('--cache-dir', required=True, help="Forecaster cache directory")
+    parser.add_argument('--output', required=True, help="Pack file to write")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    count = ForecasterCache(args.cache_dir).export_pack(args.output)
+    print(f"Packed {count} forecasters into {args.output} ({os.path.getsize(args.output)} bytes)")
+
+
+if __name__ == '__main__':
+    main()
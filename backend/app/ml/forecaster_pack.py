@@ -0,0 +1,294 @@
+"""
+Compact forecaster serialization
+Stores only what a fitted Prophet model needs to predict (parameters,
+changepoints, scaling constants, seasonality and holiday configuration),
+for any number of schools in one memory-mappable file, and rebuilds each
+Prophet object lazily on first use
+
+File layout:
+    MAGIC | header length (uint64 LE) | header JSON | padding | float64 data
+
+The header holds per-school scalars and offsets into the data block plus
+configurations and holiday tables shared by the schools; the data block
+holds each school's k, m, sigma_obs, delta, beta and changepoints_t.
+
+Forecaster cache directories are packed with ``python -m app.ml.forecaster_cache``.
+"""
+
+import json
+import logging
+import os
+import struct
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b'DFPACK01'
+_ALIGN = 64
+
+# Prophet attributes that are plain JSON values, identical for schools fitted
+# with the same configuration (per-school scales are stored separately)
+_CONFIG_ATTRIBUTES = (
+    'growth', 'n_changepoints', 'specified_changepoints', 'changepoint_range',
+    'yearly_seasonality', 'weekly_seasonality', 'daily_seasonality', 'seasonality_mode',
+    'seasonality_prior_scale', 'changepoint_prior_scale', 'holidays_prior_scale',
+    'mcmc_samples', 'interval_width', 'uncertainty_samples', 'scaling',
+    'logistic_floor', 'country_holidays', 'component_modes', 'holidays_mode'
+)
+
+
+def is_pack_file(path: str) -> bool:
+    with open(path, 'rb') as f:
+        return f.read(len(MAGIC)) == MAGIC
+
+
+def _json_value(value):
+    if isinstance(value, (np.integer, np.floating, np.bool_)):
+        return value.item()
+    return value
+
+
+def _model_config(model) -> str:
+    """
+    Canonical JSON of a fitted model's shared configuration
+    """
+    config = {name: _json_value(getattr(model, name)) for name in _CONFIG_ATTRIBUTES}
+    config['seasonalities'] = [[name, {k: _json_value(v) for k, v in props.items()}]
+                               for name, props in model.seasonalities.items()]
+    if model.extra_regressors:
+        raise ValueError("Models with extra regressors are not supported by the compact format")
+    config['train_holiday_names'] = (list(model.train_holiday_names)
+                                     if model.train_holiday_names is not None else None)
+    columns = model.train_component_cols
+    config['train_component_cols'] = {
+        'index': columns.index.tolist(),
+        'columns': columns.columns.tolist(),
+        'data': columns.to_numpy().astype(int).tolist()
+    }
+    return json.dumps(config, sort_keys=True)
+
+
+def _holidays_table(holidays: Optional[pd.DataFrame]) -> str:
+    if holidays is None:
+        return 'null'
+    table = {
+        column: (holidays[column].dt.strftime('%Y-%m-%d').tolist() if column == 'ds'
+                 else [_json_value(v) for v in holidays[column].tolist()])
+        for column in holidays.columns
+    }
+    return json.dumps(table, sort_keys=True)
+
+
+def write_pack(forecasters: Dict[str, 'DemandForecaster'], path: str,
+               history_hashes: Optional[Dict[str, str]] = None):
+    """
+    Write fitted Prophet forecasters to one compact pack file
+
+    Args:
+        forecasters: Forecaster per school id
+        path: Destination file (written to a temporary file and renamed)
+        history_hashes: Optional training-history hash per school, letting
+            readers verify an entry matches the history they expect
+    """
+    history_hashes = history_hashes or {}
+    configs: Dict[str, int] = {}
+    holiday_tables: Dict[str, int] = {}
+    schools = {}
+    blocks: List[np.ndarray] = []
+    offset = 0
+
+    for school_id, forecaster in forecasters.items():
+        model = forecaster.model
+        if model is None:
+            raise ValueError(f"Forecaster for school {school_id} is not trained")
+
+        config = configs.setdefault(_model_config(model), len(configs))
+        holidays = holiday_tables.setdefault(_holidays_table(model.holidays), len(holiday_tables))
+
+        params = model.params
+        delta = np.asarray(params['delta'], dtype=np.float64)[0]
+        beta = np.asarray(params['beta'], dtype=np.float64)[0]
+        changepoints_t = np.asarray(model.changepoints_t, dtype=np.float64)
+        block = np.concatenate([
+            [float(params['k'][0, 0]), float(params['m'][0, 0]), float(params['sigma_obs'][0, 0])],
+            delta, beta, changepoints_t
+        ])
+
+        history_dates = model.history['ds'].iloc[-2:]
+        schools[school_id] = {
+            'config': config,
+            'holidays': holidays,
+            'offset': offset,
+            'n_changepoints': len(delta),
+            'n_beta': len(beta),
+            'n_changepoints_t': len(changepoints_t),
+            'start': model.start.isoformat(),
+            't_scale': model.t_scale.total_seconds(),
+            'y_scale': float(model.y_scale),
+            'y_min': float(model.y_min) if model.y_min is not None else None,
+            'history_dates': [ds.isoformat() for ds in history_dates],
+            'history_hash': history_hashes.get(school_id)
+        }
+        blocks.append(block)
+        offset += len(block)
+
+    header = json.dumps({
+        'version': 1,
+        'configs': [json.loads(config) for config in configs],
+        'holidays': [json.loads(table) for table in holiday_tables],
+        'schools': schools
+    }).encode()
+
+    prefix = len(MAGIC) + 8 + len(header)
+    padding = (-prefix) % _ALIGN
+    data = np.concatenate(blocks) if blocks else np.zeros(0)
+
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    with open(tmp_path, 'wb') as f:
+        f.write(MAGIC)
+        f.write(struct.pack('<Q', len(header)))
+        f.write(header)
+        f.write(b'\0' * padding)
+        f.write(data.astype('<f8').tobytes())
+    os.replace(tmp_path, path)
+
+
+class CompactProphet:
+    """
+    Fitted model state read from a pack, rebuilt into a Prophet on demand
+    """
+
+    def __init__(self, entry: Dict, config: Dict, holidays: Optional[Dict], values: np.ndarray):
+        """
+        Args:
+            entry: The school's header entry
+            config: Its shared configuration
+            holidays: Its holiday table (column lists), or None
+            values: Its own slice of the data block (k, m, sigma_obs,
+                delta, beta, changepoints_t)
+        """
+        self.entry = entry
+        self.config = config
+        self.holidays = holidays
+        self.values = values
+
+    def to_prophet(self):
+        from prophet import Prophet
+
+        entry, config = self.entry, self.config
+        model = Prophet()
+        for name in _CONFIG_ATTRIBUTES:
+            setattr(model, name, config[name])
+        model.y_scale = entry['y_scale']
+        model.y_min = entry['y_min']
+        # Nanosecond dates, as in a fitted model (parsed strings may get a coarser unit)
+        model.start = pd.Timestamp(entry['start']).as_unit('ns')
+        model.t_scale = pd.Timedelta(seconds=entry['t_scale'])
+
+        n_delta, n_beta = entry['n_changepoints'], entry['n_beta']
+        values = self.values
+        k, m, sigma_obs = values[:3]
+        model.params = {
+            'k': np.array([[k]]),
+            'm': np.array([[m]]),
+            'sigma_obs': np.array([[sigma_obs]]),
+            'delta': values[3:3 + n_delta][None, :],
+            'beta': values[3 + n_delta:3 + n_delta + n_beta][None, :]
+        }
+        model.changepoints_t = values[3 + n_delta + n_beta:]
+        model.changepoints = pd.Series(model.start + model.changepoints_t * model.t_scale, name='ds')
+
+        model.seasonalities = OrderedDict((name, props) for name, props in config['seasonalities'])
+        model.extra_regressors = OrderedDict()
+        names = config['train_holiday_names']
+        model.train_holiday_names = pd.Series(names) if names is not None else None
+        columns = config['train_component_cols']
+        model.train_component_cols = pd.DataFrame(columns['data'], index=columns['index'], columns=columns['columns'])
+        model.train_component_cols.columns.name = 'component'
+        model.train_component_cols.index.name = 'col'
+
+        if self.holidays is not None:
+            holidays = pd.DataFrame(self.holidays)
+            holidays['ds'] = pd.to_datetime(holidays['ds']).astype('datetime64[ns]')
+            model.holidays = holidays
+
+        # Predicting needs the last history dates only (future-date
+        # generation and the single-day uncertainty step)
+        history_dates = pd.to_datetime(pd.Series(entry['history_dates'], name='ds')).astype('datetime64[ns]')
+        model.history_dates = history_dates
+        model.history = pd.DataFrame({'ds': history_dates, 't': (history_dates - model.start) / model.t_scale})
+
+        model.fit_kwargs = {}
+        model.stan_backend = None
+        model.stan_fit = None
+        return model
+
+
+class ForecasterPack:
+    """
+    Read access to a pack file
+
+    The data block is memory-mapped, so opening a pack of thousands of
+    schools only parses its header; a school's Prophet object is built
+    when its forecaster is first used.
+    """
+
+    def __init__(self, path: str):
+        self.path = str(path)
+        with open(path, 'rb') as f:
+            if f.read(len(MAGIC)) != MAGIC:
+                raise ValueError(f"{path} is not a forecaster pack")
+            (header_len,) = struct.unpack('<Q', f.read(8))
+            header = json.loads(f.read(header_len))
+
+        data_offset = len(MAGIC) + 8 + header_len
+        data_offset += (-data_offset) % _ALIGN
+        n_values = sum(
+            3 + entry['n_changepoints'] + entry['n_beta'] + entry['n_changepoints_t']
+            for entry in header['schools'].values()
+        )
+        self._data = (np.memmap(path, dtype='<f8', mode='r', offset=data_offset, shape=(n_values,))
+                      if n_values else np.zeros(0))
+        self._configs = header['configs']
+        self._holidays = header['holidays']
+        self._schools = header['schools']
+
+    def __len__(self) -> int:
+        return len(self._schools)
+
+    def __contains__(self, school_id: str) -> bool:
+        return school_id in self._schools
+
+    @property
+    def school_ids(self) -> List[str]:
+        return list(self._schools)
+
+    def history_hash(self, school_id: str) -> Optional[str]:
+        return self._schools[school_id].get('history_hash')
+
+    def compact_model(self, school_id: str) -> CompactProphet:
+        entry = self._schools[school_id]
+        size = 3 + entry['n_changepoints'] + entry['n_beta'] + entry['n_changepoints_t']
+        # Copy the school's few values out of the map, so the model does not pin the file
+        values = np.array(self._data[entry['offset']:entry['offset'] + size])
+        return CompactProphet(entry, self._configs[entry['config']], self._holidays[entry['holidays']], values)
+
+    def get(self, school_id: str) -> Optional['DemandForecaster']:
+        """
+        Forecaster for the school, with its Prophet model built lazily
+        """
+        from .demand_forecaster import DemandForecaster
+
+        if school_id not in self._schools:
+            return None
+        forecaster = DemandForecaster()
+        forecaster.school_id = school_id
+        forecaster.set_compact_model(self.compact_model(school_id))
+        return forecaster
@@ -0,0 +1,248 @@
+"""
+Demand forecasting service functions
+Module-level entry points that run a full forecast for one school; kept
+picklable so they can execute in the inference process pool
+"""
+
+import asyncio
+import logging
+import os
+import threading
+import time
+from typing import Dict, Optional
+
+import pandas as pd
+
+from app.core.config import settings
+
+from .demand_forecaster import DemandForecaster
+from .forecast_store import DEFAULT_FORECAST_TABLE_PATH, MaterializedForecasts
+from .forecaster_cache import DEFAULT_FORECASTER_CACHE_DIR, ForecasterCache
+from .seasonal_engine import SeasonalForecaster
+
+logger = logging.getLogger(__name__)
+
+# Forecaster engines selectable with settings.FORECAST_ENGINE
+FORECAST_ENGINES = {
+    DemandForecaster.ENGINE: DemandForecaster,
+    SeasonalForecaster.ENGINE: SeasonalForecaster
+}
+
+# Per-process cache of fitted forecasters; the disk level is shared by all workers
+_forecaster_cache: Optional[ForecasterCache] = None
+
+# Materialized forecast table and the (mtime, size) of the file it came from
+_materialized: Optional[MaterializedForecasts] = None
+_materialized_stamp = None
+_materialized_lock = threading.Lock()
+
+# Forecast requests answered from the table vs. left to a live forecast
+_table_hits = 0
+_table_misses = 0
+
+
+def get_forecaster_class():
+    """
+    Forecaster class of the engine configured for this deployment
+    """
+    return FORECAST_ENGINES[settings.FORECAST_ENGINE]
+
+
+def get_forecaster_cache() -> ForecasterCache:
+    """
+    This process's forecaster cache, created on first use
+    """
+    global _forecaster_cache
+    if _forecaster_cache is None:
+        _forecaster_cache = ForecasterCache(
+            cache_dir=settings.FORECASTER_CACHE_DIR or str(DEFAULT_FORECASTER_CACHE_DIR),
+            max_in_memory=settings.FORECASTER_CACHE_SIZE,
+            forecaster_cls=get_forecaster_class(),
+            pack_path=settings.FORECASTER_PACK_PATH
+        )
+    return _forecaster_cache
+
+
+def invalidate_school(school_id: str) -> int:
+    """
+    Drop a school's cached forecasters so the next forecast refits
+    """
+    removed = get_forecaster_cache().invalidate(school_id)
+    table = get_materialized_forecasts()
+    if table is not None and table.discard(school_id):
+        removed += 1
+    return removed
+
+
+def get_materialized_forecasts() -> Optional[MaterializedForecasts]:
+    """
+    The materialized forecast table as of the last refresh
+
+    Pure in-memory read, safe on the event loop; the file is (re)loaded by
+    ``refresh_materialized_forecasts``, normally from ``watch_materialized_forecasts``.
+
+    Returns:
+        The table, or None if none has been loaded
+    """
+    return _materialized
+
+
+def refresh_materialized_forecasts() -> Optional[MaterializedForecasts]:
+    """
+    Reload the materialized forecast table if its file was replaced
+
+    Blocking (stat and a full ``np.load``); run it off the event loop. The
+    new table is swapped in only once fully loaded, so readers keep using
+    the old one meanwhile.
+
+    Returns:
+        The current table, or None if no table has been materialized yet
+    """
+    global _materialized, _materialized_stamp
+    path = settings.FORECAST_TABLE_PATH or str(DEFAULT_FORECAST_TABLE_PATH)
+    with _materialized_lock:
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            _materialized, _materialized_stamp = None, None
+            return None
+
+        stamp = (stat.st_mtime_ns, stat.st_size)
+        if stamp != _materialized_stamp:
+            table = MaterializedForecasts.load(path)
+            _materialized, _materialized_stamp = table, stamp
+        return _materialized
+
+
+async def watch_materialized_forecasts(interval: float):
+    """
+    Refresh the materialized forecast table now and every ``interval`` seconds
+    """
+    while True:
+        try:
+            await asyncio.to_thread(refresh_materialized_forecasts)
+        except Exception:
+            logger.exception("Materialized forecast table refresh failed; keeping current table")
+        await asyncio.sleep(interval)
+
+
+def lookup_forecast(school_id: str, days: int, capacity: Optional[int] = None) -> Optional[Dict[str, any]]:
+    """
+    Serve a forecast from the materialized table without touching Prophet
+    
+    Returns:
+        Same payload as ``forecast_school``, or None when the table does not
+        cover the school or the requested window
+    """
+    global _table_hits, _table_misses
+    table = get_materialized_forecasts()
+    forecast_df = table.lookup(school_id, days) if table is not None else None
+    if forecast_df is None:
+        _table_misses += 1
+        return None
+    _table_hits += 1
+    return forecast_result(forecast_df, capacity)
+
+
+def forecast_table_stats() -> Dict[str, any]:
+    """
+    Materialized-table lookup counters and hit rate
+    """
+    lookups = _table_hits + _table_misses
+    table = _materialized
+    return {
+        'schools': len(table) if table is not None else 0,
+        'hits': _table_hits,
+        'misses': _table_misses,
+        'hit_rate': round(_table_hits / lookups, 4) if lookups else 0.0
+    }
+
+
+def forecast_frame(forecaster: DemandForecaster, days: int, lookback: int = 0) -> pd.DataFrame:
+    """
+    Forecast DataFrame using the deployment's configured interval mode
+    """
+    return forecaster.forecast(
+        days,
+        interval_mode=settings.FORECAST_INTERVAL_MODE,
+        uncertainty_samples=settings.FORECAST_UNCERTAINTY_SAMPLES,
+        lookback=lookback
+    )
+
+
+def forecast_result(forecast_df: pd.DataFrame, capacity: Optional[int] = None) -> Dict[str, any]:
+    """
+    Build the forecast response payload from a forecast DataFrame
+    
+    Args:
+        forecast_df: DataFrame as returned by ``DemandForecaster.forecast``
+        capacity: Optional meal capacity for shortage analysis
+        
+    Returns:
+        Dictionary in the DemandForecastResponse format (without school_id
+        and timestamp), with dates formatted as YYYY-MM-DD
+    """
+    if capacity:
+        result = DemandForecaster.analyze_capacity(forecast_df, capacity)
+    else:
+        result = {
+            'forecast': forecast_df.to_dict('records'),
+            'capacity': None,
+            'avg_predicted_demand': round(float(forecast_df['predicted_demand'].mean()), 2),
+            'max_predicted_demand': int(forecast_df['predicted_demand'].max()),
+            'capacity_utilization': None,
+            'shortage_days': [],
+            'risk_level': 'Low'
+        }
+    
+    for row in result['forecast']:
+        row['date'] = row['date'].strftime('%Y-%m-%d')
+    
+    return result
+
+
+def forecast_school(school_id: str, days: int, capacity: Optional[int] = None) -> Dict[str, any]:
+    """
+    Forecast a school's demand, fitting its forecaster only on a cache miss
+    
+    Args:
+        school_id: School identifier
+        days: Number of days to forecast
+        capacity: Optional meal capacity for shortage analysis
+        
+    Returns:
+        Dictionary in the DemandForecastResponse format (without school_id
+        and timestamp), with dates formatted as YYYY-MM-DD
+    """
+    forecaster = get_forecaster_cache().get_or_train(school_id)
+    return forecast_result(forecast_frame(forecaster, days), capacity)
+
+
+def warm_forecast_worker(history_days: int = 90, days: int = 7) -> Dict[str, any]:
+    """
+    Initialize this process's forecasting state with one throwaway fit
+
+    Run once in each forecast worker at startup: imports Prophet and Stan,
+    builds the holiday calendar and opens the forecaster cache, so the first
+    real request does not pay for them. Nothing is stored in the cache.
+
+    Returns:
+        Dictionary with the worker pid and seconds per step
+    """
+    from .synthetic import demand_history
+
+    timings = {}
+    start = time.perf_counter()
+    get_forecaster_cache()
+    timings['forecaster_cache'] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    forecaster = get_forecaster_class()()
+    forecaster.train('WARMUP', demand_history('WARMUP', history_days))
+    timings['fit'] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    forecast_frame(forecaster, days)
+    timings['forecast'] = time.perf_counter() - start
+
+    return {'pid': os.getpid(), 'seconds': {step: round(s, 4) for step, s in timings.items()}}
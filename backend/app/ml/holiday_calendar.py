@@ -0,0 +1,138 @@
+"""
+Holiday and exam calendar for demand forecasting
+Builds the multi-year holiday table used as Prophet holidays (and seasonal
+engine regressors) from a calendar file, once per process
+"""
+
+import logging
+import threading
+from datetime import date
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Calendar used when HOLIDAY_CALENDAR_PATH is not set
+DEFAULT_CALENDAR_PATH = Path(__file__).resolve().parent / 'calendars' / 'default.csv'
+
+# Years covered around the current year: back-history plus the forecast horizon
+YEARS_BACK = 2
+YEARS_AHEAD = 1
+
+CALENDAR_COLUMNS = ['holiday', 'ds', 'lower_window', 'upper_window']
+
+_calendars: Dict[Tuple[str, int, int], pd.DataFrame] = {}
+_lock = threading.Lock()
+
+
+def load_calendar_events(path: str) -> pd.DataFrame:
+    """
+    Read a calendar file (.csv or .json records)
+
+    Columns:
+        holiday: Event name (events sharing a name share a Prophet effect)
+        date: ``MM-DD`` for an event recurring every year, or ``YYYY-MM-DD``
+            for a single occurrence (e.g. festivals on a lunar calendar)
+        duration: Consecutive days starting at ``date`` (default 1)
+        lower_window, upper_window: Prophet window around each day (default 0)
+    """
+    path = Path(path)
+    events = pd.read_json(path, dtype={'date': str}) if path.suffix == '.json' else pd.read_csv(path, dtype={'date': str})
+
+    missing = {'holiday', 'date'} - set(events.columns)
+    if missing:
+        raise ValueError(f"Calendar {path} is missing columns: {sorted(missing)}")
+
+    for column, default in (('duration', 1), ('lower_window', 0), ('upper_window', 0)):
+        events[column] = events[column].fillna(default).astype(int) if column in events else default
+    events['date'] = events['date'].str.strip()
+    return events
+
+
+def build_calendar(events: pd.DataFrame, first_year: int, last_year: int) -> pd.DataFrame:
+    """
+    Expand calendar events into one row per event day
+
+    Recurring (``MM-DD``) events are placed in every year from
+    ``first_year`` to ``last_year``; all days are generated with array
+    arithmetic rather than per-row parsing.
+
+    Returns:
+        DataFrame with holiday, ds, lower_window, upper_window columns
+    """
+    recurring = events['date'].str.len() == 5
+    years = np.arange(first_year, last_year + 1)
+
+    # Start dates: recurring events x years, then one-off events
+    recurring_events = events[recurring]
+    month_day = recurring_events['date'].str.split('-', expand=True).astype(int) if len(recurring_events) else None
+    starts = []
+    rows = []
+    if month_day is not None:
+        year_starts = np.array(years - 1970, dtype='datetime64[Y]').astype('datetime64[M]')
+        month_starts = year_starts[None, :] + (month_day[0].to_numpy() - 1)[:, None].astype('timedelta64[M]')
+        recurring_starts = month_starts.astype('datetime64[D]') + (month_day[1].to_numpy() - 1)[:, None].astype('timedelta64[D]')
+        starts.append(recurring_starts.ravel())
+        rows.append(np.repeat(np.flatnonzero(recurring), len(years)))
+
+    one_off = events[~recurring]
+    if len(one_off):
+        starts.append(pd.to_datetime(one_off['date']).to_numpy().astype('datetime64[D]'))
+        rows.append(np.flatnonzero(~recurring))
+
+    if not starts:
+        return pd.DataFrame(columns=CALENDAR_COLUMNS)
+
+    starts = np.concatenate(starts)
+    rows = np.concatenate(rows)
+
+    # Expand every start into its `duration` consecutive days
+    durations = events['duration'].to_numpy()[rows]
+    day_rows = np.repeat(rows, durations)
+    offsets = np.arange(durations.sum()) - np.repeat(np.cumsum(durations) - durations, durations)
+    days = np.repeat(starts, durations) + offsets.astype('timedelta64[D]')
+
+    calendar = pd.DataFrame({
+        'holiday': events['holiday'].to_numpy()[day_rows],
+        'ds': pd.to_datetime(days),
+        'lower_window': events['lower_window'].to_numpy()[day_rows],
+        'upper_window': events['upper_window'].to_numpy()[day_rows]
+    })
+    return calendar.sort_values(['ds', 'holiday'], kind='stable').reset_index(drop=True)
+
+
+def get_holiday_calendar(path: Optional[str] = None, year: Optional[int] = None) -> pd.DataFrame:
+    """
+    This process's holiday table, built on first use and shared by all fits
+
+    Covers YEARS_BACK years before to YEARS_AHEAD years after the current
+    year, so histories and forecasts straddling a year boundary see their
+    events. The table is rebuilt when the year changes or the file is
+    modified. Callers must not modify the returned DataFrame.
+
+    Args:
+        path: Calendar file (default: HOLIDAY_CALENDAR_PATH, else the
+            bundled calendars/default.csv)
+        year: Current year (default: today's)
+    """
+    path = str(path or settings.HOLIDAY_CALENDAR_PATH or DEFAULT_CALENDAR_PATH)
+    year = year or date.today().year
+    key = (path, Path(path).stat().st_mtime_ns, year)
+
+    calendar = _calendars.get(key)
+    if calendar is None:
+        with _lock:
+            calendar = _calendars.get(key)
+            if calendar is None:
+                calendar = build_calendar(load_calendar_events(path), year - YEARS_BACK, year + YEARS_AHEAD)
+                # Only the current version of each file is kept
+                for stale in [k for k in _calendars if k[0] == path]:
+                    del _calendars[stale]
+                _calendars[key] = calendar
+                logger.info(f"Built holiday calendar from {path}: {len(calendar)} event days")
+    return calendar
@@ -0,0 +1,160 @@
+"""
+Prediction result cache
+LRU + TTL cache in front of RiskPredictor.predict/predict_batch, keyed by the
+quantized feature vector and the model version
+"""
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from .risk_predictor import BatchFeatures, RiskPredictor
+
+
+class PredictionCache:
+    """
+    In-process LRU + TTL cache of risk predictions
+
+    Feature vectors are rounded to ``precision`` decimals before hashing, so
+    schools submitting near-identical vectors share an entry. Ratio fields
+    are bounded in [0, 1] and the count fields are small integers, which
+    keeps the key space compact. The model version is part of the key, so a
+    hot-swapped model never serves predictions from its predecessor.
+    """
+
+    def __init__(self, maxsize: int = 100_000, ttl_seconds: float = 3600.0, precision: int = 3):
+        """
+        Args:
+            maxsize: Maximum number of cached predictions; 0 disables caching
+            ttl_seconds: Lifetime of an entry
+            precision: Decimals kept when quantizing feature values
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl_seconds
+        self.precision = precision
+
+        self._entries: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.maxsize > 0
+
+    def _keys(self, model_version: str, matrix: np.ndarray) -> List[Tuple[str, bytes]]:
+        # Adding 0.0 folds -0.0 into 0.0 so both hash alike
+        quantized = np.round(matrix, self.precision) + 0.0
+        return [
+            (model_version, hashlib.blake2b(row.tobytes(), digest_size=16).digest())
+            for row in quantized
+        ]
+
+    def _get(self, key, now: float):
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, result = entry
+        if expires_at <= now:
+            del self._entries[key]
+            self.expirations += 1
+            return None
+        self._entries.move_to_end(key)
+        return result
+
+    def _put(self, key, result: Dict[str, any], now: float):
+        self._entries[key] = (now + self.ttl, result)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def predict(self, predictor: RiskPredictor, features: Dict[str, float]) -> Dict[str, any]:
+        """
+        Cached ``predictor.predict`` for a single school
+        """
+        if not self.enabled:
+            return predictor.predict(features)
+
+        row = np.fromiter(
+            (features[name] for name in predictor.feature_names),
+            dtype=np.float64, count=len(predictor.feature_names)
+        )
+        key = self._keys(predictor.model_version, row[np.newaxis, :])[0]
+
+        with self._lock:
+            cached = self._get(key, time.monotonic())
+            if cached is not None:
+                self.hits += 1
+                return dict(cached)
+            self.misses += 1
+
+        result = predictor.predict(features)
+        with self._lock:
+            self._put(key, result, time.monotonic())
+        return dict(result)
+
+    def predict_batch(self, predictor: RiskPredictor, features: BatchFeatures) -> List[Dict[str, any]]:
+        """
+        Cached ``predictor.predict_batch``
+
+        Only the cache misses are scored, in one columnar call; the results
+        are merged back in input order.
+        """
+        if not self.enabled:
+            return predictor.predict_batch_columnar(features).to_records()
+
+        matrix = predictor._feature_matrix(features)
+        keys = self._keys(predictor.model_version, matrix)
+        results: List[Dict[str, any]] = [None] * len(keys)
+        missing = []
+
+        with self._lock:
+            now = time.monotonic()
+            for i, key in enumerate(keys):
+                cached = self._get(key, now)
+                if cached is None:
+                    missing.append(i)
+                else:
+                    results[i] = dict(cached)
+            self.hits += len(keys) - len(missing)
+            self.misses += len(missing)
+
+        if missing:
+            computed = predictor.predict_batch_columnar(matrix[missing]).to_records()
+            with self._lock:
+                now = time.monotonic()
+                for i, result in zip(missing, computed):
+                    self._put(keys[i], result, now)
+                    results[i] = dict(result)
+
+        return results
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, any]:
+        """
+        Cache counters and hit rate
+        """
+        lookups = self.hits + self.misses
+        return {
+            'enabled': self.enabled,
+            'size': len(self._entries),
+            'maxsize': self.maxsize,
+            'ttl_seconds': self.ttl,
+            'precision': self.precision,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'expirations': self.expirations,
+            'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0
+        }
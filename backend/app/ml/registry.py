@@ -0,0 +1,187 @@
+"""
+Process-wide model registry
+Hands out versioned, immutable handles to the loaded risk model and
+hot-swaps it atomically when a new model file lands
+"""
+
+import asyncio
+import logging
+import threading
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Optional, Tuple
+
+from .risk_predictor import RiskPredictor
+
+logger = logging.getLogger(__name__)
+
+
+class ModelNotLoadedError(RuntimeError):
+    """Raised when a model is requested before the registry is populated"""
+
+
+@dataclass(frozen=True)
+class ModelHandle:
+    """
+    Immutable reference to one published model version
+
+    A handler takes a handle once and uses it for the whole request, so a
+    concurrent hot-swap never changes the model underneath it.
+    """
+    version: str
+    predictor: RiskPredictor
+    source: Optional[str]
+    loaded_at: datetime
+
+
+class ModelRegistry:
+    """
+    Holds the current risk model handle for the process
+    """
+
+    def __init__(self):
+        self._handle: Optional[ModelHandle] = None
+        self._lock = threading.Lock()
+        self._model_path: Optional[str] = None
+        self._cache_dir: Optional[str] = None
+        self._file_stamp: Optional[Tuple[int, int]] = None
+        self._pending_stamp: Optional[Tuple[int, int]] = None
+        self._watch_task: Optional[asyncio.Task] = None
+
+    @property
+    def loaded(self) -> bool:
+        return self._handle is not None
+
+    def current(self) -> ModelHandle:
+        """
+        Return the handle of the currently published model
+
+        Raises:
+            ModelNotLoadedError: If no model has been published yet
+        """
+        handle = self._handle
+        if handle is None:
+            raise ModelNotLoadedError("Risk model is not loaded")
+        return handle
+
+    def publish(self, predictor: RiskPredictor, source: Optional[str] = None) -> ModelHandle:
+        """
+        Atomically replace the current model with an already built predictor
+
+        Args:
+            predictor: Fully initialized predictor; must not be mutated afterwards
+            source: Where the model came from (file path), for reporting
+
+        Returns:
+            The newly published handle
+        """
+        handle = ModelHandle(
+            version=predictor.model_version,
+            predictor=predictor,
+            source=source,
+            loaded_at=datetime.now()
+        )
+        with self._lock:
+            previous = self._handle
+            self._handle = handle
+
+        if previous is None:
+            logger.info(f"Published risk model version {handle.version}")
+        else:
+            logger.info(f"Swapped risk model {previous.version} -> {handle.version}")
+        return handle
+
+    def load(self, model_path: Optional[str] = None, cache_dir: Optional[str] = None) -> ModelHandle:
+        """
+        Build a predictor from ``model_path`` and publish it
+
+        Falls back to the (disk-cached) default model when the file does not
+        exist. The predictor is fully built before the swap, so readers never
+        observe a half-loaded model.
+
+        Args:
+            model_path: Path to a saved LightGBM model file
+            cache_dir: Directory for the cached default model
+
+        Returns:
+            The newly published handle
+        """
+        self._model_path = model_path
+        self._cache_dir = cache_dir
+        self._file_stamp = self._stat(model_path)
+        self._pending_stamp = None
+
+        predictor = RiskPredictor(model_path, cache_dir=cache_dir)
+        source = model_path if self._file_stamp is not None else None
+        return self.publish(predictor, source=source)
+
+    def refresh_if_changed(self) -> Optional[ModelHandle]:
+        """
+        Reload the model if its file changed since the last load
+
+        A change is only acted on once the file's size and mtime are stable
+        across two consecutive checks, so a file still being written is not
+        loaded. Load failures keep the current model in service.
+
+        Returns:
+            The new handle if a swap happened, otherwise None
+        """
+        stamp = self._stat(self._model_path)
+        if stamp is None or stamp == self._file_stamp:
+            self._pending_stamp = None
+            return None
+
+        if stamp != self._pending_stamp:
+            self._pending_stamp = stamp
+            return None
+
+        try:
+            predictor = RiskPredictor(self._model_path, cache_dir=self._cache_dir)
+        except Exception:
+            logger.exception(f"Failed to load new model from {self._model_path}; keeping current")
+            self._file_stamp = stamp
+            self._pending_stamp = None
+            return None
+
+        self._file_stamp = stamp
+        self._pending_stamp = None
+        return self.publish(predictor, source=self._model_path)
+
+    async def _watch(self, interval: float):
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await asyncio.to_thread(self.refresh_if_changed)
+            except Exception:
+                logger.exception("Model file watch iteration failed")
+
+    def start_watching(self, interval: float):
+        """
+        Poll the model file every ``interval`` seconds and hot-swap on change
+        """
+        if self._watch_task is None and interval > 0:
+            self._watch_task = asyncio.create_task(self._watch(interval))
+
+    async def stop_watching(self):
+        if self._watch_task is not None:
+            self._watch_task.cancel()
+            try:
+                await self._watch_task
+            except asyncio.CancelledError:
+                pass
+            self._watch_task = None
+
+    @staticmethod
+    def _stat(path: Optional[str]) -> Optional[Tuple[int, int]]:
+        if not path:
+            return None
+        try:
+            stat = Path(path).stat()
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+
+# Process-wide registry, populated by the application lifespan
+model_registry = ModelRegistry()
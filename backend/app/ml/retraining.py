@@ -0,0 +1,95 @@
+"""
+Background risk model retraining
+Runs warm-start (incremental) retrains off the request path and publishes
+the updated model through the registry
+"""
+
+import logging
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+from .registry import ModelRegistry, model_registry
+
+logger = logging.getLogger(__name__)
+
+
+class RetrainWorker:
+    """
+    Single background worker that applies retrain jobs one at a time
+
+    Each job copies the currently published predictor, retrains the copy
+    and publishes it, so readers keep using the old model until the swap.
+    """
+
+    def __init__(self, registry: ModelRegistry, max_jobs_kept: int = 100):
+        self.registry = registry
+        self.max_jobs_kept = max_jobs_kept
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='retrain')
+        self._jobs: Dict[str, Dict[str, any]] = {}
+        self._lock = threading.Lock()
+
+    def submit(self, X_train: pd.DataFrame, y_train: np.ndarray, incremental: bool = True,
+               max_new_trees: Optional[int] = None) -> str:
+        """
+        Queue a retrain job
+
+        Args:
+            X_train: Newly labelled feature rows
+            y_train: Their risk scores
+            incremental: Warm-start from the current model instead of a full retrain
+            max_new_trees: Cap on trees added by an incremental retrain
+
+        Returns:
+            Job id for ``status``
+        """
+        job_id = uuid.uuid4().hex
+        with self._lock:
+            self._jobs[job_id] = {
+                'job_id': job_id,
+                'status': 'queued',
+                'mode': 'incremental' if incremental else 'full',
+                'samples': len(X_train),
+                'submitted_at': datetime.now().isoformat()
+            }
+            while len(self._jobs) > self.max_jobs_kept:
+                self._jobs.pop(next(iter(self._jobs)))
+
+        self._executor.submit(self._run, job_id, X_train, y_train, incremental, max_new_trees)
+        return job_id
+
+    def _run(self, job_id: str, X_train, y_train, incremental: bool, max_new_trees: Optional[int]):
+        self._update(job_id, status='running', started_at=datetime.now().isoformat())
+        try:
+            current = self.registry.current()
+            candidate = current.predictor.copy()
+            report = candidate.retrain(X_train, y_train, incremental=incremental, max_new_trees=max_new_trees)
+            handle = self.registry.publish(candidate, source=f"retrain:{job_id}")
+            report['previous_version'] = current.version
+            self._update(job_id, status='completed', finished_at=datetime.now().isoformat(),
+                         model_version=handle.version, report=report)
+        except Exception as e:
+            logger.exception(f"Retrain job {job_id} failed")
+            self._update(job_id, status='failed', finished_at=datetime.now().isoformat(), error=str(e))
+
+    def _update(self, job_id: str, **fields):
+        with self._lock:
+            if job_id in self._jobs:
+                self._jobs[job_id].update(fields)
+
+    def status(self, job_id: str) -> Optional[Dict[str, any]]:
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return dict(job) if job is not None else None
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+# Process-wide retrain worker
+retrain_worker = RetrainWorker(model_registry)
@@ -6,44 +6,165 @@ Predicts hunger risk scores for schools based on multiple features
 import lightgbm as lgb
 import numpy as np
 import pandas as pd
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Sequence, Union
 import joblib
 from pathlib import Path
+from collections import OrderedDict
+from dataclasses import dataclass
+from operator import itemgetter
+import hashlib
+import json
 import logging
+import os
+import tempfile
+import threading
+import time
+import copy
+
+from app.core.metrics import observe_stage
+
+from . import synthetic
 
 logger = logging.getLogger(__name__)
 
 
+# Default location of cached default-model artifacts
+DEFAULT_MODEL_CACHE_DIR = Path(__file__).resolve().parents[2] / 'models' / 'cache'
+
+# Model input features, in column order
+FEATURE_NAMES = (
+    'enrollment',
+    'current_attendance',
+    'capacity',
+    'avg_meal_uptake',
+    'attendance_rate',
+    'capacity_utilization',
+    'days_since_inspection',
+    'previous_shortage_count',
+    'budget_utilization_rate',
+    'supply_chain_delay_days',
+    'weather_risk_score',
+    'seasonal_factor',
+    'hostel_attached',
+    'enrollment_trend_7d',
+    'attendance_trend_7d'
+)
+
+# Risk level labels indexed by level code, and the score thresholds between them
+RISK_LEVELS = ('Low', 'Medium', 'High', 'Critical')
+RISK_THRESHOLDS = np.array([30.0, 50.0, 70.0])
+
+# Batch input accepted by the columnar prediction path
+BatchFeatures = Union[Sequence[Dict[str, float]], pd.DataFrame, np.ndarray]
+
+# Decimals kept in returned risk scores
+SCORE_DECIMALS = 2
+
+
+def round_scores(scores):
+    """
+    Round risk scores for responses
+
+    Every prediction path rounds through here (NumPy's rounding, for one
+    score or an array), so a row gets the same score alone or in a batch.
+    """
+    return np.round(scores, SCORE_DECIMALS)
+
+
+@dataclass
+class RiskBatchResult:
+    """
+    Columnar batch prediction output
+    
+    Attributes:
+        risk_scores: Clipped risk scores rounded with ``round_scores`` (float64)
+        level_codes: Index into ``RISK_LEVELS`` per row (uint8)
+        confidence: Model confidence per row (float64)
+    """
+    risk_scores: np.ndarray
+    level_codes: np.ndarray
+    confidence: np.ndarray
+    
+    def __len__(self) -> int:
+        return len(self.risk_scores)
+    
+    @property
+    def risk_levels(self) -> np.ndarray:
+        """Risk level labels per row"""
+        return np.asarray(RISK_LEVELS)[self.level_codes]
+    
+    def to_records(self) -> List[Dict[str, any]]:
+        """
+        Per-row prediction dictionaries, in the format of ``RiskPredictor.predict``
+        """
+        return [
+            {'risk_score': score, 'risk_level': RISK_LEVELS[code], 'confidence': confidence}
+            for score, code, confidence in zip(
+                self.risk_scores.tolist(), self.level_codes.tolist(), self.confidence.tolist()
+            )
+        ]
+
+
 class RiskPredictor:
     """
     LightGBM-based risk prediction model for school meal shortage risk
     """
     
-    def __init__(self, model_path: Optional[str] = None):
+    # LightGBM parameters optimized for risk prediction
+    DEFAULT_PARAMS = {
+        'objective': 'regression',
+        'metric': 'rmse',
+        'boosting_type': 'gbdt',
+        'num_leaves': 31,
+        'learning_rate': 0.05,
+        'feature_fraction': 0.9,
+        'bagging_fraction': 0.8,
+        'bagging_freq': 5,
+        'max_depth': 7,
+        'min_data_in_leaf': 20,
+        'lambda_l1': 0.1,
+        'lambda_l2': 0.1,
+        'verbose': -1
+    }
+    DEFAULT_NUM_BOOST_ROUND = 100
+    
+    # Synthetic data used to build the default model. Bump the data version
+    # whenever the generators change so cached default models are rebuilt.
+    SYNTHETIC_SAMPLES = 1000
+    SYNTHETIC_SEED = 42
+    SYNTHETIC_DATA_VERSION = 2
+    
+    # Rows kept in the per-model explanation cache
+    EXPLANATION_CACHE_SIZE = 4096
+    
+    # Default cap on trees added by one incremental (warm-start) retrain
+    INCREMENTAL_MAX_NEW_TREES = 20
+    
+    def __init__(self, model_path: Optional[str] = None, cache_dir: Optional[str] = None,
+                 use_cache: bool = True):
         """
         Initialize the risk predictor
         
         Args:
             model_path: Path to saved model file
+            cache_dir: Directory holding cached default models
+                (defaults to ``backend/models/cache``)
+            use_cache: Reuse/store the default model in ``cache_dir``
         """
+        self.cache_dir = Path(cache_dir) if cache_dir else DEFAULT_MODEL_CACHE_DIR
+        self.use_cache = use_cache
         self.model = None
-        self.feature_names = [
-            'enrollment',
-            'current_attendance',
-            'capacity',
-            'avg_meal_uptake',
-            'attendance_rate',
-            'capacity_utilization',
-            'days_since_inspection',
-            'previous_shortage_count',
-            'budget_utilization_rate',
-            'supply_chain_delay_days',
-            'weather_risk_score',
-            'seasonal_factor',
-            'hostel_attached',
-            'enrollment_trend_7d',
-            'attendance_trend_7d'
-        ]
+        self.model_version: Optional[str] = None
+        # Wall time of the last from-scratch training in this process
+        self.last_full_train_seconds: Optional[float] = None
+        self.feature_names = list(FEATURE_NAMES)
+        
+        # Per-thread (1, n_features) buffers reused by the single-row fast path
+        self._row_buffers = threading.local()
+        
+        # (model_version, feature row bytes) -> contribution row
+        self._explanation_cache: OrderedDict = OrderedDict()
+        self._explanation_lock = threading.Lock()
         
         if model_path and Path(model_path).exists():
             self.load_model(model_path)
@@ -53,103 +174,148 @@ class RiskPredictor:
     def _initialize_default_model(self):
         """
         Initialize a default LightGBM model with pre-configured parameters
+        
+        The trained booster is cached on disk under a key derived from its
+        training inputs, so later constructions (and other worker processes)
+        load it instead of retraining.
         """
-        logger.info("Initializing default LightGBM model...")
+        cache_path = self._default_model_cache_path() if self.use_cache else None
+        if cache_path is not None and cache_path.exists():
+            try:
+                self.model = lgb.Booster(model_str=cache_path.read_text())
+                self._update_model_version()
+                self.last_full_train_seconds = self._read_cache_metadata(cache_path).get('train_seconds')
+                logger.info(f"Default model loaded from cache {cache_path.name}")
+                return
+            except Exception:
+                logger.warning(f"Ignoring unreadable cached model {cache_path}", exc_info=True)
         
-        # LightGBM parameters optimized for risk prediction
-        params = {
-            'objective': 'regression',
-            'metric': 'rmse',
-            'boosting_type': 'gbdt',
-            'num_leaves': 31,
-            'learning_rate': 0.05,
-            'feature_fraction': 0.9,
-            'bagging_fraction': 0.8,
-            'bagging_freq': 5,
-            'max_depth': 7,
-            'min_data_in_leaf': 20,
-            'lambda_l1': 0.1,
-            'lambda_l2': 0.1,
-            'verbose': -1
-        }
+        logger.info("Initializing default LightGBM model...")
         
         # Create a dummy dataset for initialization
         # In production, this would be trained on historical data
-        X_train = self._generate_synthetic_training_data(1000)
+        X_train = self._generate_synthetic_training_data(self.SYNTHETIC_SAMPLES, seed=self.SYNTHETIC_SEED)
         y_train = self._generate_synthetic_risk_scores(X_train)
         
         # Create LightGBM dataset
         train_data = lgb.Dataset(X_train, label=y_train, feature_name=self.feature_names)
         
         # Train the model
+        start = time.perf_counter()
         self.model = lgb.train(
-            params,
+            self.DEFAULT_PARAMS,
             train_data,
-            num_boost_round=100,
+            num_boost_round=self.DEFAULT_NUM_BOOST_ROUND,
             valid_sets=[train_data],
             callbacks=[lgb.early_stopping(stopping_rounds=10), lgb.log_evaluation(period=0)]
         )
+        self.last_full_train_seconds = time.perf_counter() - start
+        self._update_model_version()
+        
+        if cache_path is not None:
+            self._write_model_cache(cache_path)
         
         logger.info("Default model initialized successfully")
     
-    def _generate_synthetic_training_data(self, n_samples: int) -> pd.DataFrame:
+    def default_model_cache_key(self) -> str:
+        """
+        Content key of the default model: a hash over everything that
+        determines the trained booster
+        """
+        key_inputs = {
+            'params': self.DEFAULT_PARAMS,
+            'num_boost_round': self.DEFAULT_NUM_BOOST_ROUND,
+            'feature_names': self.feature_names,
+            'n_samples': self.SYNTHETIC_SAMPLES,
+            'seed': self.SYNTHETIC_SEED,
+            'data_version': self.SYNTHETIC_DATA_VERSION,
+            'lightgbm': lgb.__version__
+        }
+        payload = json.dumps(key_inputs, sort_keys=True).encode()
+        return hashlib.sha256(payload).hexdigest()
+    
+    def _default_model_cache_path(self) -> Path:
+        return self.cache_dir / f"default_risk_model_{self.default_model_cache_key()[:16]}.txt"
+    
+    def _write_model_cache(self, cache_path: Path):
+        """
+        Write the booster to the cache atomically, so concurrently starting
+        workers never read a partially written artifact
+        """
+        metadata = json.dumps({'train_seconds': self.last_full_train_seconds})
+        try:
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            # Metadata first: a visible model artifact always has its sidecar
+            for path, content in ((cache_path.with_suffix('.json'), metadata),
+                                  (cache_path, self.model.model_to_string())):
+                fd, tmp_path = tempfile.mkstemp(dir=cache_path.parent, suffix='.tmp')
+                with os.fdopen(fd, 'w') as f:
+                    f.write(content)
+                os.replace(tmp_path, path)
+            logger.info(f"Default model cached at {cache_path}")
+        except OSError:
+            logger.warning(f"Could not write model cache {cache_path}", exc_info=True)
+    
+    @staticmethod
+    def _read_cache_metadata(cache_path: Path) -> Dict[str, any]:
+        try:
+            return json.loads(cache_path.with_suffix('.json').read_text())
+        except (OSError, ValueError):
+            return {}
+    
+    def _update_model_version(self):
+        """
+        Derive the model version from the booster's serialized content, so
+        identical models share a version across processes and restarts
+        """
+        model_str = self.model.model_to_string()
+        self.model_version = hashlib.sha256(model_str.encode()).hexdigest()[:12]
+    
+    def _generate_synthetic_training_data(self, n_samples: int, seed: int = 42) -> pd.DataFrame:
         """
         Generate synthetic training data for model initialization
         In production, replace with actual historical data
         """
-        np.random.seed(42)
-        
-        data = {
-            'enrollment': np.random.randint(150, 800, n_samples),
-            'current_attendance': np.random.randint(100, 700, n_samples),
-            'capacity': np.random.randint(120, 750, n_samples),
-            'avg_meal_uptake': np.random.randint(90, 680, n_samples),
-            'attendance_rate': np.random.uniform(0.6, 0.95, n_samples),
-            'capacity_utilization': np.random.uniform(0.5, 1.0, n_samples),
-            'days_since_inspection': np.random.randint(0, 180, n_samples),
-            'previous_shortage_count': np.random.randint(0, 10, n_samples),
-            'budget_utilization_rate': np.random.uniform(0.7, 1.0, n_samples),
-            'supply_chain_delay_days': np.random.randint(0, 15, n_samples),
-            'weather_risk_score': np.random.uniform(0, 100, n_samples),
-            'seasonal_factor': np.random.uniform(0.8, 1.2, n_samples),
-            'hostel_attached': np.random.randint(0, 2, n_samples),
-            'enrollment_trend_7d': np.random.uniform(-0.1, 0.1, n_samples),
-            'attendance_trend_7d': np.random.uniform(-0.15, 0.15, n_samples)
-        }
-        
-        return pd.DataFrame(data)
+        return synthetic.generate_features(n_samples, seed=seed)
     
     def _generate_synthetic_risk_scores(self, X: pd.DataFrame) -> np.ndarray:
         """
         Generate synthetic risk scores based on features
         This simulates the relationship between features and risk
         """
-        risk_scores = (
-            # High capacity utilization increases risk
-            X['capacity_utilization'] * 30 +
-            # Low attendance rate increases risk
-            (1 - X['attendance_rate']) * 25 +
-            # Previous shortages increase risk
-            X['previous_shortage_count'] * 5 +
-            # Supply chain delays increase risk
-            X['supply_chain_delay_days'] * 2 +
-            # Weather risk contributes
-            X['weather_risk_score'] * 0.2 +
-            # Days since inspection
-            (X['days_since_inspection'] / 180) * 15 +
-            # Budget utilization (high = good, low = risk)
-            (1 - X['budget_utilization_rate']) * 20 +
-            # Random noise
-            np.random.normal(0, 5, len(X))
-        )
-        
-        # Clip to 0-100 range
-        return np.clip(risk_scores, 0, 100)
+        return synthetic.risk_scores(X, seed=self.SYNTHETIC_SEED)
+    
+    @staticmethod
+    def _risk_level(risk_score: float) -> str:
+        """
+        Map a clipped risk score to its risk level label
+        """
+        if risk_score >= RISK_THRESHOLDS[2]:
+            return RISK_LEVELS[3]
+        elif risk_score >= RISK_THRESHOLDS[1]:
+            return RISK_LEVELS[2]
+        elif risk_score >= RISK_THRESHOLDS[0]:
+            return RISK_LEVELS[1]
+        return RISK_LEVELS[0]
+    
+    def _row_buffer(self) -> np.ndarray:
+        """
+        Return this thread's preallocated single-row feature buffer
+        """
+        buffer = getattr(self._row_buffers, 'row', None)
+        if buffer is None:
+            buffer = np.empty((1, len(self.feature_names)), dtype=np.float64)
+            self._row_buffers.row = buffer
+        return buffer
     
     def predict(self, features: Dict[str, float]) -> Dict[str, any]:
         """
         Predict risk score for a single school
         
+        Packs the features straight into a preallocated float array in
+        ``feature_names`` order and scores it on the booster, skipping the
+        one-row DataFrame construction.
+        
         Args:
             features: Dictionary of feature values
             
@@ -159,69 +325,102 @@ class RiskPredictor:
         if self.model is None:
             raise ValueError("Model not initialized")
         
-        # Convert features to DataFrame
-        feature_df = pd.DataFrame([features])[self.feature_names]
+        start = time.perf_counter()
+        row = self._row_buffer()
+        values = row[0]
+        for i, name in enumerate(self.feature_names):
+            values[i] = features[name]
         
-        # Predict
-        risk_score = self.model.predict(feature_df)[0]
+        # Single-threaded predict: thread start-up dominates a one-row call
+        packed = time.perf_counter()
+        risk_score = self.model.predict(row, num_threads=1)[0]
+        predicted = time.perf_counter()
         risk_score = float(np.clip(risk_score, 0, 100))
         
-        # Determine risk level
-        if risk_score >= 70:
-            risk_level = "Critical"
-        elif risk_score >= 50:
-            risk_level = "High"
-        elif risk_score >= 30:
-            risk_level = "Medium"
-        else:
-            risk_level = "Low"
-        
-        return {
-            'risk_score': round(risk_score, 2),
-            'risk_level': risk_level,
+        result = {
+            'risk_score': float(round_scores(risk_score)),
+            'risk_level': self._risk_level(risk_score),
             'confidence': 0.85  # Model confidence score
         }
+        self._observe_stages(start, packed, predicted)
+        return result
     
-    def predict_batch(self, features_list: List[Dict[str, float]]) -> List[Dict[str, any]]:
+    @staticmethod
+    def _observe_stages(start: float, packed: float, predicted: float):
         """
-        Predict risk scores for multiple schools
+        Record feature packing, booster and post-processing time
+        """
+        observe_stage('feature_frame', packed - start)
+        observe_stage('booster_predict', predicted - packed)
+        observe_stage('post_process', time.perf_counter() - predicted)
+    
+    def _feature_matrix(self, features: BatchFeatures) -> np.ndarray:
+        """
+        Pack batch input into a (n_rows, n_features) float64 matrix in
+        ``feature_names`` order
+        """
+        if isinstance(features, np.ndarray):
+            if features.ndim != 2 or features.shape[1] != len(self.feature_names):
+                raise ValueError(f"Expected a (n, {len(self.feature_names)}) feature matrix")
+            return np.asarray(features, dtype=np.float64)
+        if isinstance(features, pd.DataFrame):
+            return features[self.feature_names].to_numpy(dtype=np.float64)
+        
+        getter = itemgetter(*self.feature_names)
+        matrix = np.array([getter(row) for row in features], dtype=np.float64)
+        return matrix.reshape(len(features), len(self.feature_names))
+    
+    def predict_batch_columnar(self, features: BatchFeatures) -> RiskBatchResult:
+        """
+        Predict risk scores for multiple schools, returned as columns
+        
+        Risk levels are bucketed with a single vectorized ``searchsorted``
+        over the thresholds; no per-row Python work is done.
         
         Args:
-            features_list: List of feature dictionaries
+            features: List of feature dictionaries, a DataFrame with the
+                feature columns, or a (n, 15) array in ``feature_names`` order
             
         Returns:
-            List of prediction dictionaries
+            RiskBatchResult with score, level code and confidence arrays
         """
         if self.model is None:
             raise ValueError("Model not initialized")
         
-        # Convert to DataFrame
-        feature_df = pd.DataFrame(features_list)[self.feature_names]
+        start = time.perf_counter()
+        matrix = self._feature_matrix(features)
+        if len(matrix) == 0:
+            empty = np.empty(0, dtype=np.float64)
+            return RiskBatchResult(empty, np.empty(0, dtype=np.uint8), empty.copy())
         
         # Predict
-        risk_scores = self.model.predict(feature_df)
+        packed = time.perf_counter()
+        risk_scores = self.model.predict(matrix)
+        predicted = time.perf_counter()
         risk_scores = np.clip(risk_scores, 0, 100)
         
-        # Format results
-        results = []
-        for score in risk_scores:
-            score = float(score)
-            if score >= 70:
-                risk_level = "Critical"
-            elif score >= 50:
-                risk_level = "High"
-            elif score >= 30:
-                risk_level = "Medium"
-            else:
-                risk_level = "Low"
-            
-            results.append({
-                'risk_score': round(score, 2),
-                'risk_level': risk_level,
-                'confidence': 0.85
-            })
+        # Score >= threshold moves a row into the next level
+        level_codes = np.searchsorted(RISK_THRESHOLDS, risk_scores, side='right').astype(np.uint8)
         
-        return results
+        result = RiskBatchResult(
+            risk_scores=round_scores(risk_scores),
+            level_codes=level_codes,
+            confidence=np.full(len(risk_scores), 0.85)
+        )
+        self._observe_stages(start, packed, predicted)
+        return result
+    
+    def predict_batch(self, features_list: List[Dict[str, float]]) -> List[Dict[str, any]]:
+        """
+        Predict risk scores for multiple schools
+        
+        Args:
+            features_list: List of feature dictionaries
+            
+        Returns:
+            List of prediction dictionaries
+        """
+        return self.predict_batch_columnar(features_list).to_records()
     
     def get_feature_importance(self) -> Dict[str, float]:
         """
@@ -259,73 +458,210 @@ class RiskPredictor:
             path: File path to load the model from
         """
         self.model = lgb.Booster(model_file=path)
-        logger.info(f"Model loaded from {path}")
+        self._update_model_version()
+        logger.info(f"Model loaded from {path} (version {self.model_version})")
     
-    def retrain(self, X_train: pd.DataFrame, y_train: np.ndarray):
+    def retrain(self, X_train: pd.DataFrame, y_train: np.ndarray, incremental: bool = False,
+                max_new_trees: Optional[int] = None) -> Dict[str, any]:
         """
         Retrain the model with new data
         
+        A full retrain trains a fresh booster from scratch. An incremental
+        retrain warm-starts from the current booster and keeps boosting on
+        the new rows only, adding at most ``max_new_trees`` trees, which is
+        suited to small daily batches of labelled feedback.
+        
         Args:
             X_train: Training features
             y_train: Training labels (risk scores)
+            incremental: Continue boosting from the current model
+            max_new_trees: Cap on trees added by an incremental retrain
+                (defaults to INCREMENTAL_MAX_NEW_TREES)
+            
+        Returns:
+            Dictionary with the mode, tree counts, sample count, duration and
+            the last full-train duration measured in this process
         """
-        logger.info("Retraining model with new data...")
-        
-        params = {
-            'objective': 'regression',
-            'metric': 'rmse',
-            'boosting_type': 'gbdt',
-            'num_leaves': 31,
-            'learning_rate': 0.05,
-            'feature_fraction': 0.9,
-            'bagging_fraction': 0.8,
-            'bagging_freq': 5,
-            'max_depth': 7,
-            'min_data_in_leaf': 20,
-            'lambda_l1': 0.1,
-            'lambda_l2': 0.1,
-            'verbose': -1
-        }
+        if incremental and self.model is None:
+            raise ValueError("Model not initialized")
+        
+        logger.info(f"Retraining model with new data ({'incremental' if incremental else 'full'})...")
         
         train_data = lgb.Dataset(X_train, label=y_train, feature_name=self.feature_names)
+        trees_before = self.model.num_trees() if self.model is not None else 0
+        
+        start = time.perf_counter()
+        if incremental:
+            self.model = lgb.train(
+                self.DEFAULT_PARAMS,
+                train_data,
+                num_boost_round=max_new_trees or self.INCREMENTAL_MAX_NEW_TREES,
+                init_model=self.model,
+                valid_sets=[train_data],
+                callbacks=[lgb.early_stopping(stopping_rounds=10), lgb.log_evaluation(period=0)]
+            )
+        else:
+            self.model = lgb.train(
+                self.DEFAULT_PARAMS,
+                train_data,
+                num_boost_round=self.DEFAULT_NUM_BOOST_ROUND,
+                valid_sets=[train_data],
+                callbacks=[lgb.early_stopping(stopping_rounds=10), lgb.log_evaluation(period=0)]
+            )
+        seconds = time.perf_counter() - start
+        if not incremental:
+            self.last_full_train_seconds = seconds
+        self._update_model_version()
+        
+        full_seconds = self.last_full_train_seconds
+        report = {
+            'mode': 'incremental' if incremental else 'full',
+            'samples': len(X_train),
+            'trees_before': trees_before,
+            'trees_after': self.model.num_trees(),
+            'trees_added': self.model.num_trees() - (trees_before if incremental else 0),
+            'seconds': round(seconds, 4),
+            'full_retrain_seconds': round(full_seconds, 4) if full_seconds else None,
+            'speedup_vs_full': round(full_seconds / seconds, 2) if incremental and full_seconds and seconds > 0 else None,
+            'model_version': self.model_version
+        }
         
-        self.model = lgb.train(
-            params,
-            train_data,
-            num_boost_round=100,
-            valid_sets=[train_data],
-            callbacks=[lgb.early_stopping(stopping_rounds=10), lgb.log_evaluation(period=0)]
-        )
+        logger.info(f"Model retrained successfully in {seconds:.3f}s")
+        return report
+    
+    def copy(self) -> 'RiskPredictor':
+        """
+        Independent copy of this predictor with its own booster
+        
+        Used to update a model without mutating one that is already
+        published to readers.
+        """
+        clone = copy.copy(self)
+        if self.model is not None:
+            clone.model = lgb.Booster(model_str=self.model.model_to_string())
+        clone._row_buffers = threading.local()
+        clone._explanation_cache = OrderedDict()
+        clone._explanation_lock = threading.Lock()
+        return clone
+    
+    def explain_batch(self, features: BatchFeatures) -> np.ndarray:
+        """
+        Per-row TreeSHAP feature contributions for many schools at once
+        
+        Uses LightGBM's native contribution output (``pred_contrib``).
+        Rows already explained under the current model version are served
+        from an LRU cache; only the misses are sent to the booster, in one
+        call.
+        
+        Args:
+            features: List of feature dictionaries, a DataFrame with the
+                feature columns, or a (n, 15) array in ``feature_names`` order
+            
+        Returns:
+            (n, n_features + 1) array; columns follow ``feature_names`` and
+            the last column is the base value. Each row sums to the raw
+            (unclipped) model score.
+        """
+        if self.model is None:
+            raise ValueError("Model not initialized")
         
-        logger.info("Model retrained successfully")
+        matrix = self._feature_matrix(features)
+        n_cols = len(self.feature_names) + 1
+        contributions = np.empty((len(matrix), n_cols), dtype=np.float64)
+        
+        keys = [(self.model_version, row.tobytes()) for row in matrix]
+        missing = []
+        with self._explanation_lock:
+            for i, key in enumerate(keys):
+                cached = self._explanation_cache.get(key)
+                if cached is None:
+                    missing.append(i)
+                else:
+                    self._explanation_cache.move_to_end(key)
+                    contributions[i] = cached
+        
+        if missing:
+            computed = self.model.predict(matrix[missing], pred_contrib=True)
+            contributions[missing] = computed
+            with self._explanation_lock:
+                for i, row in zip(missing, computed):
+                    self._explanation_cache[keys[i]] = row
+                while len(self._explanation_cache) > self.EXPLANATION_CACHE_SIZE:
+                    self._explanation_cache.popitem(last=False)
+        
+        return contributions
+    
+    def top_drivers(self, features: BatchFeatures, top_k: int = 5) -> List[Dict[str, any]]:
+        """
+        Prediction plus the ``top_k`` features driving it, for each row
+        
+        Args:
+            features: Batch input, as for ``explain_batch``
+            top_k: Number of drivers per row, ranked by absolute contribution
+            
+        Returns:
+            One dictionary per row with risk score/level, base value and the
+            ranked drivers (feature, value, contribution)
+        """
+        matrix = self._feature_matrix(features)
+        contributions = self.explain_batch(matrix)
+        feature_contrib = contributions[:, :-1]
+        
+        scores = np.clip(contributions.sum(axis=1), 0, 100)
+        level_codes = np.searchsorted(RISK_THRESHOLDS, scores, side='right')
+        top_k = min(top_k, len(self.feature_names))
+        order = np.argsort(-np.abs(feature_contrib), axis=1)[:, :top_k]
+        
+        rounded = round_scores(scores)
+        results = []
+        for i in range(len(matrix)):
+            results.append({
+                'risk_score': float(rounded[i]),
+                'risk_level': RISK_LEVELS[level_codes[i]],
+                'base_value': round(float(contributions[i, -1]), 4),
+                'top_drivers': [
+                    {
+                        'feature': self.feature_names[j],
+                        'value': float(matrix[i, j]),
+                        'contribution': round(float(feature_contrib[i, j]), 4)
+                    }
+                    for j in order[i]
+                ]
+            })
+        return results
     
     def explain_prediction(self, features: Dict[str, float]) -> Dict[str, any]:
         """
-        Explain a prediction using SHAP-like feature contributions
+        Explain a prediction using TreeSHAP feature contributions
         
         Args:
-            features: Feature dictionary
+            features: Feature dictionary (missing features count as 0)
             
         Returns:
-            Dictionary with prediction and feature contributions
+            Dictionary with prediction, base value and feature contributions
         """
-        prediction = self.predict(features)
+        row = {name: features.get(name, 0) for name in self.feature_names}
+        contributions = self.explain_batch([row])[0]
         importance = self.get_feature_importance()
         
-        # Calculate approximate feature contributions
-        contributions = {}
-        for feature_name in self.feature_names:
-            feature_value = features.get(feature_name, 0)
-            feature_importance = importance.get(feature_name, 0)
-            
-            # Simplified contribution calculation
-            contributions[feature_name] = {
-                'value': feature_value,
-                'importance': round(feature_importance, 2),
-                'contribution': round(feature_importance * 0.01, 2)  # Normalized
+        # Contributions sum to the raw score, so no separate predict call
+        risk_score = float(np.clip(contributions.sum(), 0, 100))
+        prediction = {
+            'risk_score': float(round_scores(risk_score)),
+            'risk_level': self._risk_level(risk_score),
+            'confidence': 0.85
+        }
+        
+        feature_contributions = {}
+        for i, feature_name in enumerate(self.feature_names):
+            feature_contributions[feature_name] = {
+                'value': row[feature_name],
+                'importance': round(importance[feature_name], 2),
+                'contribution': round(float(contributions[i]), 4)
             }
         
         return {
             'prediction': prediction,
-            'feature_contributions': contributions
+            'base_value': round(float(contributions[-1]), 4),
+            'feature_contributions': feature_contributions
         }
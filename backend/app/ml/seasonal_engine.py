@@ -0,0 +1,341 @@
+"""
+Vectorized seasonal demand forecasting engine
+Alternative to per-school Prophet fits: a linear trend plus weekly and
+monthly Fourier terms plus holiday regressors, fitted for every school at
+once as one batched least-squares problem over a (schools x days) matrix
+"""
+
+import logging
+import time
+from dataclasses import dataclass
+from statistics import NormalDist
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from app.core.metrics import observe_stage
+
+from .demand_forecaster import DemandForecaster, TrainManyResult
+
+logger = logging.getLogger(__name__)
+
+# Fourier seasonalities as (name, period in days, order), matching the
+# Prophet configuration in DemandForecaster.train. Yearly seasonality is
+# left out: it is not identifiable from the few months of history used here.
+SEASONALITIES = (('weekly', 7.0, 3), ('monthly', 30.5, 5))
+
+# Schools per block of the masked (missing-data) solve, bounding memory
+_SOLVE_BLOCK = 1024
+
+# Fewest distinct observed days a history needs to be fitted (two weeks, so
+# the weekly terms are seen at least twice)
+MIN_HISTORY_DAYS = 14
+
+_EPOCH = np.datetime64('1970-01-01', 'D')
+
+
+def _to_days(dates) -> np.ndarray:
+    values = np.asarray(dates)
+    if not np.issubdtype(values.dtype, np.datetime64):
+        values = pd.to_datetime(values).values
+    return values.astype('datetime64[D]')
+
+
+class SeasonalDesign:
+    """
+    Design matrix builder shared by every school fitted together
+
+    Columns: intercept, linear trend (0 at ``start``, 1 at ``start +
+    t_scale`` days), the Fourier terms of SEASONALITIES, then one indicator
+    per (holiday, day offset) as Prophet does for holiday windows.
+    """
+
+    def __init__(self, start: np.datetime64, t_scale: float, holidays: pd.DataFrame):
+        self.start = np.datetime64(start, 'D')
+        self.t_scale = max(float(t_scale), 1.0)
+
+        self.holiday_names: List[str] = []
+        self.holiday_dates: List[np.ndarray] = []
+        if not holidays.empty:
+            for name, group in holidays.groupby('holiday', sort=True):
+                ds = _to_days(group['ds'])
+                lower = int(group['lower_window'].min())
+                upper = int(group['upper_window'].max())
+                for offset in range(lower, upper + 1):
+                    self.holiday_names.append(f"{name}_{offset:+d}" if lower or upper else name)
+                    self.holiday_dates.append(ds + np.timedelta64(offset, 'D'))
+
+        self.columns = ['intercept', 'trend']
+        for name, _, order in SEASONALITIES:
+            self.columns += [f"{name}_{fn}{k}" for k in range(1, order + 1) for fn in ('sin', 'cos')]
+        self.columns += self.holiday_names
+
+        self.seasonal_slices = {}
+        position = 2
+        for name, _, order in SEASONALITIES:
+            self.seasonal_slices[name] = slice(position, position + 2 * order)
+            position += 2 * order
+        self.holiday_slice = slice(position, len(self.columns))
+
+    def matrix(self, dates: np.ndarray) -> np.ndarray:
+        """
+        (len(dates), n_columns) design matrix for datetime64[D] dates
+        """
+        day = (dates - _EPOCH).astype(np.float64)
+        parts = [
+            np.ones((len(dates), 1)),
+            ((dates - self.start).astype(np.float64) / self.t_scale)[:, None]
+        ]
+        for _, period, order in SEASONALITIES:
+            angles = 2.0 * np.pi * np.outer(day, np.arange(1, order + 1)) / period
+            # sin/cos interleaved per order, as in the column names
+            parts.append(np.stack([np.sin(angles), np.cos(angles)], axis=2).reshape(len(dates), -1))
+        if self.holiday_dates:
+            parts.append(np.column_stack([
+                np.isin(dates, holiday).astype(np.float64) for holiday in self.holiday_dates
+            ]))
+        return np.hstack(parts)
+
+
+def fit_seasonal_batch(dates: np.ndarray, Y: np.ndarray, design: SeasonalDesign,
+                       ridge: float = 1.0) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Fit every school's coefficients at once
+
+    Solves the ridge-regularized normal equations (X'X + ridge*I) b = X'y
+    for all schools together: a single multi-right-hand-side solve when the
+    matrix is fully observed, otherwise a batched per-school solve over the
+    observed days. The intercept is not penalized; holiday columns never
+    seen in the history get a zero coefficient.
+
+    Args:
+        dates: datetime64[D] dates of the matrix columns
+        Y: (schools, days) demand matrix, NaN where unobserved
+        design: Shared design builder
+        ridge: L2 penalty on all but the intercept
+
+    Returns:
+        (coef (schools, k), residual sigma (schools,), inverse of the
+        penalized Gram matrix of the full design (k, k))
+    """
+    X = design.matrix(dates)
+    penalty = np.full(X.shape[1], ridge)
+    penalty[0] = 0.0
+    gram = X.T @ X + np.diag(penalty)
+    gram_inv = np.linalg.pinv(gram)
+
+    observed = np.isfinite(Y)
+    if observed.all():
+        coef = np.linalg.solve(gram, X.T @ Y.T).T
+    else:
+        coef = np.empty((Y.shape[0], X.shape[1]))
+        Y_filled = np.where(observed, Y, 0.0)
+        for block in range(0, Y.shape[0], _SOLVE_BLOCK):
+            rows = slice(block, block + _SOLVE_BLOCK)
+            weights = observed[rows].astype(np.float64)
+            grams = np.einsum('sd,dk,dl->skl', weights, X, X) + np.diag(penalty)
+            targets = (Y_filled[rows] * weights) @ X
+            coef[rows] = np.linalg.solve(grams, targets[..., None])[..., 0]
+
+    residuals = np.where(observed, Y - coef @ X.T, 0.0)
+    active = np.count_nonzero(np.abs(X).sum(axis=0))
+    dof = np.maximum(observed.sum(axis=1) - active, 1)
+    sigma = np.sqrt((residuals ** 2).sum(axis=1) / dof)
+    return coef, sigma, gram_inv
+
+
+@dataclass
+class SeasonalModel:
+    """
+    One school's fitted seasonal model, with a Prophet-like ``predict``
+    """
+    design: SeasonalDesign
+    coef: np.ndarray
+    sigma: float
+    gram_inv: np.ndarray
+    end: np.datetime64
+    interval_width: float = 0.95
+
+    def predict(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Predictions for the dates in ``df['ds']``
+
+        Returns:
+            DataFrame with ds, trend, one column per seasonality, holidays,
+            yhat and the yhat_lower/yhat_upper prediction interval
+        """
+        dates = _to_days(df['ds'])
+        X = self.design.matrix(dates)
+        contributions = X * self.coef
+
+        yhat = contributions.sum(axis=1)
+        leverage = np.einsum('dk,kl,dl->d', X, self.gram_inv, X)
+        z = NormalDist().inv_cdf(0.5 + self.interval_width / 2)
+        half_width = z * self.sigma * np.sqrt(1.0 + leverage)
+
+        # Trend includes the level, as in Prophet
+        result = pd.DataFrame({
+            'ds': pd.to_datetime(dates),
+            'trend': contributions[:, :2].sum(axis=1)
+        })
+        for name, columns in self.design.seasonal_slices.items():
+            result[name] = contributions[:, columns].sum(axis=1)
+        result['holidays'] = contributions[:, self.design.holiday_slice].sum(axis=1)
+        result['yhat'] = yhat
+        result['yhat_lower'] = yhat - half_width
+        result['yhat_upper'] = yhat + half_width
+        return result
+
+
+class SeasonalForecaster(DemandForecaster):
+    """
+    DemandForecaster backed by the vectorized seasonal engine
+
+    Same interface and forecast format as the Prophet forecaster. Intervals
+    are closed-form least-squares prediction intervals, so ``interval_mode``
+    does not change the result.
+    """
+
+    ENGINE = 'seasonal'
+    BATCH_FIT = True
+    RIDGE = 1.0
+
+    def train(self, school_id: str, historical_data: Optional[pd.DataFrame] = None):
+        """
+        Fit the seasonal model for a single school
+        """
+        if historical_data is None:
+            historical_data = self._generate_historical_data(school_id)
+        self._check_history(historical_data)
+        self.school_id = school_id
+        start = time.perf_counter()
+        self.model = self._fit_many({school_id: historical_data}, self._create_holiday_dataframe())[school_id]
+        self.last_cold_fit_seconds = time.perf_counter() - start
+        observe_stage('seasonal_fit', self.last_cold_fit_seconds)
+        self.history = self._slide_window(historical_data)
+
+    @classmethod
+    def train_many(cls, school_ids: Sequence[str], histories: Optional[Dict[str, pd.DataFrame]] = None,
+                   max_workers: Optional[int] = None, store=None) -> TrainManyResult:
+        """
+        Fit every school in one batched least-squares solve
+
+        Same contract as ``DemandForecaster.train_many``; ``max_workers`` is
+        ignored because the fit is a single vectorized computation. Each
+        history is checked first (see ``_check_history``); rejected schools
+        go to ``failures`` and the rest are fitted together.
+        """
+        histories = dict(histories or {})
+        start = time.perf_counter()
+
+        result = TrainManyResult(workers=1)
+        valid = {}
+        for school_id in school_ids:
+            try:
+                if histories.get(school_id) is None:
+                    histories[school_id] = cls()._generate_historical_data(school_id)
+                cls._check_history(histories[school_id])
+            except Exception as e:
+                logger.warning(f"Training failed for school {school_id}: {e}")
+                result.failures[school_id] = f"{type(e).__name__}: {e}"
+            else:
+                valid[school_id] = histories[school_id]
+
+        models = cls._fit_many(valid, cls()._create_holiday_dataframe()) if valid else {}
+
+        result.wall_seconds = time.perf_counter() - start
+        observe_stage('seasonal_fit', result.wall_seconds)
+        per_school = result.wall_seconds / max(len(models), 1)
+        for school_id, model in models.items():
+            forecaster = cls()
+            forecaster.school_id = school_id
+            forecaster.model = model
+            # Trimmed to the window only if the school is updated
+            forecaster.history = histories[school_id]
+            result.forecasters[school_id] = forecaster
+            result.timings[school_id] = per_school
+            if store is not None:
+                store.put(school_id, histories[school_id], forecaster)
+
+        logger.info(f"Fitted {len(models)} seasonal forecasters in {result.wall_seconds:.2f}s")
+        return result
+
+    @staticmethod
+    def _check_history(history: pd.DataFrame):
+        """
+        Reject a history the batched fit cannot use
+
+        Raises:
+            ValueError: If it lacks 'ds'/'y' columns or has fewer than
+                MIN_HISTORY_DAYS distinct days with an observed 'y'
+        """
+        missing = {'ds', 'y'} - set(history.columns)
+        if missing:
+            raise ValueError(f"History is missing columns: {sorted(missing)}")
+        observed = np.isfinite(pd.to_numeric(history['y'], errors='coerce').to_numpy(dtype=np.float64))
+        days = len(np.unique(_to_days(history['ds'])[observed]))
+        if days < MIN_HISTORY_DAYS:
+            raise ValueError(f"History has {days} observed days, need at least {MIN_HISTORY_DAYS}")
+
+    @classmethod
+    def _fit_many(cls, histories: Dict[str, pd.DataFrame], holidays: pd.DataFrame) -> Dict[str, SeasonalModel]:
+        """
+        Align histories on one daily grid and fit them together
+        """
+        school_ids = list(histories)
+        days = {school_id: _to_days(history['ds']) for school_id, history in histories.items()}
+        start = min(d.min() for d in days.values())
+        end = max(d.max() for d in days.values())
+        grid = np.arange(start, end + np.timedelta64(1, 'D'))
+
+        Y = np.full((len(school_ids), len(grid)), np.nan)
+        for row, school_id in enumerate(school_ids):
+            Y[row, (days[school_id] - start).astype(np.int64)] = histories[school_id]['y'].to_numpy(dtype=np.float64)
+
+        design = SeasonalDesign(start, (end - start).astype(np.float64), holidays)
+        coef, sigma, gram_inv = fit_seasonal_batch(grid, Y, design, ridge=cls.RIDGE)
+
+        return {
+            school_id: SeasonalModel(design, coef[row], float(sigma[row]), gram_inv, days[school_id].max())
+            for row, school_id in enumerate(school_ids)
+        }
+
+    def forecast(self, days: int = 7, interval_mode: str = 'full',
+                 uncertainty_samples: Optional[int] = None, lookback: int = 0) -> pd.DataFrame:
+        """
+        Generate demand forecast for specified number of days
+        """
+        if self.model is None:
+            raise ValueError("Model not trained. Call train() first.")
+        if interval_mode not in self.INTERVAL_MODES:
+            raise ValueError(f"Unknown interval mode: {interval_mode}")
+        return self._format_forecast(self._predict_horizon(days, 0, lookback))
+
+    def _predict_horizon(self, days: int, uncertainty_samples: int, lookback: int = 0) -> pd.DataFrame:
+        future = pd.DataFrame({
+            'ds': pd.to_datetime(np.arange(self.model.end + 1 - lookback, self.model.end + 1 + days))
+        })
+        start = time.perf_counter()
+        forecast = self.model.predict(future)
+        observe_stage('seasonal_predict', time.perf_counter() - start)
+        return forecast
+
+    def save_model(self, path: str):
+        """
+        Save the fitted model; it is a few small arrays, pickled with joblib
+        """
+        self._save_joblib(path)
+
+    def update_with_new_data(self, new_data: pd.DataFrame,
+                             history: Optional[pd.DataFrame] = None) -> Dict[str, any]:
+        """
+        Refit on the slid history window (the fit is cheap enough to redo,
+        so there is nothing to warm-start)
+        """
+        if self.model is None:
+            raise ValueError("Model not trained. Call train() first.")
+        window = self._slide_window(self._previous_history(history), new_data)
+        start = time.perf_counter()
+        self.train(self.school_id, window)
+        return self._update_report(new_data, window, time.perf_counter() - start, warm_start=False)
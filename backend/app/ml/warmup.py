@@ -0,0 +1,224 @@
+"""
+Startup warm-up and readiness
+Loads the risk model and runs representative predictions through the
+inference pools, so the first real request does not pay for lazy
+initialization (pool threads, spawned forecast workers, Stan, the holiday
+calendar, the materialized forecast table), and tracks whether this
+process is ready to take traffic
+"""
+
+import asyncio
+import logging
+import time
+from datetime import datetime
+from typing import Callable, Dict, Optional, Sequence
+
+import numpy as np
+
+from app.core.metrics import capture_stages
+
+from .executor import InferenceExecutor
+from .forecasting import refresh_materialized_forecasts, warm_forecast_worker
+from .registry import ModelRegistry
+from .risk_predictor import RiskPredictor
+from .synthetic import generate_features
+
+logger = logging.getLogger(__name__)
+
+# Feature rows come from their own seed, distinct from the training data
+WARMUP_SEED = 7919
+
+STARTING = 'starting'
+WARMING = 'warming'
+READY = 'ready'
+FAILED = 'failed'
+
+
+def _untimed(fn: Callable, *args, **kwargs):
+    """
+    Call ``fn`` without recording its ML stage timings, so warm-up calls do
+    not skew the latency histograms
+    """
+    with capture_stages():
+        return fn(*args, **kwargs)
+
+
+def warm_predictor(predictor: RiskPredictor, batch_sizes: Sequence[int]) -> Dict[str, float]:
+    """
+    Score synthetic rows through the single-row and batch paths
+
+    Args:
+        predictor: Predictor to warm
+        batch_sizes: Batch sizes to run through ``predict_batch_columnar``
+
+    Returns:
+        Seconds per call, keyed like ``predict_batch[n=64]``
+    """
+    features = generate_features(max(batch_sizes, default=1), seed=WARMUP_SEED)
+    matrix = features[predictor.feature_names].to_numpy(dtype=np.float64)
+
+    timings = {}
+    start = time.perf_counter()
+    predictor.predict(dict(zip(predictor.feature_names, matrix[0])))
+    timings['predict'] = time.perf_counter() - start
+    for n in batch_sizes:
+        start = time.perf_counter()
+        predictor.predict_batch_columnar(matrix[:n])
+        timings[f'predict_batch[n={n}]'] = time.perf_counter() - start
+    return timings
+
+
+class Readiness:
+    """
+    Warm-up progress of this process
+
+    The process is ready once the risk model is loaded and warm-up has
+    finished; until then ``/ready`` answers 503 so load balancers keep
+    traffic away from it. A failed warm-up is retried with exponential
+    back-off, so a transient cause (e.g. a model file that lands a moment
+    later) does not keep the process out of service until a restart.
+    """
+
+    def __init__(self):
+        self.status = STARTING
+        self.started_at: Optional[datetime] = None
+        self.finished_at: Optional[datetime] = None
+        self.seconds: Optional[float] = None
+        self.steps: Dict[str, Dict[str, any]] = {}
+        self.error: Optional[str] = None
+        self.attempts = 0
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def ready(self) -> bool:
+        return self.status == READY
+
+    async def warm_up(self, registry: ModelRegistry, executor: InferenceExecutor,
+                      batch_sizes: Sequence[int], forecast_workers: bool = True,
+                      model_path: Optional[str] = None, cache_dir: Optional[str] = None,
+                      retry_delay: float = 1.0, max_retry_delay: float = 60.0):
+        """
+        Load the risk model, warm every worker of the inference pools, then
+        mark the process ready
+
+        Each LightGBM thread scores the synthetic rows at every batch size;
+        with ``forecast_workers``, every Prophet worker process is spawned
+        and runs one throwaway fit and forecast. Step timings are the
+        slowest worker's. After a failure the status stays ``failed`` while
+        waiting to retry; the wait starts at ``retry_delay`` and doubles up
+        to ``max_retry_delay``.
+
+        Args:
+            registry: Registry to load the risk model into
+            executor: Started inference executor
+            batch_sizes: Risk model batch sizes to warm
+            forecast_workers: Also warm the forecast process pool
+            model_path: Risk model file, passed to ``registry.load``
+            cache_dir: Directory for the cached default model
+            retry_delay: Seconds before the first retry
+            max_retry_delay: Upper bound on the wait between retries
+        """
+        delay = retry_delay
+        while not await self._attempt(registry, executor, batch_sizes, forecast_workers, model_path, cache_dir):
+            logger.warning(f"Warm-up attempt {self.attempts} failed; retrying in {delay:.1f}s")
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, max_retry_delay)
+
+    async def _attempt(self, registry: ModelRegistry, executor: InferenceExecutor,
+                       batch_sizes: Sequence[int], forecast_workers: bool,
+                       model_path: Optional[str], cache_dir: Optional[str]) -> bool:
+        """
+        One warm-up run; returns whether it succeeded
+        """
+        self.status = WARMING
+        self.attempts += 1
+        self.steps = {}
+        self.started_at = datetime.now()
+        start = time.perf_counter()
+        try:
+            handle = await asyncio.to_thread(registry.load, model_path, cache_dir)
+            self.steps['load_model'] = {
+                'seconds': round(time.perf_counter() - start, 4),
+                'version': handle.version
+            }
+
+            predictor = handle.predictor
+            await self._step('risk_model', [
+                executor.lightgbm.run(_untimed, warm_predictor, predictor, list(batch_sizes))
+                for _ in range(executor.lightgbm.max_workers)
+            ])
+
+            if forecast_workers:
+                results = await self._step('forecast_workers', [
+                    executor.prophet.run(_untimed, warm_forecast_worker)
+                    for _ in range(executor.prophet.max_workers)
+                ], key='seconds')
+                self.steps['forecast_workers']['pids'] = sorted({r['pid'] for r in results})
+
+            step_start = time.perf_counter()
+            table = await asyncio.to_thread(refresh_materialized_forecasts)
+            self.steps['forecast_table'] = {
+                'seconds': round(time.perf_counter() - step_start, 4),
+                'schools': len(table) if table is not None else 0
+            }
+        except Exception as e:
+            self.status = FAILED
+            self.error = f"{type(e).__name__}: {e}"
+            logger.exception("Warm-up failed; the process will report not ready")
+            return False
+        else:
+            self.status = READY
+            self.error = None
+            logger.info(f"Warm-up finished in {time.perf_counter() - start:.2f}s")
+            return True
+        finally:
+            self.finished_at = datetime.now()
+            self.seconds = round(time.perf_counter() - start, 4)
+
+    async def _step(self, name: str, calls: list, key: Optional[str] = None) -> list:
+        """
+        Await one warm-up call per worker and record the step's timings
+        """
+        step_start = time.perf_counter()
+        results = await asyncio.gather(*calls)
+        timings = [r[key] if key else r for r in results]
+        self.steps[name] = {
+            'seconds': round(time.perf_counter() - step_start, 4),
+            'workers': len(results),
+            'calls': {call: round(max(t[call] for t in timings), 4) for call in timings[0]}
+        }
+        return results
+
+    def start(self, *args, **kwargs):
+        """
+        Run ``warm_up`` in the background; arguments are passed through
+        """
+        if self._task is None:
+            self._task = asyncio.create_task(self.warm_up(*args, **kwargs))
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def report(self) -> Dict[str, any]:
+        """
+        Status and measured warm-up timings
+        """
+        return {
+            'status': self.status,
+            'started_at': self.started_at.isoformat() if self.started_at else None,
+            'finished_at': self.finished_at.isoformat() if self.finished_at else None,
+            'seconds': self.seconds,
+            'attempts': self.attempts,
+            'steps': self.steps,
+            'error': self.error
+        }
+
+
+# Process-wide readiness, driven by the application lifespan
+readiness = Readiness()
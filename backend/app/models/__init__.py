@@ -0,0 +1,7 @@
+"""
+Database table models
+"""
+
+from .school import FEATURE_COLUMNS, SchoolFeatures
+
+__all__ = ['FEATURE_COLUMNS', 'SchoolFeatures']
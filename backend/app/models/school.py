@@ -0,0 +1,64 @@
+"""
+School table models
+"""
+
+from datetime import datetime
+
+from sqlalchemy import DateTime, Float, Index, Integer, String, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import Base
+
+# Feature columns of school_features, in RiskPredictor.feature_names order
+FEATURE_COLUMNS = (
+    'enrollment',
+    'current_attendance',
+    'capacity',
+    'avg_meal_uptake',
+    'attendance_rate',
+    'capacity_utilization',
+    'days_since_inspection',
+    'previous_shortage_count',
+    'budget_utilization_rate',
+    'supply_chain_delay_days',
+    'weather_risk_score',
+    'seasonal_factor',
+    'hostel_attached',
+    'enrollment_trend_7d',
+    'attendance_trend_7d'
+)
+
+
+class SchoolFeatures(Base):
+    """
+    Latest risk model feature vector of each school
+
+    One row per school, overwritten by the daily refresh. Rows are read a
+    district or block at a time, so (district, block) is indexed.
+    """
+    __tablename__ = 'school_features'
+    __table_args__ = (
+        Index('ix_school_features_district_block', 'district', 'block'),
+    )
+
+    school_id: Mapped[str] = mapped_column(String(32), primary_key=True)  # UDISE code
+    district: Mapped[str] = mapped_column(String(64))
+    block: Mapped[str] = mapped_column(String(64))
+
+    enrollment: Mapped[int] = mapped_column(Integer)
+    current_attendance: Mapped[int] = mapped_column(Integer)
+    capacity: Mapped[int] = mapped_column(Integer)
+    avg_meal_uptake: Mapped[int] = mapped_column(Integer)
+    attendance_rate: Mapped[float] = mapped_column(Float)
+    capacity_utilization: Mapped[float] = mapped_column(Float)
+    days_since_inspection: Mapped[int] = mapped_column(Integer)
+    previous_shortage_count: Mapped[int] = mapped_column(Integer)
+    budget_utilization_rate: Mapped[float] = mapped_column(Float)
+    supply_chain_delay_days: Mapped[int] = mapped_column(Integer)
+    weather_risk_score: Mapped[float] = mapped_column(Float)
+    seasonal_factor: Mapped[float] = mapped_column(Float)
+    hostel_attached: Mapped[int] = mapped_column(Integer)
+    enrollment_trend_7d: Mapped[float] = mapped_column(Float)
+    attendance_trend_7d: Mapped[float] = mapped_column(Float)
+
+    updated_at: Mapped[datetime] = mapped_column(DateTime, server_default=func.now(), onupdate=func.now())
@@ -0,0 +1,96 @@
+"""
+School data access
+Bulk reads of school feature vectors as NumPy columns, for scoring whole
+districts and blocks without building ORM objects
+"""
+
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Optional, Sequence, Tuple
+
+import numpy as np
+from sqlalchemy import Select, bindparam, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.school import FEATURE_COLUMNS, SchoolFeatures
+
+
+@dataclass
+class FeatureColumns:
+    """
+    Feature vectors of many schools, column-oriented
+
+    Attributes:
+        school_ids: (n,) school ids, sorted
+        blocks: (n,) block of each school
+        matrix: (n, n_features) float64 in ``feature_names`` order, ready
+            for ``RiskPredictor.predict_batch_columnar``
+        feature_names: Column order of ``matrix``
+    """
+    school_ids: np.ndarray
+    blocks: np.ndarray
+    matrix: np.ndarray
+    feature_names: Tuple[str, ...]
+
+    def __len__(self) -> int:
+        return len(self.school_ids)
+
+
+@lru_cache(maxsize=16)
+def _feature_query(feature_names: Tuple[str, ...], by_block: bool) -> Select:
+    """
+    SELECT of a district's (or block's) feature rows
+
+    Built once per column order and filter, with bound parameters, so the
+    SQL text never changes and the driver reuses its prepared statement.
+    """
+    table = SchoolFeatures.__table__
+    query = (
+        select(table.c.school_id, table.c.block, *(table.c[name] for name in feature_names))
+        .where(table.c.district == bindparam('district'))
+        .order_by(table.c.school_id)
+    )
+    if by_block:
+        query = query.where(table.c.block == bindparam('block'))
+    return query
+
+
+async def fetch_feature_columns(session: AsyncSession, district: str, block: Optional[str] = None,
+                                feature_names: Sequence[str] = FEATURE_COLUMNS) -> FeatureColumns:
+    """
+    Feature vectors of every school in a district, or in one of its blocks
+
+    One query and one round-trip whatever the number of schools; rows are
+    transposed straight into arrays.
+
+    Args:
+        session: Database session
+        district: District name
+        block: Optional block within the district
+        feature_names: Column order of the returned matrix (the predictor's
+            ``feature_names``)
+
+    Returns:
+        FeatureColumns, empty if no school matches
+    """
+    feature_names = tuple(feature_names)
+    params = {'district': district}
+    if block is not None:
+        params['block'] = block
+
+    result = await session.execute(_feature_query(feature_names, block is not None), params)
+    rows = result.all()
+
+    matrix = np.empty((len(rows), len(feature_names)), dtype=np.float64)
+    if not rows:
+        return FeatureColumns(np.empty(0, dtype=object), np.empty(0, dtype=object), matrix, feature_names)
+
+    columns = list(zip(*rows))
+    for i, values in enumerate(columns[2:]):
+        matrix[:, i] = values
+    return FeatureColumns(
+        school_ids=np.array(columns[0], dtype=object),
+        blocks=np.array(columns[1], dtype=object),
+        matrix=matrix,
+        feature_names=feature_names
+    )
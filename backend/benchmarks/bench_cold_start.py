@@ -0,0 +1,57 @@
+"""
+Worker start-up benchmark for the default RiskPredictor model
+
+Each measurement runs in a fresh interpreter, like a newly spawned worker,
+and times ``RiskPredictor()`` construction (module imports excluded):
+
+- ``uncached``: cache disabled, trains the default booster from scratch
+- ``cold cache``: empty cache directory, trains once and writes the artifact
+- ``warm cache``: loads the cached artifact written by the previous step
+
+Usage (from the backend directory):
+    python -m benchmarks.bench_cold_start --runs 5
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+import tempfile
+
+_CHILD = """
+import time, warnings
+warnings.filterwarnings('ignore')
+from app.ml.risk_predictor import RiskPredictor
+start = time.perf_counter()
+RiskPredictor(cache_dir={cache_dir!r}, use_cache={use_cache!r})
+print(time.perf_counter() - start)
+"""
+
+
+def _construct_seconds(cache_dir: str, use_cache: bool) -> float:
+    code = _CHILD.format(cache_dir=cache_dir, use_cache=use_cache)
+    output = subprocess.run(
+        [sys.executable, '-c', code], check=True, capture_output=True, text=True
+    ).stdout
+    return float(output.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--runs', type=int, default=5)
+    args = parser.parse_args()
+
+    timings = {'uncached': [], 'cold cache': [], 'warm cache': []}
+    for _ in range(args.runs):
+        with tempfile.TemporaryDirectory() as cache_dir:
+            timings['uncached'].append(_construct_seconds(cache_dir, use_cache=False))
+            timings['cold cache'].append(_construct_seconds(cache_dir, use_cache=True))
+            timings['warm cache'].append(_construct_seconds(cache_dir, use_cache=True))
+
+    print(f"{'scenario':<12}{'median (ms)':>14}{'min (ms)':>12}")
+    for name, values in timings.items():
+        print(f"{name:<12}{statistics.median(values) * 1e3:>14.1f}{min(values) * 1e3:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
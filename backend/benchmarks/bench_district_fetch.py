@@ -0,0 +1,95 @@
+"""
+District feature fetch benchmark: one query per school vs. one bulk query
+
+Seeds a SQLite stand-in (or the database at ``--url``) with ``--schools``
+synthetic schools, then loads one district's feature vectors two ways:
+a SELECT per school, as a naive per-school scoring loop would, and the
+single columnar ``fetch_feature_columns`` query. Both are scored and
+checked against the predictor run directly on the generated features.
+
+Usage (from the backend directory):
+    python -m benchmarks.bench_district_fetch --schools 20000 --districts 4
+"""
+
+import argparse
+import asyncio
+import logging
+import tempfile
+import time
+import warnings
+from pathlib import Path
+
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from app.db.init_db import seed_synthetic_features
+from app.db.session import create_engine
+from app.ml.risk_predictor import RiskPredictor
+from app.ml.synthetic import generate_features
+from app.models import SchoolFeatures
+from app.services.school_service import fetch_feature_columns
+
+
+async def run(url: str, n_schools: int, districts: int, repeats: int):
+    engine = create_engine(url)
+    seeded = await seed_synthetic_features(n_schools, districts, engine=engine)
+    print(f"Seeded {seeded['schools']} schools in {seeded['seconds']}s")
+
+    predictor = RiskPredictor()
+    Session = async_sessionmaker(engine, expire_on_commit=False)
+    district = 'DIST-00'
+
+    async with Session() as session:
+        ids = (await session.execute(
+            select(SchoolFeatures.school_id).where(SchoolFeatures.district == district)
+        )).scalars().all()
+
+        start = time.perf_counter()
+        for school_id in ids:
+            await session.get(SchoolFeatures, school_id)
+        per_school = time.perf_counter() - start
+
+        bulk_times = []
+        for _ in range(repeats):
+            start = time.perf_counter()
+            columns = await fetch_feature_columns(session, district, feature_names=predictor.feature_names)
+            bulk_times.append(time.perf_counter() - start)
+    await engine.dispose()
+
+    start = time.perf_counter()
+    scores = predictor.predict_batch_columnar(columns.matrix).risk_scores
+    score_seconds = time.perf_counter() - start
+
+    rows = [int(school_id.split('-')[1]) for school_id in columns.school_ids]
+    expected = predictor.predict_batch_columnar(generate_features(n_schools).iloc[rows]).risk_scores
+    bulk = float(np.median(bulk_times))
+
+    print(f"District {district}: {len(columns)} schools")
+    print(f"{'fetch':<28}{'ms':>10}")
+    print(f"{'one query per school':<28}{per_school * 1e3:>10.1f}")
+    print(f"{'bulk columnar query':<28}{bulk * 1e3:>10.1f}")
+    print(f"{'score (one model call)':<28}{score_seconds * 1e3:>10.1f}")
+    print(f"bulk speedup: {per_school / bulk:.1f}x; "
+          f"max score difference vs direct: {np.abs(scores - expected).max():.4f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--schools', type=int, default=20000)
+    parser.add_argument('--districts', type=int, default=4)
+    parser.add_argument('--repeats', type=int, default=5)
+    parser.add_argument('--url', default=None,
+                        help="Async database URL (default: a temporary SQLite file); its school_features table is replaced")
+    args = parser.parse_args()
+
+    warnings.filterwarnings('ignore')
+    logging.disable(logging.WARNING)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        url = args.url or f"sqlite+aiosqlite:///{Path(tmp) / 'bench.db'}"
+        asyncio.run(run(url, args.schools, args.districts, args.repeats))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""
+Demand forecast latency vs. interval quality benchmark
+
+Fits one school's forecaster, then times ``DemandForecaster.forecast`` for
+7- and 30-day horizons in each interval mode, next to the previous path
+that predicted the whole history plus horizon with full sampling:
+
+- ``legacy``: ``make_future_dataframe`` + ``predict`` over history and horizon
+- ``full``: horizon-only predict, Prophet's default 1000 draws
+- ``reduced``: horizon-only predict, ``--samples`` draws
+- ``analytic``: horizon-only predict, closed-form interval, no sampling
+
+Interval quality is the mean absolute difference (in meals) of each mode's
+bounds from a reference run with ``--reference-samples`` draws, and the
+ratio of its mean interval width to the reference width.
+
+Usage (from the backend directory):
+    python -m benchmarks.bench_forecast_modes --runs 10
+"""
+
+import argparse
+import logging
+import statistics
+import time
+import warnings
+
+import numpy as np
+
+from app.ml.demand_forecaster import DemandForecaster
+
+
+def _legacy_forecast(forecaster: DemandForecaster, days: int):
+    future = forecaster.model.make_future_dataframe(periods=days)
+    forecast = forecaster.model.predict(future)
+    return forecast[['ds', 'yhat', 'yhat_lower', 'yhat_upper']].tail(days)
+
+
+def _time(fn, runs: int):
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        result = fn()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--runs', type=int, default=10)
+    parser.add_argument('--samples', type=int, default=DemandForecaster.REDUCED_UNCERTAINTY_SAMPLES)
+    parser.add_argument('--reference-samples', type=int, default=10000)
+    parser.add_argument('--school', default='SCH-BENCH')
+    args = parser.parse_args()
+
+    warnings.filterwarnings('ignore')
+    logging.disable(logging.WARNING)
+
+    forecaster = DemandForecaster()
+    forecaster.train(args.school)
+
+    print(f"{'horizon':>7}  {'mode':<9}{'median (ms)':>12}{'speedup':>9}{'bound MAE':>11}{'width ratio':>13}")
+    for days in (7, 30):
+        np.random.seed(0)
+        reference = forecaster.forecast(days, interval_mode='reduced', uncertainty_samples=args.reference_samples)
+        ref_lower = reference['lower_bound'].to_numpy(dtype=float)
+        ref_upper = reference['upper_bound'].to_numpy(dtype=float)
+        ref_width = np.mean(ref_upper - ref_lower)
+
+        legacy_seconds, _ = _time(lambda: _legacy_forecast(forecaster, days), args.runs)
+        print(f"{days:>7}  {'legacy':<9}{legacy_seconds * 1e3:>12.1f}{1.0:>9.1f}{'-':>11}{'-':>13}")
+
+        for mode in DemandForecaster.INTERVAL_MODES:
+            seconds, result = _time(
+                lambda: forecaster.forecast(days, interval_mode=mode, uncertainty_samples=args.samples),
+                args.runs
+            )
+            lower = result['lower_bound'].to_numpy(dtype=float)
+            upper = result['upper_bound'].to_numpy(dtype=float)
+            mae = (np.mean(np.abs(lower - ref_lower)) + np.mean(np.abs(upper - ref_upper))) / 2
+            width_ratio = np.mean(upper - lower) / ref_width if ref_width else float('nan')
+            print(f"{days:>7}  {mode:<9}{seconds * 1e3:>12.1f}{legacy_seconds / seconds:>9.1f}"
+                  f"{mae:>11.1f}{width_ratio:>13.2f}")
+
+
+if __name__ == "__main__":
+    main()
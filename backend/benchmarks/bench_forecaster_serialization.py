@@ -0,0 +1,82 @@
+"""
+Forecaster serialization benchmark: joblib vs. the compact format
+
+Fits ``--schools`` Prophet forecasters, stores them three ways and reports
+disk footprint, time to load every school, and time to load plus produce
+a first 7-day forecast for every school (which includes the lazy Prophet
+reconstruction of the compact formats):
+
+- ``joblib``: one pickle of the whole Prophet object per school
+- ``compact``: one compact file per school (``save_model``)
+- ``pack``: all schools in one memory-mapped pack file
+
+Usage (from the backend directory):
+    python -m benchmarks.bench_forecaster_serialization --schools 50
+"""
+
+import argparse
+import logging
+import os
+import tempfile
+import time
+import warnings
+from pathlib import Path
+
+from app.ml.demand_forecaster import DemandForecaster
+from app.ml.forecaster_pack import ForecasterPack, write_pack
+
+
+def _timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return time.perf_counter() - start, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--schools', type=int, default=50)
+    parser.add_argument('--workers', type=int, default=None)
+    args = parser.parse_args()
+
+    warnings.filterwarnings('ignore')
+    logging.disable(logging.WARNING)
+
+    school_ids = [f"SCH-{i:05d}" for i in range(args.schools)]
+    forecasters = DemandForecaster.train_many(school_ids, max_workers=args.workers).forecasters
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        for school_id, forecaster in forecasters.items():
+            forecaster._save_joblib(str(tmp / f"{school_id}.joblib"))
+            forecaster.save_model(str(tmp / f"{school_id}.model"))
+        pack_path = tmp / 'forecasters.pack'
+        write_pack(forecasters, str(pack_path))
+
+        def load_files(suffix):
+            return [DemandForecaster(str(tmp / f"{school_id}{suffix}")) for school_id in school_ids]
+
+        def load_pack():
+            pack = ForecasterPack(str(pack_path))
+            return [pack.get(school_id) for school_id in school_ids]
+
+        def forecast_all(load):
+            return [forecaster.forecast(7, interval_mode='analytic') for forecaster in load()]
+
+        scenarios = {
+            'joblib': (lambda: load_files('.joblib'),
+                       sum(os.path.getsize(tmp / f"{s}.joblib") for s in school_ids)),
+            'compact': (lambda: load_files('.model'),
+                        sum(os.path.getsize(tmp / f"{s}.model") for s in school_ids)),
+            'pack': (load_pack, os.path.getsize(pack_path))
+        }
+
+        print(f"{'format':<9}{'disk (KB)':>11}{'per school (KB)':>17}{'load all (ms)':>15}{'load+forecast (ms)':>20}")
+        for name, (load, size) in scenarios.items():
+            load_seconds, _ = _timed(load)
+            forecast_seconds, _ = _timed(lambda: forecast_all(load))
+            print(f"{name:<9}{size / 1024:>11.1f}{size / 1024 / len(school_ids):>17.2f}"
+                  f"{load_seconds * 1e3:>15.1f}{forecast_seconds * 1e3:>20.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""
+Incremental forecaster update benchmark: warm-started vs. cold refits
+
+Trains ``--schools`` Prophet forecasters on history ending ``--days`` days
+ago, then feeds the remaining days one at a time through
+``update_with_new_data`` (warm-started from the previous parameters). Each
+update is compared with a cold fit on the same history window: fit time,
+speedup, and the largest difference between the two 7-day forecasts.
+
+Usage (from the backend directory):
+    python -m benchmarks.bench_incremental_update --schools 10 --days 7
+"""
+
+import argparse
+import logging
+import warnings
+
+import numpy as np
+
+from app.ml.demand_forecaster import DemandForecaster
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--schools', type=int, default=10)
+    parser.add_argument('--days', type=int, default=7)
+    args = parser.parse_args()
+
+    warnings.filterwarnings('ignore')
+    logging.disable(logging.WARNING)
+
+    warm_seconds, cold_seconds, max_diffs = [], [], []
+    for i in range(args.schools):
+        school_id = f"SCH-{i:05d}"
+        forecaster = DemandForecaster()
+        history = forecaster._generate_historical_data(school_id, DemandForecaster.HISTORY_WINDOW_DAYS + args.days)
+        forecaster.train(school_id, history.iloc[:-args.days])
+
+        for day in range(args.days, 0, -1):
+            new_row = history.iloc[[-day]]
+            report = forecaster.update_with_new_data(new_row)
+            warm_seconds.append(report['seconds'])
+
+            cold = DemandForecaster()
+            cold.train(school_id, forecaster.history)
+            cold_seconds.append(cold.last_cold_fit_seconds)
+
+            warm_yhat = forecaster.forecast(7, interval_mode='analytic')['predicted_demand'].to_numpy()
+            cold_yhat = cold.forecast(7, interval_mode='analytic')['predicted_demand'].to_numpy()
+            max_diffs.append(np.abs(warm_yhat - cold_yhat).max())
+
+    warm, cold = np.array(warm_seconds), np.array(cold_seconds)
+    print(f"{args.schools} school(s) x {args.days} daily update(s), "
+          f"{DemandForecaster.HISTORY_WINDOW_DAYS}-day window")
+    print(f"{'fit':<12}{'mean (ms)':>11}{'p50 (ms)':>10}{'p95 (ms)':>10}")
+    for name, seconds in (('cold', cold), ('warm start', warm)):
+        print(f"{name:<12}{seconds.mean() * 1e3:>11.1f}{np.median(seconds) * 1e3:>10.1f}"
+              f"{np.percentile(seconds, 95) * 1e3:>10.1f}")
+    print(f"speedup: {cold.sum() / warm.sum():.2f}x; "
+          f"max 7-day forecast difference vs cold: {max(max_diffs):.2f} meals")
+
+
+if __name__ == "__main__":
+    main()
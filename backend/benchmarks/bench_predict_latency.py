@@ -0,0 +1,70 @@
+"""
+Single-row inference latency benchmark for RiskPredictor.predict
+
+Compares the array fast path used by ``RiskPredictor.predict`` with the
+previous one-row DataFrame path and reports p50/p99 latencies.
+
+Usage (from the backend directory):
+    python -m benchmarks.bench_predict_latency --iterations 5000
+"""
+
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from app.ml.risk_predictor import RiskPredictor
+
+
+def _dataframe_predict(predictor: RiskPredictor, features: dict) -> float:
+    """Previous implementation: one-row DataFrame re-indexed by feature_names"""
+    feature_df = pd.DataFrame([features])[predictor.feature_names]
+    return float(np.clip(predictor.model.predict(feature_df)[0], 0, 100))
+
+
+def _time_calls(fn, samples, iterations: int) -> np.ndarray:
+    timings = np.empty(iterations, dtype=np.float64)
+    for i in range(iterations):
+        features = samples[i % len(samples)]
+        start = time.perf_counter()
+        fn(features)
+        timings[i] = time.perf_counter() - start
+    return timings * 1e6  # microseconds
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--iterations', type=int, default=5000)
+    parser.add_argument('--warmup', type=int, default=200)
+    args = parser.parse_args()
+
+    predictor = RiskPredictor()
+    samples = predictor._generate_synthetic_training_data(256).to_dict('records')
+
+    # Both paths must agree before their timings mean anything
+    for features in samples[:32]:
+        fast = predictor.predict(features)['risk_score']
+        slow = round(_dataframe_predict(predictor, features), 2)
+        assert abs(fast - slow) < 1e-9, (fast, slow)
+
+    paths = {
+        'dataframe': lambda f: _dataframe_predict(predictor, f),
+        'fast_path': predictor.predict,
+    }
+
+    print(f"{'path':<12}{'p50 (us)':>12}{'p99 (us)':>12}{'mean (us)':>12}")
+    results = {}
+    for name, fn in paths.items():
+        _time_calls(fn, samples, args.warmup)
+        timings = _time_calls(fn, samples, args.iterations)
+        results[name] = timings
+        print(f"{name:<12}{np.percentile(timings, 50):>12.1f}"
+              f"{np.percentile(timings, 99):>12.1f}{timings.mean():>12.1f}")
+
+    speedup = np.percentile(results['dataframe'], 50) / np.percentile(results['fast_path'], 50)
+    print(f"p50 speedup: {speedup:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+Seasonal engine vs. Prophet: accuracy and fit wall time
+
+Generates ``--history`` + ``--holdout`` days of synthetic demand per school,
+fits both engines on the first ``--history`` days with ``train_many`` and
+scores their ``forecast(holdout)`` against the held-out days:
+
+- MAE / MAPE of predicted_demand (MAPE over weekdays, where demand is not
+  near zero)
+- coverage: share of held-out days inside [lower_bound, upper_bound]
+
+The seasonal engine is additionally timed on ``--scale-schools`` schools to
+show how the batched fit grows with the fleet size.
+
+Usage (from the backend directory):
+    python -m benchmarks.bench_seasonal_engine --schools 16 --scale-schools 10000
+"""
+
+import argparse
+import logging
+import time
+import warnings
+
+import numpy as np
+
+from app.ml.demand_forecaster import DemandForecaster
+from app.ml.seasonal_engine import SeasonalForecaster
+
+
+def _split_histories(school_ids, history_days: int, holdout_days: int):
+    generator = DemandForecaster()
+    train, test = {}, {}
+    for school_id in school_ids:
+        history = generator._generate_historical_data(school_id, days=history_days + holdout_days)
+        train[school_id] = history.iloc[:history_days].reset_index(drop=True)
+        test[school_id] = history.iloc[history_days:].reset_index(drop=True)
+    return train, test
+
+
+def _score(forecasters, test, holdout_days: int):
+    errors, pct_errors, covered = [], [], []
+    for school_id, forecaster in forecasters.items():
+        forecast = forecaster.forecast(holdout_days)
+        actual = test[school_id]['y'].to_numpy()
+        predicted = forecast['predicted_demand'].to_numpy(dtype=float)
+        errors.append(np.abs(actual - predicted))
+        weekday = test[school_id]['ds'].dt.weekday.to_numpy() < 5
+        pct_errors.append(np.abs(actual - predicted)[weekday] / actual[weekday])
+        covered.append((actual >= forecast['lower_bound'].to_numpy())
+                       & (actual <= forecast['upper_bound'].to_numpy()))
+    return (float(np.mean(np.concatenate(errors))),
+            float(np.mean(np.concatenate(pct_errors)) * 100),
+            float(np.mean(np.concatenate(covered)) * 100))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--schools', type=int, default=16)
+    parser.add_argument('--scale-schools', type=int, default=10000)
+    parser.add_argument('--history', type=int, default=90)
+    parser.add_argument('--holdout', type=int, default=14)
+    parser.add_argument('--workers', type=int, default=None, help="Prophet worker processes")
+    args = parser.parse_args()
+
+    warnings.filterwarnings('ignore')
+    logging.disable(logging.WARNING)
+
+    school_ids = [f"SCH-{i:05d}" for i in range(args.schools)]
+    train, test = _split_histories(school_ids, args.history, args.holdout)
+
+    print(f"{'engine':<10}{'schools':>8}{'workers':>9}{'fit wall (s)':>14}{'MAE':>8}{'MAPE %':>8}{'coverage %':>12}")
+    for engine in (DemandForecaster, SeasonalForecaster):
+        result = engine.train_many(school_ids, train, max_workers=args.workers)
+        mae, mape, coverage = _score(result.forecasters, test, args.holdout)
+        print(f"{engine.ENGINE:<10}{len(school_ids):>8}{result.workers:>9}{result.wall_seconds:>14.2f}"
+              f"{mae:>8.1f}{mape:>8.1f}{coverage:>12.1f}")
+
+    if args.scale_schools:
+        scale_ids = [f"SCH-{i:05d}" for i in range(args.scale_schools)]
+        scale_train, _ = _split_histories(scale_ids, args.history, args.holdout)
+        start = time.perf_counter()
+        SeasonalForecaster.train_many(scale_ids, scale_train)
+        print(f"{SeasonalForecaster.ENGINE:<10}{len(scale_ids):>8}{1:>9}{time.perf_counter() - start:>14.2f}"
+              f"{'-':>8}{'-':>8}{'-':>12}")
+
+
+if __name__ == "__main__":
+    main()
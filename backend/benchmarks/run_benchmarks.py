@@ -0,0 +1,225 @@
+"""
+ML hot-path benchmark suite with a stored baseline
+
+Times RiskPredictor.predict / predict_batch / predict_batch_columnar /
+explain_prediction at several batch sizes and DemandForecaster.train /
+forecast / forecast_with_capacity / detect_anomalies at several history
+lengths and horizons, on deterministic synthetic data. Results are written
+as JSON; with ``--compare`` each case's median is checked against the
+baseline file and the run exits non-zero if any case is slower by more
+than ``--threshold``.
+
+Baselines are machine-specific: regenerate ``baseline.json`` with
+``--update-baseline`` on the machine that runs the comparison.
+
+Usage (from the backend directory):
+    python -m benchmarks.run_benchmarks --compare benchmarks/baseline.json
+    python -m benchmarks.run_benchmarks --filter risk. --output results.json
+    python -m benchmarks.run_benchmarks --update-baseline
+"""
+
+import argparse
+import itertools
+import json
+import logging
+import platform
+import sys
+import time
+import warnings
+from dataclasses import dataclass
+from datetime import date, datetime, timezone
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+
+DEFAULT_BASELINE_PATH = Path(__file__).resolve().parent / 'baseline.json'
+
+# Fixed data window, so results do not drift with the calendar
+HISTORY_END = date(2026, 1, 1)
+
+BATCH_SIZES = (1, 64, 1024)
+COLUMNAR_BATCH_SIZES = (64, 1024, 16384)
+HISTORY_DAYS = (90, 365)
+FORECAST_DAYS = (7, 30)
+
+
+@dataclass
+class Case:
+    """
+    One timed call
+
+    Attributes:
+        name: Stable case id, e.g. ``risk.predict_batch[n=64]``
+        fn: The call to time
+        min_repeats: Fewest timed calls
+        min_seconds: Keep repeating until this much time is measured
+    """
+    name: str
+    fn: Callable[[], object]
+    min_repeats: int = 5
+    min_seconds: float = 0.2
+
+
+def _risk_cases() -> List[Case]:
+    from app.ml.risk_predictor import RiskPredictor
+    from app.ml.synthetic import generate_features
+
+    predictor = RiskPredictor()
+    rows = generate_features(max(COLUMNAR_BATCH_SIZES), seed=7)
+    records = rows.to_dict('records')
+    matrix = rows[predictor.feature_names].to_numpy(dtype=np.float64)
+
+    # Single-row calls cycle through more distinct rows than the
+    # explanation cache holds, so they measure the uncached path
+    rotation = itertools.cycle(records)
+    cases = [
+        Case('risk.predict', lambda: predictor.predict(next(rotation))),
+        Case('risk.explain_prediction', lambda: predictor.explain_prediction(next(rotation)))
+    ]
+    for n in BATCH_SIZES:
+        cases.append(Case(f'risk.predict_batch[n={n}]', lambda n=n: predictor.predict_batch(records[:n])))
+    for n in COLUMNAR_BATCH_SIZES:
+        cases.append(Case(f'risk.predict_batch_columnar[n={n}]',
+                          lambda n=n: predictor.predict_batch_columnar(matrix[:n])))
+    return cases
+
+
+def _demand_cases() -> List[Case]:
+    from app.ml.demand_forecaster import DemandForecaster
+    from app.ml.synthetic import demand_history
+
+    cases = []
+    for days in HISTORY_DAYS:
+        history = demand_history('SCH-BENCH', days, end=HISTORY_END)
+        forecaster = DemandForecaster()
+        forecaster.train('SCH-BENCH', history)
+
+        cases.append(Case(f'demand.train[history={days}]',
+                          lambda history=history: DemandForecaster().train('SCH-BENCH', history),
+                          min_repeats=3, min_seconds=1.0))
+        for horizon in FORECAST_DAYS:
+            cases.append(Case(f'demand.forecast[history={days},days={horizon}]',
+                              lambda f=forecaster, horizon=horizon: f.forecast(horizon)))
+            cases.append(Case(f'demand.forecast_analytic[history={days},days={horizon}]',
+                              lambda f=forecaster, horizon=horizon: f.forecast(horizon, interval_mode='analytic')))
+        cases.append(Case(f'demand.forecast_with_capacity[history={days},days=7]',
+                          lambda f=forecaster: f.forecast_with_capacity(7, 380)))
+
+        # Actuals for the final 30 history days
+        recent = history.iloc[-30:]
+        actual, dates = recent['y'].tolist(), recent['ds'].dt.to_pydatetime().tolist()
+        cases.append(Case(f'demand.detect_anomalies[history={days},n=30]',
+                          lambda f=forecaster, actual=actual, dates=dates: f.detect_anomalies(actual, dates)))
+    return cases
+
+
+def run_case(case: Case) -> Dict[str, float]:
+    case.fn()  # warm-up
+    timings = []
+    start = time.perf_counter()
+    while len(timings) < case.min_repeats or time.perf_counter() - start < case.min_seconds:
+        t0 = time.perf_counter()
+        case.fn()
+        timings.append(time.perf_counter() - t0)
+    timings = np.array(timings) * 1e3
+    return {
+        'median_ms': round(float(np.median(timings)), 4),
+        'p95_ms': round(float(np.percentile(timings, 95)), 4),
+        'min_ms': round(float(timings.min()), 4),
+        'repeats': len(timings)
+    }
+
+
+def _environment() -> Dict[str, str]:
+    import lightgbm
+    import pandas
+    import prophet
+
+    return {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'numpy': np.__version__,
+        'pandas': pandas.__version__,
+        'lightgbm': lightgbm.__version__,
+        'prophet': prophet.__version__
+    }
+
+
+def compare(results: Dict[str, Dict], baseline: Dict[str, Dict], threshold: float) -> List[Dict]:
+    """
+    Per-case comparison of medians against the baseline
+
+    Returns:
+        One row per case present in both, with the ratio and whether it
+        regressed by more than ``threshold`` (e.g. 0.25 = 25% slower)
+    """
+    rows = []
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+        ratio = result['median_ms'] / baseline[name]['median_ms']
+        rows.append({
+            'case': name,
+            'baseline_ms': baseline[name]['median_ms'],
+            'median_ms': result['median_ms'],
+            'ratio': round(ratio, 3),
+            'regressed': ratio > 1 + threshold
+        })
+    return rows
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--filter', default=None, help="Only run cases whose name contains this")
+    parser.add_argument('--output', default=None, help="Write results JSON here")
+    parser.add_argument('--compare', default=None, help="Baseline JSON to compare against")
+    parser.add_argument('--threshold', type=float, default=0.25,
+                        help="Allowed slowdown of a case's median vs the baseline (0.25 = 25%%)")
+    parser.add_argument('--update-baseline', action='store_true',
+                        help=f"Write the results to {DEFAULT_BASELINE_PATH.name}")
+    args = parser.parse_args(argv)
+
+    warnings.filterwarnings('ignore')
+    logging.disable(logging.WARNING)
+
+    cases = _risk_cases() + _demand_cases()
+    if args.filter:
+        cases = [case for case in cases if args.filter in case.name]
+
+    results = {}
+    print(f"{'case':<55}{'median (ms)':>13}{'p95 (ms)':>11}{'runs':>6}")
+    for case in cases:
+        results[case.name] = run_case(case)
+        r = results[case.name]
+        print(f"{case.name:<55}{r['median_ms']:>13.3f}{r['p95_ms']:>11.3f}{r['repeats']:>6}")
+
+    report = {
+        'generated_at': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'environment': _environment(),
+        'results': results
+    }
+    outputs = [args.output] if args.output else []
+    if args.update_baseline:
+        outputs.append(str(DEFAULT_BASELINE_PATH))
+    for path in outputs:
+        Path(path).write_text(json.dumps(report, indent=2) + '\n')
+        print(f"Results written to {path}")
+
+    if args.compare:
+        baseline = json.loads(Path(args.compare).read_text())['results']
+        rows = compare(results, baseline, args.threshold)
+        regressions = [row for row in rows if row['regressed']]
+        print(f"\n{'case':<55}{'baseline (ms)':>15}{'now (ms)':>11}{'ratio':>8}")
+        for row in rows:
+            flag = '  REGRESSED' if row['regressed'] else ''
+            print(f"{row['case']:<55}{row['baseline_ms']:>15.3f}{row['median_ms']:>11.3f}{row['ratio']:>8.2f}{flag}")
+        if regressions:
+            print(f"\n{len(regressions)} case(s) regressed by more than {args.threshold:.0%}")
+            return 1
+        print(f"\nNo case regressed by more than {args.threshold:.0%}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -3,16 +3,27 @@ Mid-Day Meal Digital Twin System - FastAPI Backend
 Main application entry point
 """
 
+import asyncio
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import JSONResponse, PlainTextResponse
 from contextlib import asynccontextmanager
 
-# Import routers (to be implemented)
-# from app.api.v1.api import api_router
-# from app.core.config import settings
-# from app.db.session import engine
-# from app.db.base import Base
+from app.api.v1.api import api_router
+from app.core.config import settings
+from app.core.metrics import RequestMetricsMiddleware, metrics_registry
+from app.db.init_db import init_db
+from app.db.session import check_db, close_db
+from app.ml.executor import inference_executor
+from app.ml.feature_store import DEFAULT_FEATURE_STORE_PATH, feature_store
+from app.ml.forecasting import watch_materialized_forecasts
+from app.ml.registry import model_registry
+from app.ml.retraining import retrain_worker
+from app.ml.warmup import FAILED, readiness
+
+FEATURE_STORE_PATH = settings.FEATURE_STORE_PATH or str(DEFAULT_FEATURE_STORE_PATH)
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
@@ -21,13 +32,50 @@ async def lifespan(app: FastAPI):
     """
     # Startup: Initialize database, load ML models, connect to Redis
     print("🚀 Starting Mid-Day Meal Digital Twin System...")
-    # await init_db()
-    # await load_ml_models()
+    try:
+        await init_db()
+    except Exception as e:
+        # Served without the database; DB-backed endpoints answer 503
+        print(f"⚠️  Database initialization failed: {e}")
+    try:
+        await asyncio.to_thread(feature_store.restore, FEATURE_STORE_PATH)
+    except Exception as e:
+        print(f"⚠️  Feature store snapshot not restored: {e}")
+    feature_store.start_snapshots(FEATURE_STORE_PATH, settings.FEATURE_STORE_SNAPSHOT_INTERVAL)
+    inference_executor.configure(
+        settings.INFERENCE_THREADS, settings.INFERENCE_THREAD_QUEUE,
+        settings.FORECAST_PROCESSES, settings.FORECAST_PROCESS_QUEUE
+    )
+    inference_executor.start()
+    # Model load and warm-up run in the background; /health answers
+    # meanwhile and /ready reports 503 until they finish
+    readiness.start(
+        model_registry, inference_executor, settings.WARMUP_BATCH_SIZES,
+        forecast_workers=settings.WARMUP_FORECAST_WORKERS,
+        model_path=settings.MODEL_PATH, cache_dir=settings.MODEL_CACHE_DIR,
+        retry_delay=settings.WARMUP_RETRY_DELAY, max_retry_delay=settings.WARMUP_MAX_RETRY_DELAY
+    )
+    model_registry.start_watching(settings.MODEL_WATCH_INTERVAL)
+    forecast_table_watch = asyncio.create_task(
+        watch_materialized_forecasts(settings.FORECAST_TABLE_WATCH_INTERVAL)
+    )
     # await connect_redis()
     yield
     # Shutdown: Close connections, cleanup resources
     print("🛑 Shutting down gracefully...")
-    # await close_db_connections()
+    await readiness.stop()
+    await feature_store.stop_snapshots()
+    if feature_store.updated_at is not None:
+        await asyncio.to_thread(feature_store.save, FEATURE_STORE_PATH)
+    await model_registry.stop_watching()
+    forecast_table_watch.cancel()
+    try:
+        await forecast_table_watch
+    except asyncio.CancelledError:
+        pass
+    inference_executor.shutdown()
+    retrain_worker.shutdown()
+    await close_db()
     # await close_redis_connection()
 
 app = FastAPI(
@@ -52,8 +100,11 @@ app.add_middleware(
 # GZip Compression
 app.add_middleware(GZipMiddleware, minimum_size=1000)
 
+# Per-route request latency (outermost, so it includes the other middleware)
+app.add_middleware(RequestMetricsMiddleware)
+
 # Include API routers
-# app.include_router(api_router, prefix="/api/v1")
+app.include_router(api_router, prefix=settings.API_V1_PREFIX)
 
 @app.get("/")
 async def root():
@@ -67,14 +118,44 @@ async def root():
 
 @app.get("/health")
 async def health_check():
-    """Health check endpoint for monitoring"""
+    """
+    Liveness check endpoint for monitoring
+
+    Answers as soon as the process is up, with the actual state of its
+    components; use /ready to decide whether to route traffic here.
+    """
+    handle = model_registry.current() if model_registry.loaded else None
     return {
-        "status": "healthy",
-        "database": "connected",
-        "redis": "connected",
-        "ml_model": "loaded"
+        "status": "degraded" if readiness.status == FAILED else "healthy",
+        "ready": readiness.ready,
+        "warmup": readiness.status,
+        "database": "connected" if await check_db() else "unavailable",
+        "redis": "not_configured",
+        "ml_model": {
+            "loaded": handle is not None,
+            "version": handle.version if handle else None,
+            "loaded_at": handle.loaded_at.isoformat() if handle else None
+        }
     }
 
+@app.get("/ready")
+async def readiness_check():
+    """
+    Readiness check for load balancers
+
+    503 until the risk model is loaded and every inference worker has been
+    warmed up, then 200; both carry the measured warm-up timings.
+    """
+    report = readiness.report()
+    if not (readiness.ready and model_registry.loaded):
+        return JSONResponse(status_code=503, content=report, headers={"Retry-After": "5"})
+    return report
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    """Prometheus scrape endpoint"""
+    return PlainTextResponse(metrics_registry.render(), media_type="text/plain; version=0.0.4")
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(
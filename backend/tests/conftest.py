@@ -0,0 +1,47 @@
+import pytest
+from fastapi import FastAPI
+
+from app.api.v1.endpoints import predictions
+from app.ml.registry import ModelRegistry
+from app.ml.risk_predictor import RiskPredictor
+from app.ml.synthetic import generate_features, risk_scores
+
+
+@pytest.fixture(scope='session')
+def risk_predictor(tmp_path_factory):
+    """
+    Default risk model, trained once per test session
+    """
+    return RiskPredictor(cache_dir=str(tmp_path_factory.mktemp('model_cache')))
+
+
+@pytest.fixture(scope='session')
+def retrained_predictor(risk_predictor):
+    """
+    A second model version: the default model boosted on a few more rows
+    """
+    features = generate_features(200, seed=11)
+    predictor = risk_predictor.copy()
+    predictor.retrain(features, risk_scores(features, seed=11), incremental=True, max_new_trees=5)
+    return predictor
+
+
+@pytest.fixture
+def risk_app(risk_predictor):
+    """
+    App serving only the ML router, with the default model published
+    """
+    handle = ModelRegistry().publish(risk_predictor)
+    app = FastAPI()
+    app.include_router(predictions.router)
+    app.dependency_overrides[predictions.get_risk_model] = lambda: handle
+    return app
+
+
+@pytest.fixture
+def risk_requests():
+    """
+    Valid /predict-risk request bodies
+    """
+    features = generate_features(16, seed=5)
+    return [{'school_id': f"SCH-{i}", **row} for i, row in enumerate(features.to_dict('records'))]
@@ -0,0 +1,138 @@
+import asyncio
+
+import httpx
+import pytest
+
+from app.api.v1.endpoints import predictions
+from app.ml.batching import PredictionCoalescer
+from app.ml.executor import ExecutorSaturatedError
+from app.ml.prediction_cache import PredictionCache
+from app.ml.registry import ModelRegistry
+from app.ml.risk_predictor import RiskPredictor
+from app.ml.synthetic import generate_features
+
+
+def _rows(n, seed=21):
+    return generate_features(n, seed=seed).to_dict('records')
+
+
+class CountingBatch:
+    """
+    Batch function recording the size of every call
+    """
+
+    def __init__(self, fail_on=None, error=ValueError):
+        self.sizes = []
+        self.fail_on = fail_on
+        self.error = error
+
+    async def __call__(self, model, features_list):
+        self.sizes.append(len(features_list))
+        if any(row is self.fail_on for row in features_list):
+            raise self.error('bad row')
+        return model.predictor.predict_batch(features_list)
+
+
+def test_concurrent_requests_share_one_model_call(risk_app, risk_requests, risk_predictor, monkeypatch):
+    handle = ModelRegistry().publish(risk_predictor)
+
+    async def current_model():
+        return handle
+
+    calls = []
+    predict_batch_columnar = RiskPredictor.predict_batch_columnar
+
+    def counting(self, features):
+        calls.append(len(features))
+        return predict_batch_columnar(self, features)
+
+    risk_app.dependency_overrides[predictions.get_risk_model] = current_model
+    # Patched on the class: an instance patch leaves a bound method behind on undo
+    monkeypatch.setattr(RiskPredictor, 'predict_batch_columnar', counting)
+    monkeypatch.setattr(predictions, 'prediction_cache', PredictionCache(maxsize=0))
+    monkeypatch.setattr(predictions, 'risk_coalescer',
+                        PredictionCoalescer(predictions._score_batch, max_batch_size=64, max_wait_ms=50))
+
+    async def run():
+        transport = httpx.ASGITransport(app=risk_app)
+        async with httpx.AsyncClient(transport=transport, base_url='http://test') as client:
+            return await asyncio.gather(*(client.post('/predict-risk', json=body) for body in risk_requests))
+
+    responses = asyncio.run(run())
+
+    assert [r.status_code for r in responses] == [200] * len(risk_requests)
+    assert calls == [len(risk_requests)]
+    expected = predict_batch_columnar(risk_predictor, generate_features(len(risk_requests), seed=5)).to_records()
+    assert [r.json()['risk_score'] for r in responses] == [e['risk_score'] for e in expected]
+    assert [r.json()['school_id'] for r in responses] == [body['school_id'] for body in risk_requests]
+
+
+def test_bad_row_fails_only_its_own_request(risk_predictor):
+    handle = ModelRegistry().publish(risk_predictor)
+    rows = _rows(5)
+    bad = {name: value for name, value in rows[2].items() if name != 'enrollment'}
+    rows[2] = bad
+    batch_fn = CountingBatch(fail_on=bad, error=KeyError)
+    coalescer = PredictionCoalescer(batch_fn, max_batch_size=8, max_wait_ms=50)
+
+    async def run():
+        return await asyncio.gather(*(coalescer.submit(handle, row) for row in rows), return_exceptions=True)
+
+    results = asyncio.run(run())
+
+    assert isinstance(results[2], KeyError)
+    good = [result for i, result in enumerate(results) if i != 2]
+    assert good == risk_predictor.predict_batch([row for i, row in enumerate(rows) if i != 2])
+    assert batch_fn.sizes == [5, 1, 1, 1, 1, 1]
+    assert coalescer.stats()['split_batches_total'] == 1
+
+
+def test_saturated_batch_is_not_retried_row_by_row(risk_predictor):
+    handle = ModelRegistry().publish(risk_predictor)
+    rows = _rows(3)
+    batch_fn = CountingBatch(fail_on=rows[0], error=lambda _: ExecutorSaturatedError('lightgbm'))
+    coalescer = PredictionCoalescer(batch_fn, max_batch_size=8)
+
+    async def run():
+        return await asyncio.gather(*(coalescer.submit(handle, row) for row in rows), return_exceptions=True)
+
+    results = asyncio.run(run())
+
+    assert all(isinstance(result, ExecutorSaturatedError) for result in results)
+    assert batch_fn.sizes == [3]
+
+
+def test_partial_batch_flushes_after_max_wait(risk_predictor):
+    handle = ModelRegistry().publish(risk_predictor)
+    rows = _rows(7)
+    batch_fn = CountingBatch()
+    coalescer = PredictionCoalescer(batch_fn, max_batch_size=64, max_wait_ms=30)
+
+    async def run():
+        gate = asyncio.Event()
+
+        async def held_then_counted(model, features_list):
+            if not batch_fn.sizes:
+                batch_fn.sizes.append(len(features_list))
+                await gate.wait()
+                return model.predictor.predict_batch(features_list)
+            return await batch_fn(model, features_list)
+
+        coalescer.batch_fn = held_then_counted
+        first = asyncio.ensure_future(coalescer.submit(handle, rows[0]))
+        while not batch_fn.sizes:
+            await asyncio.sleep(0)
+        # A batch is in flight, so these wait up to max_wait instead of the next tick
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        rest = await asyncio.gather(*(coalescer.submit(handle, row) for row in rows[1:]))
+        elapsed = loop.time() - started
+        assert not first.done()
+        gate.set()
+        return [await first, *rest], elapsed
+
+    results, elapsed = asyncio.run(run())
+
+    assert batch_fn.sizes == [1, 6]
+    assert elapsed >= 0.025
+    assert results == risk_predictor.predict_batch(rows)
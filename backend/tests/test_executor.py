@@ -0,0 +1,82 @@
+import asyncio
+import threading
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.api.v1.endpoints import predictions
+from app.ml.executor import ExecutorSaturatedError, InferencePool
+
+
+def _wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "condition not met in time"
+        time.sleep(0.005)
+
+
+def _occupy(pool: InferencePool, count: int) -> threading.Event:
+    """
+    Start ``count`` calls that block on the pool until the returned event is set
+    """
+    release = threading.Event()
+
+    def block():
+        asyncio.run(pool.run(release.wait, 5))
+
+    for _ in range(count):
+        threading.Thread(target=block, daemon=True).start()
+    _wait_for(lambda: pool.stats()['running'] + pool.stats()['queued'] == count)
+    return release
+
+
+def test_pool_rejects_beyond_workers_plus_queue():
+    pool = InferencePool('test', 'thread', max_workers=1, max_queue=1)
+    release = _occupy(pool, 2)
+    try:
+        assert pool.stats()['running'] == 1 and pool.stats()['queued'] == 1
+        with pytest.raises(ExecutorSaturatedError) as error:
+            asyncio.run(pool.run(sum, [1, 2]))
+        assert error.value.pool == 'test'
+        assert error.value.retry_after == 1
+        assert pool.rejected == 1
+    finally:
+        release.set()
+    _wait_for(lambda: pool.completed == 2)
+    assert asyncio.run(pool.run(sum, [1, 2])) == 3
+    pool.shutdown()
+
+
+def test_failed_submit_releases_its_permit():
+    pool = InferencePool('test', 'thread', max_workers=1, max_queue=0)
+    pool.start()
+    pool._executor.shutdown()
+
+    for _ in range(3):
+        with pytest.raises(RuntimeError):
+            asyncio.run(pool.run(sum, [1, 2]))
+    assert pool.stats()['running'] == 0
+    assert pool.rejected == 0
+
+
+def test_saturated_pool_answers_503_until_it_drains(risk_app, risk_requests, monkeypatch):
+    pool = InferencePool('lightgbm', 'thread', max_workers=1, max_queue=0)
+    monkeypatch.setattr(predictions.inference_executor, 'lightgbm', pool)
+    body = {'predictions': risk_requests[:2]}
+
+    with TestClient(risk_app) as client:
+        release = _occupy(pool, 1)
+        response = client.post('/batch-predict-risk', json=body)
+        assert response.status_code == 503
+        assert response.headers['Retry-After'] == '1'
+        assert response.json()['detail'] == "Inference pool 'lightgbm' is saturated"
+
+        release.set()
+        _wait_for(lambda: pool.stats()['running'] == 0)
+        response = client.post('/batch-predict-risk', json=body)
+
+    assert response.status_code == 200
+    assert response.json()['count'] == 2
+    assert pool.stats()['rejected'] == 1
+    pool.shutdown()
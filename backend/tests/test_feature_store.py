@@ -0,0 +1,197 @@
+import random
+from datetime import date, timedelta
+
+import numpy as np
+import pytest
+
+from app.ml.feature_store import WINDOW_DAYS, FeatureStore
+from app.ml.risk_predictor import FEATURE_NAMES
+
+START = date(2026, 1, 1)
+AS_OF = date(2026, 6, 1)
+INSPECTION = date(2025, 12, 1)
+ENROLLMENT = 400
+CAPACITY = 380
+
+
+class ReferenceSchool:
+    """
+    Recomputes a school's derived features from its full event lists
+    """
+
+    def __init__(self):
+        self.enrollment = ENROLLMENT
+        self.attendance = []  # (day, present, enrollment)
+        self.meals = []  # (day, meals_served)
+
+    def record_attendance(self, day, present, enrolled=None):
+        if self.attendance and day < self.attendance[-1][0]:
+            return False
+        if enrolled is not None:
+            self.enrollment = enrolled
+        if self.attendance and day == self.attendance[-1][0]:
+            self.attendance.pop()
+        self.attendance.append((day, present, self.enrollment))
+        return True
+
+    def record_meals(self, day, meals_served):
+        if self.meals and day < self.meals[-1][0]:
+            return False
+        if self.meals and day == self.meals[-1][0]:
+            self.meals.pop()
+        self.meals.append((day, meals_served))
+        return True
+
+    def features(self):
+        expected = {'days_since_inspection': (AS_OF - INSPECTION).days, 'enrollment': self.enrollment}
+        if self.attendance:
+            window = self.attendance[-WINDOW_DAYS:]
+            present = [a[1] for a in window]
+            enrolled = [a[2] for a in window]
+            expected['current_attendance'] = present[-1]
+            expected['attendance_trend_7d'] = (present[-1] - present[0]) / present[0]
+            expected['enrollment_trend_7d'] = (enrolled[-1] - enrolled[0]) / enrolled[0]
+            expected['attendance_rate'] = present[-1] / self.enrollment
+        if self.meals:
+            uptake = float(np.mean([m[1] for m in self.meals[-WINDOW_DAYS:]]))
+            expected['avg_meal_uptake'] = uptake
+            expected['capacity_utilization'] = min(uptake / CAPACITY, 1.0)
+        return expected
+
+
+def _replay(store, n_schools=40, seed=1):
+    """
+    Feed random event streams (gaps, same-day corrections, stale events,
+    enrollment changes) into ``store`` and a reference per school
+    """
+    rng = random.Random(seed)
+    reference = {}
+    for i in range(n_schools):
+        school_id = f"S{i}"
+        store.set_profile(school_id, last_inspection=INSPECTION, enrollment=ENROLLMENT,
+                          capacity=CAPACITY, hostel_attached=1)
+        school = reference[school_id] = ReferenceSchool()
+
+        attendance_day = meal_day = START
+        for _ in range(rng.randint(1, 3 * WINDOW_DAYS)):
+            attendance_day += timedelta(days=rng.choice([1, 1, 1, 3]))
+            enrolled = rng.choice([None, None, rng.randint(380, 420)])
+            present = rng.randint(200, 400)
+            assert store.record_attendance(school_id, attendance_day, present, enrolled)
+            school.record_attendance(attendance_day, present, enrolled)
+            if rng.random() < 0.2:
+                present = rng.randint(200, 400)
+                assert store.record_attendance(school_id, attendance_day, present)
+                school.record_attendance(attendance_day, present)
+
+            meal_day += timedelta(days=rng.choice([1, 1, 2]))
+            meals = rng.randint(150, 420)
+            assert store.record_meals(school_id, meal_day, meals)
+            school.record_meals(meal_day, meals)
+            if rng.random() < 0.2:
+                meals = rng.randint(150, 420)
+                assert store.record_meals(school_id, meal_day, meals)
+                school.record_meals(meal_day, meals)
+
+        stale = START - timedelta(days=1)
+        assert not store.record_attendance(school_id, stale, 1, 1)
+        assert not store.record_meals(school_id, stale, 1)
+    return reference
+
+
+def _assert_matches(store, reference):
+    for school_id, school in reference.items():
+        features = store.get(school_id, as_of=AS_OF)
+        for name, value in school.features().items():
+            assert features[name] == pytest.approx(value, abs=1e-9), (school_id, name)
+
+
+def test_incremental_features_match_recomputation():
+    store = FeatureStore(capacity=4)
+    reference = _replay(store)
+
+    assert len(store) == len(reference)
+    assert store.stats()['capacity'] == 64
+    _assert_matches(store, reference)
+
+    # The running meal sum must equal the ring it summarizes after evictions
+    np.testing.assert_allclose(store.meal_sum[:len(store)], store.meal_ring[:len(store)].sum(axis=1))
+
+
+def test_first_event_has_zero_trend():
+    store = FeatureStore()
+    store.record_attendance('S1', START, 300, 400)
+
+    features = store.get('S1', as_of=AS_OF)
+    assert features['attendance_trend_7d'] == 0.0
+    assert features['attendance_rate'] == 0.75
+    assert features['avg_meal_uptake'] is None
+    assert features['days_since_inspection'] is None
+
+
+def test_oldest_and_trend():
+    assert FeatureStore._oldest(0, 1) == 0
+    assert FeatureStore._oldest(2, WINDOW_DAYS) == 3
+    assert FeatureStore._oldest(5, 3) == 3
+
+    ring = np.array([0.0, 100.0, 150.0, 0, 0, 0, 0])
+    assert FeatureStore._trend(ring, 1, 2) == 0.5
+    assert FeatureStore._trend(ring, 0, 2) == 0.0
+
+
+def test_profile_rejects_derived_features():
+    with pytest.raises(ValueError, match='attendance_rate'):
+        FeatureStore().set_profile('S1', attendance_rate=0.9)
+
+
+def test_feature_matrix_order_and_unknown_ids():
+    store = FeatureStore()
+    reference = _replay(store, n_schools=3)
+
+    names = list(reversed(FEATURE_NAMES))
+    matrix, found = store.feature_matrix(['S2', 'missing', 'S0'], feature_names=names, as_of=AS_OF)
+
+    assert found.tolist() == [True, False, True]
+    assert matrix.shape == (2, len(names))
+    column = names.index('current_attendance')
+    assert matrix[:, column].tolist() == [reference['S2'].attendance[-1][1], reference['S0'].attendance[-1][1]]
+
+
+def test_snapshot_round_trip(tmp_path):
+    path = tmp_path / 'feature_store.npz'
+    store = FeatureStore(capacity=4)
+    reference = _replay(store)
+
+    summary = store.save(str(path))
+    assert summary['schools'] == len(reference)
+
+    loaded = FeatureStore.load(str(path))
+    ids = list(reference)
+    np.testing.assert_array_equal(loaded.feature_matrix(ids, as_of=AS_OF)[0],
+                                  store.feature_matrix(ids, as_of=AS_OF)[0])
+
+    # Updates after loading continue the saved rolling windows
+    later = AS_OF + timedelta(days=1)
+    for target in (store, loaded):
+        target.record_attendance('S3', later, 333, 410)
+        target.record_meals('S3', later, 300)
+    reference['S3'].record_attendance(later, 333, 410)
+    reference['S3'].record_meals(later, 300)
+    _assert_matches(loaded, reference)
+
+    restored = FeatureStore()
+    assert restored.restore(str(path))
+    assert len(restored) == len(reference)
+    assert not FeatureStore().restore(str(tmp_path / 'missing.npz'))
+
+
+def test_load_rejects_other_snapshot_versions(tmp_path):
+    path = tmp_path / 'feature_store.npz'
+    FeatureStore().save(str(path))
+    with np.load(path) as data:
+        arrays = dict(data)
+    arrays['version'] = np.array(0)
+    np.savez(path, **arrays)
+
+    with pytest.raises(ValueError, match='Incompatible'):
+        FeatureStore.load(str(path))
@@ -0,0 +1,60 @@
+from pathlib import Path
+
+from app.ml.demand_forecaster import DemandForecaster
+from app.ml.forecaster_cache import ForecasterCache, history_hash
+from app.ml.seasonal_engine import SeasonalForecaster
+
+
+def test_put_keeps_other_engines_models(tmp_path):
+    cache = ForecasterCache(cache_dir=str(tmp_path), forecaster_cls=SeasonalForecaster)
+    forecaster = SeasonalForecaster()
+    history = forecaster._generate_historical_data('S1')
+    school_dir = cache._school_dir('S1')
+    school_dir.mkdir(parents=True)
+    prophet_model = school_dir / f"0123456789abcdef.{DemandForecaster.ENGINE}.model"
+    prophet_model.write_bytes(b'prophet')
+
+    cache.get_or_train('S1', history)
+    first = cache._disk_path('S1', history_hash(history))
+    assert first.exists()
+    cache.get_or_train('S1', history.iloc[:-1])
+
+    assert prophet_model.exists()
+    assert not first.exists()
+    assert len(list(school_dir.glob(f'*.{SeasonalForecaster.ENGINE}.model'))) == 1
+
+
+def test_put_survives_disk_errors(tmp_path, monkeypatch):
+    cache = ForecasterCache(cache_dir=str(tmp_path), forecaster_cls=SeasonalForecaster)
+    forecaster = SeasonalForecaster()
+    history = forecaster._generate_historical_data('S1')
+    forecaster.train('S1', history)
+
+    def disk_full(path):
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        Path(path).write_bytes(b'partial')
+        raise OSError(28, 'No space left on device')
+
+    monkeypatch.setattr(forecaster, 'save_model', disk_full)
+    cache.put('S1', history, forecaster)
+
+    assert list(tmp_path.rglob('*.tmp')) == []
+    assert cache.get('S1', history) is forecaster
+    assert cache.stats()['memory_hits'] == 1
+
+
+def test_train_many_stores_generated_history_once(tmp_path, monkeypatch):
+    generated = []
+    generate = DemandForecaster._generate_historical_data
+
+    def counting(self, school_id, *args, **kwargs):
+        generated.append(school_id)
+        return generate(self, school_id, *args, **kwargs)
+
+    monkeypatch.setattr(DemandForecaster, '_generate_historical_data', counting)
+    cache = ForecasterCache(cache_dir=str(tmp_path))
+    result = DemandForecaster.train_many(['S1'], max_workers=1, store=cache)
+
+    assert generated == ['S1']
+    history = generate(DemandForecaster(), 'S1')
+    assert cache.get('S1', history) is result.forecasters['S1']
@@ -0,0 +1,52 @@
+import pandas as pd
+import pytest
+
+from app.ml.demand_forecaster import DemandForecaster
+from app.ml.forecaster_pack import ForecasterPack, is_pack_file, write_pack
+
+
+@pytest.fixture(scope='module')
+def forecasters():
+    fitted = {}
+    for school_id in ('SCH-1', 'SCH-2'):
+        forecaster = DemandForecaster()
+        forecaster.train(school_id)
+        fitted[school_id] = forecaster
+    return fitted
+
+
+def _forecast(forecaster):
+    return forecaster.forecast(days=14, interval_mode='analytic', lookback=7)
+
+
+def test_pack_round_trip_keeps_forecasts(tmp_path, forecasters):
+    path = tmp_path / 'forecasters.pack'
+    write_pack(forecasters, str(path), history_hashes={'SCH-1': 'abc'})
+
+    pack = ForecasterPack(str(path))
+    assert is_pack_file(str(path))
+    assert sorted(pack.school_ids) == ['SCH-1', 'SCH-2']
+    assert pack.history_hash('SCH-1') == 'abc'
+    assert pack.get('missing') is None
+    for school_id, forecaster in forecasters.items():
+        pd.testing.assert_frame_equal(_forecast(pack.get(school_id)), _forecast(forecaster))
+
+
+def test_save_model_round_trip(tmp_path, forecasters):
+    path = tmp_path / 'SCH-1.model'
+    forecasters['SCH-1'].save_model(str(path))
+
+    loaded = DemandForecaster(str(path))
+    assert loaded.school_id == 'SCH-1'
+    pd.testing.assert_frame_equal(_forecast(loaded), _forecast(forecasters['SCH-1']))
+
+
+def test_load_model_reads_legacy_joblib_files(tmp_path, forecasters):
+    path = tmp_path / 'SCH-2.joblib'
+    forecasters['SCH-2']._save_joblib(str(path))
+    assert not is_pack_file(str(path))
+
+    loaded = DemandForecaster()
+    loaded.load_model(str(path))
+    assert loaded.school_id == 'SCH-2'
+    pd.testing.assert_frame_equal(_forecast(loaded), _forecast(forecasters['SCH-2']))
@@ -0,0 +1,60 @@
+import numpy as np
+
+from app.core.config import settings
+from app.ml import forecasting
+from app.ml.forecast_store import FORECAST_COLUMNS, MaterializedForecasts
+
+
+def _write_table(path, school_ids, days=10):
+    arrays = {
+        'school_ids': np.array(school_ids, dtype=str),
+        'start_dates': np.full(len(school_ids), np.datetime64('today', 'D')),
+        'generated_at': np.array('2026-01-01T00:00:00'),
+        'horizon': np.array(days, dtype=np.int32),
+        'lookback': np.array(0, dtype=np.int32)
+    }
+    for column in FORECAST_COLUMNS:
+        arrays[column] = np.full((len(school_ids), days), 100, dtype=np.int32)
+    with open(path, 'wb') as f:
+        np.savez(f, **arrays)
+
+
+def test_lookup_reads_only_the_refreshed_table(tmp_path, monkeypatch):
+    path = tmp_path / 'forecast_table.npz'
+    monkeypatch.setattr(settings, 'FORECAST_TABLE_PATH', str(path))
+    monkeypatch.setattr(forecasting, '_materialized', None)
+    monkeypatch.setattr(forecasting, '_materialized_stamp', None)
+
+    _write_table(path, ['A'])
+    assert forecasting.lookup_forecast('A', 5) is None
+
+    assert len(forecasting.refresh_materialized_forecasts()) == 1
+    assert len(forecasting.lookup_forecast('A', 5)['forecast']) == 5
+
+    # A replaced file is not seen until the next refresh
+    _write_table(path, ['A', 'B'], days=12)
+    assert forecasting.lookup_forecast('B', 5) is None
+    assert len(forecasting.refresh_materialized_forecasts()) == 2
+    assert forecasting.lookup_forecast('B', 5) is not None
+
+    path.unlink()
+    assert forecasting.refresh_materialized_forecasts() is None
+    assert forecasting.get_materialized_forecasts() is None
+
+
+def test_discard_swaps_in_a_new_index(tmp_path):
+    path = tmp_path / 'forecast_table.npz'
+    _write_table(path, ['A', 'B'])
+    table = MaterializedForecasts.load(str(path))
+    held = table._index
+
+    assert table.discard('A')
+    assert not table.discard('A')
+
+    # A reader holding the previous index is not disturbed
+    assert set(held) == {'A', 'B'}
+    today = np.datetime64('today', 'D')
+    covered, values = table.gather(np.array(['A', 'B']), np.array([today, today]))
+    assert covered.tolist() == [False, True]
+    assert values['predicted_demand'][1] == 100
+    assert table.lookup('A', 5) is None and len(table) == 1
@@ -0,0 +1,39 @@
+import re
+
+import pytest
+from fastapi.testclient import TestClient
+
+
+@pytest.fixture(scope='module')
+def client():
+    import main
+
+    # No lifespan: these routes need neither the model nor the database
+    return TestClient(main.app)
+
+
+def _request_counts(text: str):
+    pattern = re.compile(r'^http_request_duration_seconds_count\{(.*)\} (\S+)$', re.MULTILINE)
+    return {
+        tuple(sorted(re.findall(r'(\w+)="([^"]*)"', labels))): float(value)
+        for labels, value in pattern.findall(text)
+    }
+
+
+def test_metrics_label_requests_by_route_template(client):
+    client.get('/api/v1/ml/feature-store/schools/SCH-A')
+    client.get('/api/v1/ml/feature-store/schools/SCH-B')
+    client.get('/api/v1/ml/cache-stats')
+    client.get('/no/such/path')
+
+    response = client.get('/metrics')
+    assert response.status_code == 200
+    counts = _request_counts(response.text)
+
+    def count(route, status):
+        return counts.get((('method', 'GET'), ('route', route), ('status', status)), 0)
+
+    assert count('/api/v1/ml/feature-store/schools/{school_id}', '404') >= 2
+    assert count('/api/v1/ml/cache-stats', '200') >= 1
+    assert count('unmatched', '404') >= 1
+    assert not any(dict(labels)['route'].startswith('/feature-store') for labels in counts)
@@ -0,0 +1,69 @@
+from types import SimpleNamespace
+
+import pytest
+
+from app.ml import prediction_cache as prediction_cache_module
+from app.ml.prediction_cache import PredictionCache
+from app.ml.synthetic import generate_features
+
+
+@pytest.fixture
+def rows():
+    return generate_features(4, seed=31).to_dict('records')
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = SimpleNamespace(value=1000.0)
+    monkeypatch.setattr(prediction_cache_module, 'time', SimpleNamespace(monotonic=lambda: now.value))
+    return now
+
+
+def test_entries_expire_after_ttl(risk_predictor, rows, clock):
+    cache = PredictionCache(ttl_seconds=10)
+    cache.predict(risk_predictor, rows[0])
+
+    clock.value += 9
+    cache.predict(risk_predictor, rows[0])
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    clock.value += 2
+    assert cache.predict(risk_predictor, rows[0]) == risk_predictor.predict(rows[0])
+    assert (cache.hits, cache.misses, cache.expirations) == (1, 2, 1)
+
+
+def test_least_recently_used_entry_is_evicted(risk_predictor, rows, clock):
+    cache = PredictionCache(maxsize=2)
+    cache.predict_batch(risk_predictor, rows[:2])
+    cache.predict(risk_predictor, rows[0])
+    cache.predict(risk_predictor, rows[2])
+    assert cache.evictions == 1
+
+    hits = cache.hits
+    cache.predict_batch(risk_predictor, [rows[0], rows[2]])
+    assert cache.hits == hits + 2
+    cache.predict(risk_predictor, rows[1])
+    assert cache.hits == hits + 2
+    assert cache.stats()['size'] == 2
+
+
+def test_inputs_within_the_quantum_share_a_key(risk_predictor, rows, clock):
+    cache = PredictionCache(precision=3)
+    nudged = {**rows[0], 'attendance_rate': rows[0]['attendance_rate'] + 1e-5}
+    moved = {**rows[0], 'attendance_rate': rows[0]['attendance_rate'] + 1e-2}
+
+    first = cache.predict(risk_predictor, rows[0])
+    assert cache.predict(risk_predictor, nudged) == first
+    assert cache.hits == 1
+    cache.predict(risk_predictor, moved)
+    assert cache.misses == 2
+
+
+def test_model_swap_does_not_serve_old_predictions(risk_predictor, retrained_predictor, rows, clock):
+    cache = PredictionCache()
+    before = cache.predict_batch(risk_predictor, rows)
+    after = cache.predict_batch(retrained_predictor, rows)
+
+    assert cache.hits == 0 and cache.misses == 2 * len(rows)
+    assert after == retrained_predictor.predict_batch(rows)
+    assert after != before
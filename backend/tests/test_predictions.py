@@ -0,0 +1,70 @@
+"""
+Tests for the ML prediction endpoints
+"""
+
+import asyncio
+import json
+import time
+from datetime import date
+from types import SimpleNamespace
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.api.v1.endpoints import predictions
+from app.core.config import settings
+from app.ml.executor import ExecutorSaturatedError
+from app.ml.feature_store import FeatureStore
+
+
+def test_stream_gives_up_on_saturated_pool(monkeypatch):
+    calls = 0
+
+    async def saturated(fn, *args, **kwargs):
+        nonlocal calls
+        calls += 1
+        raise ExecutorSaturatedError('lightgbm')
+
+    async def body():
+        yield b'{"school_id": "SCH-1"}\n'
+
+    monkeypatch.setattr(predictions.inference_executor.lightgbm, 'run', saturated)
+    monkeypatch.setattr(settings, 'STREAM_SATURATED_MAX_WAIT', 0.2)
+    request = SimpleNamespace(stream=body)
+    model = SimpleNamespace(predictor=None)
+
+    async def run():
+        return [line async for line in predictions._stream_risk_scores(request, model)]
+
+    start = time.monotonic()
+    output = asyncio.run(run())
+    assert time.monotonic() - start < 1.0
+    assert calls > 1
+    assert json.loads(output[-1]) == {'error': "Inference pool 'lightgbm' is saturated", 'retry_after': 1}
+
+
+def test_predict_risk_stored_reports_unknown_ids(risk_app, monkeypatch):
+    store = FeatureStore()
+    store.set_profile('SCH-1', enrollment=400, capacity=380, last_inspection=date(2026, 1, 1))
+    store.record_attendance('SCH-1', date(2026, 3, 2), 320)
+    store.record_meals('SCH-1', date(2026, 3, 2), 300)
+    store.record_attendance('SCH-2', date(2026, 3, 2), 150, 200)
+    monkeypatch.setattr(predictions, 'feature_store', store)
+
+    handle = risk_app.dependency_overrides[predictions.get_risk_model]()
+
+    with TestClient(risk_app) as client:
+        response = client.post('/predict-risk/stored', json={'school_ids': ['SCH-2', 'unknown', 'SCH-1', 'other']})
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body['model_version'] == handle.version
+    assert body['count'] == 2
+    assert body['missing'] == ['unknown', 'other']
+    assert [p['school_id'] for p in body['predictions']] == ['SCH-2', 'SCH-1']
+
+    matrix, _ = store.feature_matrix(['SCH-2', 'SCH-1'], handle.predictor.feature_names)
+    expected = handle.predictor.predict_batch_columnar(matrix).to_records()
+    for prediction, record in zip(body['predictions'], expected):
+        assert prediction['risk_score'] == pytest.approx(record['risk_score'])
+        assert prediction['risk_level'] == record['risk_level']
@@ -0,0 +1,85 @@
+import asyncio
+import threading
+
+import numpy as np
+import pytest
+
+from app.ml.registry import ModelNotLoadedError, ModelRegistry
+from app.ml.synthetic import generate_features
+
+
+def test_current_before_publish_raises():
+    with pytest.raises(ModelNotLoadedError):
+        ModelRegistry().current()
+
+
+def test_publish_keeps_in_flight_handle(risk_predictor, retrained_predictor):
+    registry = ModelRegistry()
+    registry.publish(risk_predictor)
+    features = generate_features(8, seed=3)[risk_predictor.feature_names].to_numpy(dtype=np.float64)
+
+    taken = threading.Event()
+    swapped = threading.Event()
+    seen = {}
+
+    def request():
+        handle = registry.current()
+        taken.set()
+        swapped.wait(timeout=5)
+        seen['version'] = handle.version
+        seen['scores'] = handle.predictor.predict_batch_columnar(features).risk_scores
+
+    worker = threading.Thread(target=request)
+    worker.start()
+    taken.wait(timeout=5)
+    new_handle = registry.publish(retrained_predictor)
+    swapped.set()
+    worker.join(timeout=5)
+
+    assert registry.current() is new_handle
+    assert new_handle.version == retrained_predictor.model_version != risk_predictor.model_version
+    assert seen['version'] == risk_predictor.model_version
+    np.testing.assert_array_equal(seen['scores'], risk_predictor.predict_batch_columnar(features).risk_scores)
+
+
+def test_refresh_waits_for_a_stable_file(tmp_path, risk_predictor, retrained_predictor):
+    path = tmp_path / 'risk_model.txt'
+    risk_predictor.save_model(str(path))
+    registry = ModelRegistry()
+    registry.load(str(path), cache_dir=str(tmp_path))
+    assert registry.current().version == risk_predictor.model_version
+
+    # A copy in progress: the file grows between polls
+    new_model = retrained_predictor.model.model_to_string()
+    path.write_text(new_model[:len(new_model) // 2])
+    assert registry.refresh_if_changed() is None
+    path.write_text(new_model)
+    assert registry.refresh_if_changed() is None
+    assert registry.current().version == risk_predictor.model_version
+
+    # Unchanged since the last poll: loaded and swapped in
+    handle = registry.refresh_if_changed()
+    assert handle is not None and handle.version == retrained_predictor.model_version
+    assert registry.current() is handle
+    assert registry.refresh_if_changed() is None
+
+
+def test_watch_reloads_a_replaced_file(tmp_path, risk_predictor, retrained_predictor):
+    path = tmp_path / 'risk_model.txt'
+    risk_predictor.save_model(str(path))
+    registry = ModelRegistry()
+    registry.load(str(path), cache_dir=str(tmp_path))
+
+    async def run():
+        registry.start_watching(0.01)
+        retrained_predictor.save_model(str(path))
+        try:
+            for _ in range(500):
+                if registry.current().version == retrained_predictor.model_version:
+                    return True
+                await asyncio.sleep(0.01)
+            return False
+        finally:
+            await registry.stop_watching()
+
+    assert asyncio.run(run())
@@ -0,0 +1,29 @@
+import numpy as np
+
+from app.ml.risk_predictor import RISK_LEVELS, round_scores
+from app.ml.synthetic import generate_features
+
+
+def test_single_row_and_batch_predictions_agree(risk_predictor):
+    features = generate_features(500, seed=17)
+    rows = features.to_dict('records')
+
+    batch = risk_predictor.predict_batch_columnar(features)
+    for i, row in enumerate(rows):
+        single = risk_predictor.predict(row)
+        assert single['risk_score'] == batch.risk_scores[i]
+        assert single['risk_level'] == RISK_LEVELS[batch.level_codes[i]]
+    assert risk_predictor.predict_batch(rows) == batch.to_records()
+
+
+def test_halfway_scores_round_alike_on_both_paths(risk_predictor, monkeypatch):
+    # Python's round() and np.round disagree on these binary halfway values
+    raw = np.array([0.005, 0.015, 0.025, 42.125, 99.995])
+    features = generate_features(len(raw), seed=17)
+    monkeypatch.setattr(risk_predictor.model, 'predict', lambda matrix, **kwargs: raw[:len(matrix)].copy())
+
+    batch = risk_predictor.predict_batch_columnar(features)
+    np.testing.assert_array_equal(batch.risk_scores, round_scores(raw))
+    for i, row in enumerate(features.to_dict('records')):
+        monkeypatch.setattr(risk_predictor.model, 'predict', lambda matrix, value=raw[i], **kwargs: np.array([value]))
+        assert risk_predictor.predict(row)['risk_score'] == batch.risk_scores[i]
@@ -0,0 +1,106 @@
+import asyncio
+
+import httpx
+import numpy as np
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from app.api.v1.endpoints import predictions
+from app.db import session as db_session
+from app.db.init_db import init_db, seed_synthetic_features
+from app.db.session import check_db, create_engine, get_db
+from app.ml.synthetic import generate_features
+from app.services.school_service import fetch_feature_columns
+
+N_SCHOOLS = 24
+
+
+def _serve(risk_app, engine):
+    sessions = async_sessionmaker(engine, expire_on_commit=False)
+
+    async def db():
+        async with sessions() as session:
+            yield session
+
+    risk_app.dependency_overrides[get_db] = db
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=risk_app), base_url='http://test')
+
+
+async def _seeded_engine():
+    engine = create_engine('sqlite+aiosqlite:///:memory:')
+    await init_db(engine)
+    await seed_synthetic_features(N_SCHOOLS, districts=2, blocks=3, engine=engine)
+    return engine
+
+
+def test_fetch_feature_columns_filters_by_district_and_block(risk_predictor):
+    features = generate_features(N_SCHOOLS)
+
+    async def run():
+        engine = await _seeded_engine()
+        try:
+            async with async_sessionmaker(engine)() as session:
+                district = await fetch_feature_columns(session, 'DIST-01', feature_names=risk_predictor.feature_names)
+                block = await fetch_feature_columns(session, 'DIST-01', 'BLK-02')
+                missing = await fetch_feature_columns(session, 'DIST-09')
+            return district, block, missing
+        finally:
+            await engine.dispose()
+
+    district, block, missing = asyncio.run(run())
+
+    rows = list(range(1, N_SCHOOLS, 2))
+    assert district.school_ids.tolist() == [f"SCH-{i:02d}" for i in rows]
+    np.testing.assert_allclose(district.matrix, features.iloc[rows][risk_predictor.feature_names].to_numpy())
+    assert set(block.blocks.tolist()) == {'BLK-02'}
+    assert block.school_ids.tolist() == [f"SCH-{i:02d}" for i in rows if (i // 2) % 3 == 2]
+    assert len(missing) == 0 and missing.matrix.shape == (0, len(district.feature_names))
+
+
+def test_district_risk_endpoint(risk_app, risk_predictor):
+    async def run():
+        engine = await _seeded_engine()
+        try:
+            async with _serve(risk_app, engine) as client:
+                return (await client.get('/district-risk/DIST-00'),
+                        await client.get('/district-risk/DIST-00', params={'block': 'BLK-01'}),
+                        await client.get('/district-risk/DIST-00', params={'block': 'BLK-99'}),
+                        await client.get('/district-risk/NOWHERE'))
+        finally:
+            await engine.dispose()
+
+    district, block, no_block, no_district = asyncio.run(run())
+
+    assert district.status_code == 200
+    body = district.json()
+    rows = list(range(0, N_SCHOOLS, 2))
+    expected = risk_predictor.predict_batch_columnar(generate_features(N_SCHOOLS).iloc[rows])
+    assert body['count'] == len(rows)
+    assert [s['risk_score'] for s in body['schools']] == expected.risk_scores.tolist()
+    assert sum(body['level_counts'].values()) == len(rows)
+
+    assert block.status_code == 200
+    assert {s['block'] for s in block.json()['schools']} == {'BLK-01'}
+    assert block.json()['count'] == len([i for i in rows if (i // 2) % 3 == 1])
+
+    assert no_block.status_code == 404
+    assert no_block.json()['detail'] == "No schools found for district 'DIST-00', block 'BLK-99'"
+    assert no_district.status_code == 404
+
+
+def test_district_risk_answers_503_when_the_database_is_down(risk_app, tmp_path, monkeypatch):
+    # A directory is not a database file, so every connection attempt fails
+    broken = create_engine(f"sqlite+aiosqlite:///{tmp_path}")
+    monkeypatch.setattr(db_session, 'engine', broken)
+
+    async def run():
+        try:
+            async with _serve(risk_app, broken) as client:
+                return await check_db(), await client.get('/district-risk/DIST-00')
+        finally:
+            await broken.dispose()
+
+    healthy, response = asyncio.run(run())
+
+    assert healthy is False
+    assert response.status_code == 503
+    assert response.json()['detail'].startswith('Database unavailable')
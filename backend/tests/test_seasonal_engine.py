@@ -0,0 +1,20 @@
+import pandas as pd
+
+from app.ml.seasonal_engine import MIN_HISTORY_DAYS, SeasonalForecaster
+
+
+def test_train_many_isolates_bad_histories():
+    good = SeasonalForecaster()._generate_historical_data('GOOD')
+    histories = {
+        'GOOD': good,
+        'EMPTY': pd.DataFrame({'ds': pd.Series(dtype='datetime64[ns]'), 'y': pd.Series(dtype=float)}),
+        'NO_Y': good[['ds']],
+        'SHORT': good.head(MIN_HISTORY_DAYS - 1)
+    }
+
+    result = SeasonalForecaster.train_many(list(histories), histories)
+
+    assert list(result.forecasters) == ['GOOD']
+    assert set(result.failures) == {'EMPTY', 'NO_Y', 'SHORT'}
+    assert result.failures['NO_Y'].startswith('ValueError')
+    assert len(result.forecasters['GOOD'].forecast(days=7)) == 7
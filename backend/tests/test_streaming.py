@@ -0,0 +1,39 @@
+"""
+Tests for NDJSON request-body chunking
+"""
+
+import asyncio
+
+import pytest
+
+from app.core.streaming import LineTooLongError, iter_ndjson_chunks
+
+
+async def _body(*chunks: bytes):
+    for chunk in chunks:
+        yield chunk
+
+
+def _collect(*chunks: bytes, chunk_rows: int = 2, max_line_bytes: int = 100):
+    async def run():
+        return [records async for records in iter_ndjson_chunks(_body(*chunks), chunk_rows, max_line_bytes)]
+    return asyncio.run(run())
+
+
+def test_lines_split_across_body_chunks():
+    chunks = _collect(b'{"a": 1}\n{"a"', b': 2}\n\n{"a": 3}')
+    assert chunks == [[(1, b'{"a": 1}'), (2, b'{"a": 2}')], [(4, b'{"a": 3}')]]
+
+
+def test_complete_long_line_within_one_chunk_is_rejected():
+    with pytest.raises(LineTooLongError, match="Line 2"):
+        _collect(b'{"a": 1}\n' + b'x' * 5008 + b'\n{"a": 2}\n')
+
+
+def test_long_trailing_partial_line_is_rejected():
+    with pytest.raises(LineTooLongError, match="Line 1"):
+        _collect(b'x' * 60, b'x' * 60)
+
+
+def test_line_at_limit_is_accepted():
+    assert _collect(b'x' * 100 + b'\n') == [[(1, b'x' * 100)]]
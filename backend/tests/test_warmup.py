@@ -0,0 +1,70 @@
+import asyncio
+
+import httpx
+
+from app.core.config import settings
+from app.ml import forecasting
+from app.ml.executor import InferenceExecutor
+from app.ml.registry import ModelRegistry
+from app.ml.warmup import FAILED, READY, Readiness
+
+
+class FlakyRegistry(ModelRegistry):
+    """
+    Fails the first model load, then publishes the given predictor
+    """
+
+    def __init__(self, predictor):
+        super().__init__()
+        self.predictor = predictor
+        self.loads = 0
+
+    def load(self, model_path=None, cache_dir=None):
+        self.loads += 1
+        if self.loads == 1:
+            raise OSError("model file not there yet")
+        return self.publish(self.predictor, source=model_path)
+
+
+def test_failed_warm_up_is_retried_until_ready(monkeypatch, tmp_path, risk_predictor):
+    import main
+
+    readiness, registry = Readiness(), FlakyRegistry(risk_predictor)
+    monkeypatch.setattr(main, 'readiness', readiness)
+    monkeypatch.setattr(main, 'model_registry', registry)
+    monkeypatch.setattr(settings, 'FORECAST_TABLE_PATH', str(tmp_path / 'forecast_table.npz'))
+    monkeypatch.setattr(forecasting, '_materialized', None)
+    monkeypatch.setattr(forecasting, '_materialized_stamp', None)
+
+    executor = InferenceExecutor(lightgbm_workers=1, prophet_workers=1)
+    executor.start()
+
+    async def scenario():
+        transport = httpx.ASGITransport(app=main.app)
+        async with httpx.AsyncClient(transport=transport, base_url='http://test') as client:
+            readiness.start(registry, executor, [1, 8], forecast_workers=False,
+                            retry_delay=0.2, max_retry_delay=0.2)
+            while readiness.attempts == 0 or readiness.status not in (FAILED, READY):
+                await asyncio.sleep(0.01)
+
+            response = await client.get('/ready')
+            assert response.status_code == 503
+            assert response.json()['status'] == FAILED
+
+            for _ in range(500):
+                response = await client.get('/ready')
+                if response.status_code == 200:
+                    break
+                await asyncio.sleep(0.01)
+            await readiness.stop()
+        return response
+
+    try:
+        response = asyncio.run(scenario())
+    finally:
+        executor.shutdown()
+
+    assert response.status_code == 200
+    assert response.json()['attempts'] == 2
+    assert response.json()['error'] is None
+    assert registry.loads == 2